@@ -0,0 +1,264 @@
+import sys
+import os
+import re
+import json
+import random
+import argparse
+import textwrap
+from bisect import bisect
+from itertools import accumulate
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Any, List, Optional, Tuple
+
+# relative
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+
+sys.path.insert(0, project_root)
+
+try:
+    import fitz  # PyMuPDF
+    from src.search.cv_grouper import CVGrouper
+    from src.core.normalizer import normalize
+    from src.core.extraction_cache import ExtractionCache, get_extraction_cache
+except ImportError as e:
+    print(f"[-] Error importing project modules: {e}")
+    print("[*] Install with: pip install pymupdf")
+    sys.exit(1)
+
+DEFAULT_SKILLS = [
+    "Python", "SQL", "Java", "JavaScript", "Excel", "Communication", "Leadership", "Project Management",
+    "Customer Service", "Microsoft Office", "Data Analysis", "C++", "React", "Node.js", "Git", "Linux",
+    "AWS", "Docker", "Kubernetes", "Machine Learning", "Accounting", "Budgeting", "Sales", "Marketing",
+    "Negotiation", "Scheduling", "Inventory Management", "QuickBooks", "Salesforce", "Tableau", "Power BI",
+    "HTML", "CSS", "TypeScript", "Go", "Rust", "PHP", "Ruby", "Scala", "Spark", "Hadoop", "TensorFlow",
+    "PyTorch", "Statistics", "Public Speaking", "Team Building", "Training", "Recruiting", "Payroll",
+    "Compliance", "Auditing", "Forecasting", "Risk Management", "Agile", "Scrum", "Jira", "Photoshop",
+    "Illustrator", "AutoCAD", "SolidWorks", "MATLAB", "Cooking", "Food Safety", "Menu Planning",
+    "Patient Care", "CPR", "Phlebotomy", "Teaching", "Curriculum Design", "Research", "Writing",
+]
+
+FILLER_WORDS = [
+    "managed", "developed", "team", "and", "the", "of", "to", "with", "for", "in", "customer", "new",
+    "process", "project", "system", "daily", "operations", "improved", "support", "including", "staff",
+    "reports", "quality", "business", "service", "maintained", "responsible", "data", "provided", "clients",
+    "created", "led", "coordinated", "ensured", "successfully", "multiple", "various", "company", "sales",
+    "performance", "training", "designed", "implemented", "reduced", "increased", "costs", "revenue",
+    "efficiency", "analysis", "planning", "documentation", "deadlines", "members", "cross-functional",
+    "stakeholders", "requirements", "weekly", "monthly", "annual", "budget", "vendors", "orders",
+    "inventory", "policies", "procedures", "accurate", "records", "schedule", "meetings", "strategy",
+]
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+               "Budi", "Siti", "Agus", "Dewi", "Rizky", "Putri", "Andi", "Ayu", "Wayan", "Made"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Santoso", "Wijaya", "Saputra",
+              "Pratama", "Hidayat", "Nugroho", "Kusuma", "Setiawan"]
+ROLES = ["Software Engineer", "Data Analyst", "Accountant", "Sales Manager", "Marketing Specialist",
+         "Project Manager", "Chef", "Registered Nurse", "Teacher", "HR Coordinator", "Financial Analyst",
+         "Web Developer", "Operations Manager", "Customer Service Representative", "Graphic Designer",
+         "Mechanical Engineer", "Business Analyst", "Administrative Assistant"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Inc", "Stark Industries", "Wayne Enterprises",
+             "PT Maju Jaya", "PT Sinar Abadi", "Hooli", "Vandelay Industries", "Soylent Co", "Cyberdyne"]
+DEGREES = ["Bachelor of Science in Computer Science", "Bachelor of Arts in Economics",
+           "Master of Business Administration", "Bachelor of Science in Accounting",
+           "Associate Degree in Culinary Arts", "Bachelor of Engineering", "Diploma in Nursing",
+           "Master of Science in Data Science"]
+INSTITUTIONS = ["State University", "Institut Teknologi Bandung", "Community College", "Tech Institute",
+                "Universitas Indonesia", "City College", "National University", "Polytechnic School"]
+CITIES = ["Jakarta", "Bandung", "Surabaya", "New York", "Chicago", "Austin", "Seattle", "Denver"]
+
+def header_variants(section_patterns: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Turn CVGrouper's header regexes back into the literal headers they accept"""
+    variants = {}
+    for section, patterns in section_patterns.items():
+        headers = []
+        for pattern in patterns:
+            body = re.sub(r'^\(\?:|\)$', '', pattern)
+            headers.extend(alternative.replace(r'\s+', ' ') for alternative in body.split('|'))
+        variants[section] = headers
+    return variants
+
+class ZipfSampler:
+    """Draw items with probability proportional to 1 / rank**s"""
+    def __init__(self, items: List[str], s: float):
+        self.items = items
+        self.cum_weights = list(accumulate(1.0 / (rank ** s) for rank in range(1, len(items) + 1)))
+
+    def draw(self, rng: random.Random) -> str:
+        return self.items[bisect(self.cum_weights, rng.random() * self.cum_weights[-1])]
+
+    def draw_unique(self, rng: random.Random, k: int) -> List[str]:
+        k = min(k, len(self.items))
+        picked: List[str] = []
+        seen = set()
+        while len(picked) < k:
+            item = self.draw(rng)
+            if item not in seen:
+                seen.add(item)
+                picked.append(item)
+        return picked
+
+class SyntheticCVGenerator:
+    def __init__(self, skills: List[str], zipf_s: float = 1.1, seed: int = 0):
+        self.seed = seed
+        self.skills = ZipfSampler(skills, zipf_s)
+        self.words = ZipfSampler(FILLER_WORDS, zipf_s)
+        self.headers = header_variants(CVGrouper().section_patterns)
+
+    def _header(self, rng: random.Random, section: str) -> str:
+        # favour the first, most common spellings; upper-case about half the time
+        headers = self.headers[section]
+        header = headers[min(int(rng.expovariate(1.0)), len(headers) - 1)]
+        return header.upper() if rng.random() < 0.5 else header
+
+    def _sentence(self, rng: random.Random, low: int = 8, high: int = 16) -> str:
+        words = []
+        for _ in range(rng.randint(low, high)):
+            words.append(self.skills.draw(rng) if rng.random() < 0.12 else self.words.draw(rng))
+        return words[0][0].upper() + " ".join(words)[1:] + "."
+
+    def generate(self, index: int) -> Tuple[Dict[str, Any], str]:
+        """Return (applicant record, CV text) for CV number `index`, deterministic for a given seed"""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        role = rng.choice(ROLES)
+        city = rng.choice(CITIES)
+        phone = f"+62-8{rng.randint(11, 59)}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        birth_year = rng.randint(1975, 2004)
+
+        lines = [
+            f"{first_name} {last_name}",
+            f"{first_name.lower()}.{last_name.lower()}@example.com | {phone} | {city}",
+            "",
+            self._header(rng, 'summary'),
+            " ".join(self._sentence(rng) for _ in range(rng.randint(2, 4))),
+            "",
+            self._header(rng, 'skills'),
+            ", ".join(self.skills.draw_unique(rng, rng.randint(5, 15))),
+            "",
+            self._header(rng, 'experience'),
+        ]
+
+        year = 2024
+        for _ in range(rng.randint(1, 4)):
+            start = year - rng.randint(1, 5)
+            lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({start}-{year})")
+            lines.extend(f"- {self._sentence(rng)}" for _ in range(rng.randint(2, 5)))
+            year = start
+        lines.append("")
+
+        lines.append(self._header(rng, 'education'))
+        graduation = min(birth_year + rng.randint(21, 26), 2024)
+        lines.append(f"{rng.choice(DEGREES)} - {rng.choice(INSTITUTIONS)} ({graduation})")
+
+        applicant = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'date_of_birth': f"{birth_year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'address': f"{rng.randint(1, 999)} Main Street, {city}",
+            'phone_number': phone,
+            'application_role': role,
+        }
+        return applicant, "\n".join(lines)
+
+def write_pdf(path: str, text: str) -> None:
+    doc = fitz.open()
+    page = None
+    y = 0
+    for line in text.split("\n"):
+        for chunk in (textwrap.wrap(line, 95) or [""]):
+            if page is None or y > 800:
+                page = doc.new_page()
+                y = 50
+            page.insert_text((50, y), chunk, fontsize=10)
+            y += 13
+    doc.save(path)
+    doc.close()
+
+_worker: Dict[str, Any] = {}
+
+def _init_worker(skills: List[str], zipf_s: float, seed: int, output_format: str, output_dir: str) -> None:
+    _worker['generator'] = SyntheticCVGenerator(skills, zipf_s, seed)
+    _worker['format'] = output_format
+    _worker['output_dir'] = output_dir
+
+def _generate_chunk(task: Tuple[int, int]) -> List[Tuple[int, Dict[str, Any], str, str, str]]:
+    """Pool worker: (index, applicant, cv_path, regex_format, pattern_matching) per CV; texts are empty for PDFs"""
+    start, count = task
+    generator = _worker['generator']
+    results = []
+    for index in range(start, start + count):
+        applicant, text = generator.generate(index)
+        cv_path = os.path.join(_worker['output_dir'], f"cv_{index:07d}.pdf")
+        if _worker['format'] == 'pdf':
+            write_pdf(cv_path, text)
+            results.append((index, applicant, cv_path, "", ""))
+        else:
+            # same cleanup extract_single_pdf applies to text read out of a PDF
+            extracted = normalize(text)
+            results.append((index, applicant, cv_path, extracted["regex_format"], extracted["pattern_matching"]))
+    return results
+
+def generate_corpus(count: int, output_dir: str, output_format: str = 'cache', skills: Optional[List[str]] = None,
+                    zipf_s: float = 1.1, seed: int = 0, workers: Optional[int] = None,
+                    manifest_path: Optional[str] = None, cache: Optional[ExtractionCache] = None,
+                    chunk_size: int = 500) -> int:
+    os.makedirs(output_dir, exist_ok=True)
+    cache = cache or get_extraction_cache()
+    workers = workers or max(1, cpu_count() - 1)
+    tasks = [(start, min(chunk_size, count - start)) for start in range(0, count, chunk_size)]
+    manifest = open(manifest_path, 'w', encoding='utf-8') if manifest_path else None
+
+    print(f"[*] Generating {count} synthetic CVs as {output_format} into {output_dir} ({workers} workers)...")
+    written = 0
+    try:
+        with Pool(processes=workers, initializer=_init_worker,
+                  initargs=(skills or DEFAULT_SKILLS, zipf_s, seed, output_format, output_dir)) as pool:
+            for results in pool.imap(_generate_chunk, tasks):
+                if output_format == 'cache':
+                    cache.put_text((cv_path, regex_format, pattern_matching)
+                                   for _, _, cv_path, regex_format, pattern_matching in results)
+                if manifest:
+                    for index, applicant, cv_path, _, _ in results:
+                        record = {'applicant_id': index + 1, **applicant, 'cv_path': ExtractionCache.key(cv_path)}
+                        manifest.write(json.dumps(record) + "\n")
+                written += len(results)
+                print(f"[*] Generated {written}/{count} CVs...")
+    finally:
+        if manifest:
+            manifest.close()
+
+    print(f"[+] Generated {written} synthetic CVs")
+    return written
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic CV corpus for scale-testing search")
+    parser.add_argument("-n", "--count", type=int, default=10000, help="number of CVs (default: %(default)s)")
+    parser.add_argument("-o", "--output", default=os.path.join(project_root, "data", "SYNTHETIC"),
+                        help="directory the CV paths live under (default: data/SYNTHETIC)")
+    parser.add_argument("-f", "--format", choices=["cache", "pdf"], default="cache",
+                        help="write PDFs, or pre-extracted text straight into the extraction cache")
+    parser.add_argument("--vocab", help="skill vocabulary file, one skill per line, most common first")
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent for skill/term frequencies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--manifest", help="write applicant records + cv_path as JSON lines to this file")
+    parser.add_argument("--cache-path", help="extraction cache database (default: .cache/extraction.sqlite3)")
+    args = parser.parse_args()
+
+    skills = None
+    if args.vocab:
+        with open(args.vocab, encoding='utf-8') as f:
+            skills = [line.strip() for line in f if line.strip()]
+        if not skills:
+            print(f"[-] Vocabulary file {args.vocab} is empty")
+            return
+
+    cache = ExtractionCache(args.cache_path) if args.cache_path else None
+    generate_corpus(args.count, args.output, args.format, skills, args.zipf_s, args.seed,
+                    args.workers, args.manifest, cache)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import sys
+import os
+import json
+import time
+import sqlite3
+import argparse
+from collections import deque
+from multiprocessing import Pool, cpu_count
+from typing import Any, Dict, List, Optional, Tuple
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+
+sys.path.insert(0, project_root)
+
+try:
+    from src.search.cv_grouper import CVGrouper
+    from src.core.extraction_cache import ExtractionCache, get_extraction_cache
+except ImportError as e:
+    print(f"[-] Error importing project modules: {e}")
+    sys.exit(1)
+
+DEFAULT_OUTPUT = os.path.join(project_root, ".cache", "corpus_sections.sqlite3")
+
+# (cv_path, content_hash, regex_format)
+GroupTask = Tuple[str, str, str]
+
+class CorpusSectionsStore:
+    """
+    SQLite output of the batch grouping job: one row of sections per CV plus
+    one row per skill and per education entry, so corpus analytics are plain
+    GROUP BY queries. A CV whose content hash and grouper version are already
+    stored is skipped, which is what makes an interrupted run resumable.
+    """
+    def __init__(self, path: str = DEFAULT_OUTPUT):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS corpus_sections (
+                cv_path         TEXT PRIMARY KEY,
+                content_hash    TEXT NOT NULL,
+                grouper_version INTEGER NOT NULL,
+                summary         TEXT NOT NULL,
+                skills          TEXT NOT NULL,
+                jobs            TEXT NOT NULL,
+                education       TEXT NOT NULL,
+                grouped_at      REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS corpus_skills (
+                cv_path   TEXT NOT NULL,
+                skill     TEXT NOT NULL,
+                skill_key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_corpus_skills_path ON corpus_skills (cv_path);
+            CREATE INDEX IF NOT EXISTS idx_corpus_skills_key ON corpus_skills (skill_key);
+            CREATE TABLE IF NOT EXISTS corpus_education (
+                cv_path     TEXT NOT NULL,
+                major       TEXT NOT NULL,
+                institution TEXT NOT NULL,
+                year        TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_corpus_education_path ON corpus_education (cv_path);
+        """)
+
+    def up_to_date(self, entries: List[GroupTask], grouper_version: int) -> set:
+        placeholders = ",".join("?" * len(entries))
+        rows = self.connection.execute(
+            f"SELECT cv_path, content_hash FROM corpus_sections "
+            f"WHERE grouper_version = ? AND cv_path IN ({placeholders})",
+            (grouper_version, *(cv_path for cv_path, _, _ in entries))
+        ).fetchall()
+        stored = dict(rows)
+        return {cv_path for cv_path, content_hash, _ in entries if stored.get(cv_path) == content_hash}
+
+    def write(self, results: List[Tuple[str, str, Dict[str, Any]]], grouper_version: int) -> None:
+        now = time.time()
+        paths = [(cv_path,) for cv_path, _, _ in results]
+        with self.connection:
+            self.connection.executemany("DELETE FROM corpus_skills WHERE cv_path = ?", paths)
+            self.connection.executemany("DELETE FROM corpus_education WHERE cv_path = ?", paths)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO corpus_sections VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(cv_path, content_hash, grouper_version, sections['summary'],
+                  json.dumps(sections['skills']), json.dumps(sections['jobs']),
+                  json.dumps(sections['education']), now)
+                 for cv_path, content_hash, sections in results]
+            )
+            self.connection.executemany(
+                "INSERT INTO corpus_skills VALUES (?, ?, ?)",
+                [(cv_path, skill, skill.lower()) for cv_path, _, sections in results for skill in sections['skills']]
+            )
+            self.connection.executemany(
+                "INSERT INTO corpus_education VALUES (?, ?, ?, ?)",
+                [(cv_path, entry['major'], entry['institution'], entry['year'])
+                 for cv_path, _, sections in results for entry in sections['education']]
+            )
+
+    def top_skills(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """Skills by the number of CVs that list them"""
+        return self.connection.execute(
+            "SELECT MIN(skill), COUNT(DISTINCT cv_path) AS cvs FROM corpus_skills "
+            "GROUP BY skill_key ORDER BY cvs DESC, skill_key LIMIT ?", (limit,)
+        ).fetchall()
+
+    def top_majors(self, limit: int = 20) -> List[Tuple[str, int]]:
+        return self.connection.execute(
+            "SELECT major, COUNT(*) AS entries FROM corpus_education WHERE major != '' "
+            "GROUP BY lower(major) ORDER BY entries DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM corpus_sections").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+_grouper: Optional[CVGrouper] = None
+
+def _init_worker() -> None:
+    global _grouper
+    _grouper = CVGrouper()
+
+def _group_chunk(tasks: List[GroupTask]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Pool worker: (cv_path, content_hash, sections) per CV"""
+    return [(cv_path, content_hash, _grouper.group_cv_data(regex_format))
+            for cv_path, content_hash, regex_format in tasks]
+
+def group_corpus(cache: Optional[ExtractionCache] = None, output_path: str = DEFAULT_OUTPUT,
+                 workers: Optional[int] = None, chunk_size: int = 200, force: bool = False) -> int:
+    """
+    Run CVGrouper over every CV in the extraction cache and store the
+    sections. Chunks are submitted as the cache is read, with at most two
+    per worker in flight, so memory stays flat on large corpora. Returns
+    the number of CVs grouped in this run.
+    """
+    cache = cache or get_extraction_cache()
+    store = CorpusSectionsStore(output_path)
+    workers = workers or max(1, cpu_count() - 1)
+    total = cache.count()
+    version = CVGrouper.VERSION
+
+    print(f"[*] Grouping {total} cached CVs into {output_path} ({workers} workers)...")
+    grouped = skipped = 0
+    started = time.perf_counter()
+
+    def drain(pending: deque) -> None:
+        nonlocal grouped
+        results = pending.popleft().get()
+        store.write(results, version)
+        grouped += len(results)
+        rate = grouped / max(time.perf_counter() - started, 1e-9)
+        print(f"[*] Grouped {grouped + skipped}/{total} CVs ({skipped} up to date, {rate:.0f} CVs/s)")
+
+    try:
+        with Pool(processes=workers, initializer=_init_worker) as pool:
+            pending: deque = deque()
+            chunk: List[GroupTask] = []
+            entries = cache.iter_entries(batch_size=chunk_size)
+            while True:
+                entry = next(entries, None)
+                if entry is not None:
+                    # the grouper only reads the regex format
+                    chunk.append(entry[:3])
+                    if len(chunk) < chunk_size:
+                        continue
+                if chunk:
+                    done = set() if force else store.up_to_date(chunk, version)
+                    skipped += len(done)
+                    todo = [task for task in chunk if task[0] not in done]
+                    if todo:
+                        pending.append(pool.apply_async(_group_chunk, (todo,)))
+                    chunk = []
+                while pending and (len(pending) >= workers * 2 or entry is None):
+                    drain(pending)
+                if entry is None:
+                    break
+    finally:
+        store.close()
+
+    print(f"[+] Grouped {grouped} CVs, {skipped} already up to date")
+    return grouped
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Group every cached CV into summary/skills/jobs/education for corpus analytics"
+    )
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="SQLite file for the grouped sections (default: .cache/corpus_sections.sqlite3)")
+    parser.add_argument("--cache-path", help="extraction cache to read (default: EXTRACTION_CACHE_PATH or .cache)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: cpu count - 1)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="CVs per pool task (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="regroup CVs that are already up to date")
+    parser.add_argument("--top-skills", type=int, default=0, metavar="N",
+                        help="print the N most common skills and majors when done")
+    args = parser.parse_args()
+
+    cache = ExtractionCache(args.cache_path) if args.cache_path else get_extraction_cache()
+    group_corpus(cache, args.output, args.workers, args.chunk_size, args.force)
+
+    if args.top_skills:
+        store = CorpusSectionsStore(args.output)
+        print(f"\n[+] Top skills across {store.count()} CVs:")
+        for skill, cvs in store.top_skills(args.top_skills):
+            print(f"    {skill:<30} {cvs}")
+        print(f"\n[+] Top majors:")
+        for major, entries in store.top_majors(args.top_skills):
+            print(f"    {major[:60]:<60} {entries}")
+        store.close()
+
+if __name__ == "__main__":
+    main()
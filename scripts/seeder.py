@@ -1,8 +1,14 @@
 import sys
 import os
+import csv
+import json
+import tempfile
 import random
+import hashlib
+from collections import deque
+from multiprocessing import Pool, cpu_count
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 # relative
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,7 +17,7 @@ src_dir = os.path.join(project_root, 'src')
 db_dir = os.path.join(src_dir, 'db')
 utils_dir = os.path.join(src_dir, 'utils')
 
-sys.path.extend([src_dir, db_dir, utils_dir])
+sys.path.extend([project_root, src_dir, db_dir, utils_dir])
 
 # Import dependencies, make sure they are installed :3
 try:
@@ -30,11 +36,19 @@ except ImportError as e:
     sys.exit(1)
 
 try:
-    from encrypt import encrypt, decrypt
+    from encrypt import encrypt, decrypt, AESCipher, pkcs7_unpad
 except ImportError:
     print("[-] Warning: encrypt.py not found, encryption features disabled")
     encrypt = None
     decrypt = None
+    AESCipher = None
+    pkcs7_unpad = None
+
+try:
+    from blind_index import BlindIndexer
+except ImportError:
+    print("[-] Warning: blind_index.py not found, blind index maintenance disabled")
+    BlindIndexer = None
 
 try:
     from config import get_db_config
@@ -42,6 +56,78 @@ except ImportError:
     print("[-] Error: Cannot find config module")
     sys.exit(1)
 
+try:
+    from src.index.segments import get_live_index
+except ImportError:
+    get_live_index = None
+
+PROFILE_COLUMNS = ('first_name', 'last_name', 'date_of_birth', 'address', 'phone_number')
+# MySQL "Duplicate column name" / "Duplicate key name"
+ER_DUP_FIELDNAME = 1060
+ER_DUP_KEYNAME = 1061
+MIGRATION_CHECKPOINT_DIR = os.path.join(project_root, '.cache')
+
+def _strict_decrypt(cipher: AESCipher, value: Any) -> Optional[str]:
+    # None unless the value is a well-padded UTF-8 ciphertext under this key
+    try:
+        ciphertext = bytes.fromhex(str(value))
+        if not ciphertext or len(ciphertext) % 16 != 0:
+            return None
+        pkcs7_unpad(cipher.decrypt_block(ciphertext[-16:]))
+        return cipher.decrypt(ciphertext).decode('utf-8')
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+def _migrate_batch(task: Tuple[str, bytes, Optional[bytes], List[Dict[str, Any]]]) -> Tuple[List[tuple], List[int]]:
+    """
+    Pool worker: turn one page of ApplicantProfile rows into UPDATE parameter
+    tuples (five columns + applicant_id), plus the IDs of rows it had to leave
+    alone. Each column is judged on its own, since any of them can be NULL:
+    a value that already decrypts under the target key is kept, so a replayed
+    batch (after an interrupted run) changes nothing and rows already in the
+    target state are left out. NULL columns stay NULL in every mode.
+    In rotate mode a row is skipped, and reported, when any of its values
+    decrypts under neither the old nor the new key, so no row ends up
+    encrypted under a mix of keys.
+    """
+    mode, key, new_key, rows = task
+    cipher = AESCipher(key)
+    new_cipher = AESCipher(new_key) if new_key else None
+    updates = []
+    failed = []
+
+    for row in rows:
+        current = [row[column] for column in PROFILE_COLUMNS]
+        if mode == 'encrypt':
+            values = [
+                value if value is None or _strict_decrypt(cipher, value) is not None
+                else cipher.encrypt(str(value).encode('utf-8')).hex()
+                for value in current
+            ]
+        elif mode == 'decrypt':
+            values = []
+            for value in current:
+                plain = _strict_decrypt(cipher, value) if value is not None else None
+                # values that do not decrypt are plain text already
+                values.append(plain if plain is not None else value)
+        else:
+            values = []
+            for value in current:
+                if value is None or _strict_decrypt(new_cipher, value) is not None:
+                    values.append(value)
+                    continue
+                plain = _strict_decrypt(cipher, value)
+                if plain is None:
+                    break
+                values.append(new_cipher.encrypt(plain.encode('utf-8')).hex())
+            if len(values) < len(current):
+                failed.append(row['applicant_id'])
+                continue
+        if values != current:
+            updates.append((*values, row['applicant_id']))
+
+    return updates, failed
+
 class DatabaseSeeder:
     def __init__(self) -> None:
         try:
@@ -49,12 +135,17 @@ class DatabaseSeeder:
             self.params: Dict[str, Any] = config.get_connection_params()
             
             self.encryption_key: Optional[bytes] = None
+            self.cipher: Optional[AESCipher] = None
             encryption_password = config.get_encryption_password()
             if encryption_password and encrypt is not None:
                 self.set_encryption_key(encryption_password)
                 print(f"[+] Encryption key loaded from configuration")
             else:
                 print("[*] No encryption password found in configuration")
+
+            self.blind_indexer: Optional[BlindIndexer] = None
+            if BlindIndexer is not None:
+                self.blind_indexer = BlindIndexer(config.get_blind_index_password() or "default_key_123")
                 
         except Exception as e:
             print(f"[-] Error loading database config: {e}")
@@ -127,6 +218,7 @@ class DatabaseSeeder:
                 key_bytes = key_bytes[:16]
             
             self.encryption_key = key_bytes
+            self.cipher = AESCipher(key_bytes)
             print(f"[+] Encryption key set successfully")
             return True
         except Exception as e:
@@ -135,10 +227,10 @@ class DatabaseSeeder:
 
     def encrypt_data(self, data: str) -> str:
         try:
-            if self.encryption_key is None or encrypt is None:
+            if self.cipher is None:
                 return data
             
-            encrypted_bytes = encrypt(self.encryption_key, data.encode('utf-8'))
+            encrypted_bytes = self.cipher.encrypt(data.encode('utf-8'))
             return encrypted_bytes.hex()
         except Exception as e:
             print(f"[-] Error encrypting data: {e}")
@@ -146,11 +238,11 @@ class DatabaseSeeder:
 
     def decrypt_data(self, hex_data: str) -> str:
         try:
-            if self.encryption_key is None or decrypt is None:
+            if self.cipher is None:
                 return hex_data
             
             encrypted_bytes = bytes.fromhex(hex_data)
-            decrypted_bytes = decrypt(self.encryption_key, encrypted_bytes)
+            decrypted_bytes = self.cipher.decrypt(encrypted_bytes)
             return decrypted_bytes.decode('utf-8')
         except Exception as e:
             print(f"[-] Error decrypting data: {e}")
@@ -276,6 +368,137 @@ class DatabaseSeeder:
         except (ValueError, TypeError):
             return False
 
+    def _plaintext_value(self, value: Any) -> str:
+        # same heuristic as _AutoDecryptHelper.is_data_encrypted, without the error noise
+        text = str(value) if value is not None else ""
+        if self.cipher is None:
+            return text
+        if len(text) < 16 or len(text) % 32 != 0:
+            return text
+        try:
+            return self.cipher.decrypt(bytes.fromhex(text)).decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            return text
+
+    def blind_index_available(self) -> bool:
+        try:
+            if not self.connection or self.blind_indexer is None:
+                return False
+
+            cursor = self.connection.cursor()
+            cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ApplicantProfile'
+                 AND COLUMN_NAME IN ('name_bidx', 'phone_bidx', 'dob_bidx')),
+                (SELECT COUNT(*) FROM information_schema.TABLES
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ApplicantBlindToken')
+            """)
+            bidx_columns, token_tables = cursor.fetchone()
+            cursor.close()
+            return bidx_columns == 3 and token_tables == 1
+        except Error as e:
+            print(f"[-] Error checking blind index schema: {e}")
+            return False
+
+    def _write_blind_index(self, cursor, applicant_id: int, first_name: str, last_name: str,
+                           phone_number: str, date_of_birth: str) -> None:
+        columns = self.blind_indexer.profile_columns(first_name, last_name, phone_number, date_of_birth)
+        cursor.execute(
+            "UPDATE ApplicantProfile SET name_bidx = %s, phone_bidx = %s, dob_bidx = %s WHERE applicant_id = %s",
+            (columns['name_bidx'], columns['phone_bidx'], columns['dob_bidx'], applicant_id)
+        )
+        cursor.execute("DELETE FROM ApplicantBlindToken WHERE applicant_id = %s", (applicant_id,))
+        rows = self.blind_indexer.profile_token_rows(applicant_id, first_name, last_name, phone_number, date_of_birth)
+        if rows:
+            cursor.executemany(
+                "INSERT INTO ApplicantBlindToken (applicant_id, field, token) VALUES (%s, %s, %s)", rows
+            )
+
+    def _apply_blind_index_schema(self, sql_file_path: str) -> bool:
+        """Run blind_index.sql step by step, skipping columns and indexes an earlier partial run already added"""
+        try:
+            with open(sql_file_path, 'r', encoding='utf-8') as file:
+                sql_commands = [cmd.strip() for cmd in file.read().split(';') if cmd.strip()]
+
+            cursor = self.connection.cursor()
+            for command in sql_commands:
+                if not command.upper().startswith(('ALTER', 'CREATE')):
+                    continue
+                try:
+                    cursor.execute(command)
+                except Error as e:
+                    if e.errno in (ER_DUP_FIELDNAME, ER_DUP_KEYNAME):
+                        continue
+                    print(f"[-] Error applying blind index migration: {e}")
+                    print(f"    Command: {command[:100]}...")
+                    cursor.close()
+                    return False
+            self.connection.commit()
+            cursor.close()
+            return True
+
+        except (OSError, Error) as e:
+            print(f"[-] Error applying blind index migration: {e}")
+            return False
+
+    def build_blind_indexes(self) -> bool:
+        try:
+            if not self.connection:
+                return False
+
+            if self.blind_indexer is None:
+                print("[-] Blind index module not available")
+                return False
+
+            if not self.blind_index_available():
+                sql_file_path = os.path.join(src_dir, 'db', 'blind_index.sql')
+                print("[*] Blind index schema not found, applying migration...")
+                if not self._apply_blind_index_schema(sql_file_path) or not self.blind_index_available():
+                    print("[-] Could not create blind index schema")
+                    return False
+
+            cursor = self.connection.cursor(dictionary=True)
+            cursor.execute("SELECT applicant_id, first_name, last_name, date_of_birth, phone_number FROM ApplicantProfile")
+            records = cursor.fetchall()
+
+            print(f"[*] Building blind indexes for {len(records)} records...")
+
+            indexed_count = 0
+            for record in records:
+                try:
+                    self._write_blind_index(
+                        cursor,
+                        record['applicant_id'],
+                        self._plaintext_value(record['first_name']),
+                        self._plaintext_value(record['last_name']),
+                        self._plaintext_value(record['phone_number']),
+                        self._plaintext_value(record['date_of_birth'])
+                    )
+                    indexed_count += 1
+
+                    if indexed_count % 50 == 0:
+                        self.connection.commit()
+                        print(f"[*] Indexed {indexed_count}/{len(records)} records...")
+
+                except Error as e:
+                    print(f"[-] Error indexing record ID {record['applicant_id']}: {e}")
+                    continue
+
+            self.connection.commit()
+            cursor.close()
+            print(f"[+] Successfully built blind indexes for {indexed_count} records")
+            return True
+
+        except Error as e:
+            print(f"[-] Error building blind indexes: {e}")
+            if self.connection:
+                try:
+                    self.connection.rollback()
+                except:
+                    pass
+            return False
+
     def backup_database(self) -> bool:
         try:
             if not self.connection:
@@ -456,6 +679,152 @@ class DatabaseSeeder:
                     pass
             return False
 
+    def _migration_checkpoint_path(self, mode: str) -> str:
+        return os.path.join(MIGRATION_CHECKPOINT_DIR, f"migration_{mode}.json")
+
+    def _migration_fingerprint(self, mode: str, new_key: Optional[bytes]) -> str:
+        digest = hashlib.sha256(b'therecruiter-migration:' + mode.encode() + b':' + self.encryption_key)
+        if new_key:
+            digest.update(b':' + new_key)
+        return digest.hexdigest()[:16]
+
+    def _load_migration_checkpoint(self, mode: str, fingerprint: str) -> Tuple[int, int]:
+        try:
+            with open(self._migration_checkpoint_path(mode), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('fingerprint') != fingerprint:
+                print("[*] Found a checkpoint for different keys, starting from the beginning")
+                return 0, 0
+            return int(checkpoint['last_id']), int(checkpoint.get('migrated', 0))
+        except FileNotFoundError:
+            return 0, 0
+        except (ValueError, KeyError, OSError) as e:
+            print(f"[-] Ignoring unreadable migration checkpoint: {e}")
+            return 0, 0
+
+    def _save_migration_checkpoint(self, mode: str, fingerprint: str, last_id: int, migrated: int) -> None:
+        os.makedirs(MIGRATION_CHECKPOINT_DIR, exist_ok=True)
+        path = self._migration_checkpoint_path(mode)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'mode': mode, 'fingerprint': fingerprint, 'last_id': last_id, 'migrated': migrated}, f)
+        os.replace(path + '.tmp', path)
+
+    def bulk_migrate_encryption(self, mode: str, batch_size: int = 1000, workers: Optional[int] = None,
+                                new_key_string: Optional[str] = None, resume: bool = True) -> bool:
+        """
+        Encrypt, decrypt or re-key ApplicantProfile in keyset-paginated batches.
+        Pages are transformed in a process pool while the next page is read, and
+        written back with one executemany per page. A checkpoint after every
+        committed page lets an interrupted run pick up where it stopped.
+        """
+        try:
+            if not self.connection:
+                return False
+
+            if mode not in ('encrypt', 'decrypt', 'rotate'):
+                print(f"[-] Unknown migration mode: {mode}")
+                return False
+
+            if self.encryption_key is None or AESCipher is None:
+                print("[-] Encryption key not set")
+                return False
+
+            new_key = None
+            if mode == 'rotate':
+                if not new_key_string:
+                    print("[-] A new key is required for key rotation")
+                    return False
+                new_key = new_key_string.encode('utf-8')[:16].ljust(16, b'\x00')
+
+            fingerprint = self._migration_fingerprint(mode, new_key)
+            last_id, migrated = self._load_migration_checkpoint(mode, fingerprint) if resume else (0, 0)
+            if last_id:
+                print(f"[*] Resuming {mode} migration after applicant ID {last_id} ({migrated} rows already migrated)")
+
+            workers = workers or max(1, cpu_count() - 1)
+            select_query = f"""
+            SELECT applicant_id, {', '.join(PROFILE_COLUMNS)}
+            FROM ApplicantProfile
+            WHERE applicant_id > %s
+            ORDER BY applicant_id
+            LIMIT %s
+            """
+            update_query = """
+            UPDATE ApplicantProfile 
+            SET first_name = %s, last_name = %s, date_of_birth = %s, address = %s, phone_number = %s
+            WHERE applicant_id = %s
+            """
+
+            print(f"[*] Starting bulk {mode} migration (batch size {batch_size}, {workers} workers)...")
+            cursor = self.connection.cursor(dictionary=True)
+            pending = deque()
+            skipped: List[int] = []
+            exhausted = False
+
+            with Pool(processes=workers) as pool:
+                while pending or not exhausted:
+                    # keep the pool fed while earlier pages are written back in order
+                    while not exhausted and len(pending) < workers * 2:
+                        cursor.execute(select_query, (last_id, batch_size))
+                        rows = cursor.fetchall()
+                        if not rows:
+                            exhausted = True
+                            break
+                        last_id = rows[-1]['applicant_id']
+                        rows = [{key: row[key] for key in ('applicant_id',) + PROFILE_COLUMNS} for row in rows]
+                        result = pool.apply_async(_migrate_batch, ((mode, self.encryption_key, new_key, rows),))
+                        pending.append((last_id, result))
+
+                    if not pending:
+                        break
+
+                    batch_last_id, result = pending.popleft()
+                    updates, failed = result.get()
+                    if failed:
+                        skipped.extend(failed)
+                        shown = ', '.join(map(str, failed[:10])) + (', ...' if len(failed) > 10 else '')
+                        print(f"[-] Skipped {len(failed)} records that do not decrypt under the current key "
+                              f"(applicant IDs {shown})")
+                    if updates:
+                        cursor.executemany(update_query, updates)
+                    self.connection.commit()
+                    migrated += len(updates)
+                    self._save_migration_checkpoint(mode, fingerprint, batch_last_id, migrated)
+                    print(f"[*] Migrated {migrated} records (through applicant ID {batch_last_id})...")
+
+            cursor.close()
+
+            if mode == 'rotate':
+                self.set_encryption_key(new_key_string)
+                if not get_db_config().has_blind_index_password() and self.blind_index_available():
+                    # the blind index key falls back to ENCRYPTION_PASSWORD, which is about to become the new key
+                    print("[*] BLIND_INDEX_PASSWORD is not set, rebuilding blind indexes under the new key...")
+                    self.blind_indexer = BlindIndexer(new_key_string)
+                    if not self.build_blind_indexes():
+                        print("[-] Blind index rebuild failed, run option 9 once ENCRYPTION_PASSWORD is the new key")
+                print("[*] Set ENCRYPTION_PASSWORD to the new key before starting the application")
+
+            try:
+                os.remove(self._migration_checkpoint_path(mode))
+            except OSError:
+                pass
+
+            print(f"[+] Bulk {mode} migration finished, {migrated} records migrated")
+            if skipped:
+                print(f"[-] {len(skipped)} records were left unchanged because a field did not decrypt under the "
+                      f"current key; they need the key they were written with")
+            return True
+
+        except Error as e:
+            print(f"[-] Error during bulk {mode} migration: {e}")
+            print("[*] Progress up to the last committed batch is checkpointed, rerun to resume")
+            if self.connection:
+                try:
+                    self.connection.rollback()
+                except:
+                    pass
+            return False
+
     def seed_applicant_profiles(self, count: int = 200, use_encryption: bool = False) -> bool:
         try:
             if not self.connection:
@@ -468,6 +837,8 @@ class DatabaseSeeder:
             cursor = self.connection.cursor()
             encryption_status = "with encryption" if use_encryption else "without encryption"
             print(f"[*] Generating and inserting {count} applicant profiles {encryption_status}...")
+
+            maintain_blind_index = self.blind_index_available()
             
             query = """
             INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number)
@@ -480,6 +851,7 @@ class DatabaseSeeder:
                 birth_date = self.generate_birth_date()
                 address = self.generate_address()
                 phone = self.generate_phone_number()
+                plain_first_name, plain_last_name, plain_phone = first_name, last_name, phone
                 
                 if use_encryption:
                     first_name = self.encrypt_data(first_name)
@@ -492,6 +864,10 @@ class DatabaseSeeder:
                 else:
                     applicant_data = (first_name, last_name, birth_date, address, phone)
                 cursor.execute(query, applicant_data)
+
+                if maintain_blind_index:
+                    self._write_blind_index(cursor, cursor.lastrowid, plain_first_name, plain_last_name,
+                                            plain_phone, str(birth_date))
                 
                 if (i + 1) % 50 == 0:
                     self.connection.commit()
@@ -534,6 +910,7 @@ class DatabaseSeeder:
             """
             
             inserted_count = 0
+            seeded_cvs = set()
             
             for applicant_id in applicant_ids:
                 num_applications = random.randint(1, 3)
@@ -541,6 +918,7 @@ class DatabaseSeeder:
                 
                 for pdf_file in selected_pdfs:
                     role = self.generate_job_role()
+                    seeded_cvs.add(pdf_file)
                     
                     application_data = (applicant_id, role, pdf_file)
                     cursor.execute(query, application_data)
@@ -553,6 +931,7 @@ class DatabaseSeeder:
             self.connection.commit()
             cursor.close()
             print(f"[+] Successfully seeded {inserted_count} application details")
+            self.update_cv_index(seeded_cvs)
             return True
             
         except Error as e:
@@ -564,6 +943,227 @@ class DatabaseSeeder:
                     pass
             return False
 
+    def update_cv_index(self, cv_paths) -> None:
+        """
+        Add newly seeded CVs to the live CV index, if one has been built, and
+        merge them into its base right away: a running app then maps the new
+        base instead of extracting every seeded CV into its delta segment.
+        """
+        if get_live_index is None or not cv_paths:
+            return
+        try:
+            index = get_live_index()
+            if index is None:
+                return
+            print(f"[*] Updating live CV index with {len(cv_paths)} CVs...")
+            index.put_many(sorted(cv_paths))
+            index.merge(wait=True)
+            stats = index.stats()
+            print(f"[+] Live CV index now holds {stats['base_docs'] - stats['base_deleted'] + stats['delta_docs']} CVs")
+        except Exception as e:
+            print(f"[-] Error updating live CV index: {e}")
+
+    def _secondary_indexes(self, cursor, table: str) -> List[Dict[str, Any]]:
+        """Indexes on `table` that are safe to drop: not PRIMARY and not backing a foreign key"""
+        cursor.execute("""
+        SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """, (table,))
+        statistics = cursor.fetchall()
+        cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+        """, (table,))
+        foreign_key_columns = {row[0] for row in cursor.fetchall()}
+
+        indexes: Dict[str, Dict[str, Any]] = {}
+        for index_name, non_unique, column_name, sub_part in statistics:
+            index = indexes.setdefault(index_name, {'name': index_name, 'unique': not int(non_unique), 'columns': []})
+            index['columns'].append(f"`{column_name}`({sub_part})" if sub_part else f"`{column_name}`")
+
+        return [
+            index for index in indexes.values()
+            if index['columns'][0].split('(')[0].strip('`') not in foreign_key_columns
+        ]
+
+    def _drop_secondary_indexes(self, cursor, tables: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        dropped: Dict[str, List[Dict[str, Any]]] = {}
+        for table in tables:
+            indexes = self._secondary_indexes(cursor, table)
+            if not indexes:
+                continue
+            cursor.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX `{index['name']}`" for index in indexes))
+            dropped[table] = indexes
+            print(f"[*] Dropped {len(indexes)} secondary indexes on {table} for the load")
+        return dropped
+
+    def _restore_secondary_indexes(self, cursor, dropped: Dict[str, List[Dict[str, Any]]]) -> None:
+        for table, indexes in dropped.items():
+            clauses = [
+                f"ADD {'UNIQUE ' if index['unique'] else ''}INDEX `{index['name']}` ({', '.join(index['columns'])})"
+                for index in indexes
+            ]
+            print(f"[*] Rebuilding {len(indexes)} secondary indexes on {table}...")
+            cursor.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+    def _table_columns(self, cursor, table: str) -> List[str]:
+        cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _load_csv(self, cursor, table: str, columns: List[str], csv_path: str) -> None:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (csv_path,)
+        )
+
+    def bulk_seed(self, count: int, use_encryption: bool = False, batch_size: int = 5000,
+                  workers: Optional[int] = None, use_load_data: bool = False,
+                  with_details: bool = True) -> bool:
+        """
+        High-throughput seeding for load-test databases. Faker generation runs
+        in a process pool in chunks of `batch_size` applicants with explicit
+        applicant IDs, so profiles, application details and blind index rows
+        are all produced without a round trip per row. Rows are written with
+        batched multi-row executemany, or with LOAD DATA LOCAL INFILE from
+        generated CSV files when `use_load_data` is set. Secondary indexes are
+        dropped for the load and rebuilt once at the end.
+        """
+        load_connection = None
+        dropped: Dict[str, List[Dict[str, Any]]] = {}
+        cursor = None
+        csv_files: Dict[str, Any] = {}
+        try:
+            if not self.connection:
+                return False
+
+            if use_encryption and self.encryption_key is None:
+                print("[-] Encryption requested but no key set")
+                return False
+
+            pdf_files = self.get_pdf_files() if with_details else []
+            if with_details and not pdf_files:
+                print("[*] No PDF files found in data folder, skipping ApplicationDetail")
+                with_details = False
+
+            connection = self.connection
+            if use_load_data:
+                try:
+                    load_connection = mysql.connector.connect(**{**self.params, 'allow_local_infile': True})
+                    connection = load_connection
+                except Error as e:
+                    print(f"[-] LOAD DATA LOCAL INFILE unavailable ({e}), using batched inserts")
+                    use_load_data = False
+
+            cursor = connection.cursor()
+            maintain_blind_index = self.blind_index_available()
+            profile_columns = ['applicant_id', *PROFILE_COLUMNS]
+            if maintain_blind_index:
+                profile_columns += ['name_bidx', 'phone_bidx', 'dob_bidx']
+            detail_columns = ['applicant_id', 'application_role', 'cv_path']
+            token_columns = ['applicant_id', 'field', 'token']
+
+            cursor.execute("SELECT COALESCE(MAX(applicant_id), 0) FROM ApplicantProfile")
+            first_id = cursor.fetchone()[0] + 1
+            workers = workers or max(1, cpu_count() - 1)
+            encryption_status = "with encryption" if use_encryption else "without encryption"
+            print(f"[*] Bulk seeding {count} applicant profiles {encryption_status} "
+                  f"({workers} workers, {'LOAD DATA' if use_load_data else 'executemany'})...")
+
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+            tables = ['ApplicantProfile']
+            if with_details:
+                tables.append('ApplicationDetail')
+            if maintain_blind_index:
+                tables.append('ApplicantBlindToken')
+            dropped = self._drop_secondary_indexes(cursor, tables)
+
+            def insert_query(table: str, columns: List[str]) -> str:
+                return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+            if use_load_data:
+                for table in tables:
+                    handle = tempfile.NamedTemporaryFile('w', suffix=f'_{table}.csv', delete=False,
+                                                         encoding='utf-8', newline='')
+                    csv_files[table] = (handle, csv.writer(handle, quoting=csv.QUOTE_ALL, lineterminator='\n'))
+
+            tasks = [
+                (start, min(batch_size, first_id + count - start), random.randrange(2 ** 32))
+                for start in range(first_id, first_id + count, batch_size)
+            ]
+            key = self.encryption_key if use_encryption else None
+            indexer = self.blind_indexer if maintain_blind_index else None
+
+            generated = 0
+            seeded_cvs = set()
+            with Pool(processes=workers, initializer=_init_bulk_worker,
+                      initargs=(key, indexer, pdf_files)) as pool:
+                for profiles, details, tokens in pool.imap(_generate_bulk_chunk, tasks):
+                    batches = [('ApplicantProfile', profile_columns, profiles),
+                               ('ApplicationDetail', detail_columns, details),
+                               ('ApplicantBlindToken', token_columns, tokens)]
+                    for table, columns, rows in batches:
+                        if table not in tables or not rows:
+                            continue
+                        if use_load_data:
+                            csv_files[table][1].writerows(rows)
+                        else:
+                            cursor.executemany(insert_query(table, columns), rows)
+                    if not use_load_data:
+                        connection.commit()
+                    generated += len(profiles)
+                    seeded_cvs.update(detail[2] for detail in details)
+                    print(f"[*] Generated {generated}/{count} profiles...")
+
+            if use_load_data:
+                for table, columns in (('ApplicantProfile', profile_columns),
+                                       ('ApplicationDetail', detail_columns),
+                                       ('ApplicantBlindToken', token_columns)):
+                    if table not in csv_files:
+                        continue
+                    csv_files[table][0].close()
+                    print(f"[*] Loading {table} from CSV...")
+                    self._load_csv(cursor, table, columns, csv_files[table][0].name)
+                connection.commit()
+
+            print(f"[+] Successfully bulk seeded {generated} applicant profiles {encryption_status}")
+            self.update_cv_index(seeded_cvs)
+            return True
+
+        except Error as e:
+            print(f"[-] Error during bulk seeding: {e}")
+            try:
+                (load_connection or self.connection).rollback()
+            except:
+                pass
+            return False
+
+        finally:
+            for handle, _ in csv_files.values():
+                try:
+                    handle.close()
+                    os.remove(handle.name)
+                except OSError:
+                    pass
+            if cursor is not None:
+                try:
+                    self._restore_secondary_indexes(cursor, dropped)
+                    cursor.execute("SET SESSION unique_checks = 1, foreign_key_checks = 1")
+                    cursor.close()
+                except Error as e:
+                    print(f"[-] Error restoring indexes after bulk load: {e}")
+            if load_connection is not None:
+                try:
+                    load_connection.close()
+                except Exception:
+                    pass
+
     def verify_seeded_data(self, show_decrypted: bool = False) -> None:
         try:
             if not self.connection:
@@ -609,6 +1209,62 @@ class DatabaseSeeder:
         except Error as e:
             print(f"[-] Error verifying data: {e}")
 
+class _ProfileGenerator:
+    """Just the Faker-backed generators of DatabaseSeeder, without config or a connection"""
+    generate_clean_phone_number = DatabaseSeeder.generate_clean_phone_number
+    generate_indonesian_phone_number = DatabaseSeeder.generate_indonesian_phone_number
+    generate_phone_number = DatabaseSeeder.generate_phone_number
+    generate_birth_date = DatabaseSeeder.generate_birth_date
+    generate_address = DatabaseSeeder.generate_address
+    generate_job_role = DatabaseSeeder.generate_job_role
+
+    def __init__(self) -> None:
+        self.fake = Faker('en_US')
+
+_bulk_worker: Dict[str, Any] = {}
+
+def _init_bulk_worker(key: Optional[bytes], indexer: Optional[BlindIndexer], pdf_files: List[str]) -> None:
+    _bulk_worker['generator'] = _ProfileGenerator()
+    _bulk_worker['cipher'] = AESCipher(key) if key else None
+    _bulk_worker['indexer'] = indexer
+    _bulk_worker['pdf_files'] = pdf_files
+
+def _generate_bulk_chunk(task: Tuple[int, int, int]) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+    """Pool worker: generate `count` applicants starting at `start_id`, plus their details and blind tokens"""
+    start_id, count, seed = task
+    generator = _bulk_worker['generator']
+    cipher = _bulk_worker['cipher']
+    indexer = _bulk_worker['indexer']
+    pdf_files = _bulk_worker['pdf_files']
+
+    random.seed(seed)
+    generator.fake.seed_instance(seed)
+    profiles, details, tokens = [], [], []
+
+    for applicant_id in range(start_id, start_id + count):
+        first_name = generator.fake.first_name()
+        last_name = generator.fake.last_name()
+        birth_date = str(generator.generate_birth_date())
+        address = generator.generate_address()
+        phone = generator.generate_phone_number()
+
+        values = [first_name, last_name, birth_date, address, phone]
+        if cipher is not None:
+            values = [cipher.encrypt(value.encode('utf-8')).hex() for value in values]
+        row = [applicant_id, *values]
+
+        if indexer is not None:
+            columns = indexer.profile_columns(first_name, last_name, phone, birth_date)
+            row += [columns['name_bidx'], columns['phone_bidx'], columns['dob_bidx']]
+            tokens.extend(indexer.profile_token_rows(applicant_id, first_name, last_name, phone, birth_date))
+        profiles.append(tuple(row))
+
+        if pdf_files:
+            for pdf_file in random.sample(pdf_files, min(random.randint(1, 3), len(pdf_files))):
+                details.append((applicant_id, generator.generate_job_role(), pdf_file))
+
+    return profiles, details, tokens
+
 def main() -> None:
     print("Database Seeder for ATS System")
     print("=" * 40)
@@ -629,9 +1285,11 @@ def main() -> None:
         print("6. Show database statistics")
         print("7. Encrypt existing database data")
         print("8. Decrypt existing database data")
-        print("9. Exit")
+        print("9. Build blind indexes (searchable encrypted fields)")
+        print("10. Rotate encryption key (bulk, resumable)")
+        print("11. Exit")
         
-        choice = input("\nEnter your choice (1-9): ").strip()
+        choice = input("\nEnter your choice (1-11): ").strip()
         
         if choice == '1':
             use_encryption = False
@@ -659,15 +1317,21 @@ def main() -> None:
             except ValueError:
                 count = 200
             
-            if seeder.seed_applicant_profiles(count, use_encryption):
-                if seeder.seed_application_details():
-                    show_decrypted = False
-                    if use_encryption and seeder.encryption_key:
-                        decrypt_choice = input("Show decrypted data in verification? (y/N): ").lower().strip()
-                        show_decrypted = decrypt_choice == 'y'
-                    
-                    seeder.verify_seeded_data(show_decrypted)
-                    print(f"\n[+] Complete seeding process finished successfully!")
+            bulk_mode = input("Use bulk loader mode (parallel generation, batched load)? (y/N): ").lower().strip() == 'y'
+            if bulk_mode:
+                use_load_data = input("Load through LOAD DATA LOCAL INFILE? (y/N): ").lower().strip() == 'y'
+                seeded = seeder.bulk_seed(count, use_encryption, use_load_data=use_load_data)
+            else:
+                seeded = seeder.seed_applicant_profiles(count, use_encryption) and seeder.seed_application_details()
+
+            if seeded:
+                show_decrypted = False
+                if use_encryption and seeder.encryption_key:
+                    decrypt_choice = input("Show decrypted data in verification? (y/N): ").lower().strip()
+                    show_decrypted = decrypt_choice == 'y'
+                
+                seeder.verify_seeded_data(show_decrypted)
+                print(f"\n[+] Complete seeding process finished successfully!")
                     
         elif choice == '2':
             use_encryption = False
@@ -695,7 +1359,14 @@ def main() -> None:
             except ValueError:
                 count = 200
             
-            if seeder.seed_applicant_profiles(count, use_encryption):
+            bulk_mode = input("Use bulk loader mode (parallel generation, batched load)? (y/N): ").lower().strip() == 'y'
+            if bulk_mode:
+                use_load_data = input("Load through LOAD DATA LOCAL INFILE? (y/N): ").lower().strip() == 'y'
+                seeded = seeder.bulk_seed(count, use_encryption, use_load_data=use_load_data, with_details=False)
+            else:
+                seeded = seeder.seed_applicant_profiles(count, use_encryption)
+
+            if seeded:
                 show_decrypted = False
                 if use_encryption and seeder.encryption_key:
                     decrypt_choice = input("Show decrypted data in verification? (y/N): ").lower().strip()
@@ -764,7 +1435,12 @@ def main() -> None:
             
             confirm = input("Proceed with encryption? (y/N): ").lower().strip()
             if confirm == 'y':
-                if seeder.encrypt_existing_data():
+                bulk_choice = input("Use bulk parallel mode (resumable, for large tables)? (y/N): ").lower().strip()
+                if bulk_choice == 'y':
+                    succeeded = seeder.bulk_migrate_encryption('encrypt')
+                else:
+                    succeeded = seeder.encrypt_existing_data()
+                if succeeded:
                     print("\n[+] Database encryption completed!")
                     print("    Use option 6 to verify the results")
                 else:
@@ -798,7 +1474,12 @@ def main() -> None:
             
             confirm = input("Proceed with decryption? (y/N): ").lower().strip()
             if confirm == 'y':
-                if seeder.decrypt_existing_data():
+                bulk_choice = input("Use bulk parallel mode (resumable, for large tables)? (y/N): ").lower().strip()
+                if bulk_choice == 'y':
+                    succeeded = seeder.bulk_migrate_encryption('decrypt')
+                else:
+                    succeeded = seeder.decrypt_existing_data()
+                if succeeded:
                     print("\n[+] Database decryption completed!")
                     print("    Use option 6 to verify the results")
                 else:
@@ -807,11 +1488,55 @@ def main() -> None:
                 print("[-] Decryption cancelled")
         
         elif choice == '9':
+            if seeder.encryption_key is None and decrypt is not None:
+                key_input = input("Enter encryption key to read encrypted fields (blank for plain text): ").strip()
+                if key_input:
+                    seeder.set_encryption_key(key_input)
+
+            if seeder.build_blind_indexes():
+                print("\n[+] Blind index build completed!")
+            else:
+                print("\n[-] Blind index build failed!")
+
+        elif choice == '10':
+            if encrypt is None:
+                print("[-] Encryption module not available")
+                return
+
+            if seeder.encryption_key is None:
+                key_input = input("Enter current encryption key: ").strip()
+                if not key_input or not seeder.set_encryption_key(key_input):
+                    print("[-] Current encryption key is required")
+                    return
+            else:
+                print("[*] Using current encryption key from configuration")
+
+            new_key_input = input("Enter new encryption key: ").strip()
+            if not new_key_input:
+                print("[-] New encryption key is required")
+                return
+
+            backup_choice = input("Create backup before rotation? (Y/n): ").lower().strip()
+            if backup_choice != 'n':
+                print("[*] Creating backup...")
+                seeder.backup_database()
+
+            confirm = input("Proceed with key rotation? (y/N): ").lower().strip()
+            if confirm == 'y':
+                if seeder.bulk_migrate_encryption('rotate', new_key_string=new_key_input):
+                    print("\n[+] Key rotation completed!")
+                    print("    Update ENCRYPTION_PASSWORD in .env to the new key")
+                else:
+                    print("\n[-] Key rotation failed, rerun with the same keys to resume")
+            else:
+                print("[-] Key rotation cancelled")
+
+        elif choice == '11':
             print("[*] Exiting seeder script")
             return
             
         else:
-            print("Invalid choice. Please select 1-8.")
+            print("Invalid choice. Please select 1-11.")
         
     except KeyboardInterrupt:
         print("\n[-] Process interrupted by user")
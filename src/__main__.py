@@ -20,7 +20,8 @@ def discover_drivers():
 def parse_args(available_drivers):
     parser = argparse.ArgumentParser(
         prog="therecruiter",
-        description="Mau nyari pekerja paling cocok sama kriteriamu (nyari pasangan yang cocok soon)."
+        description="Mau nyari pekerja paling cocok sama kriteriamu (nyari pasangan yang cocok soon).",
+        allow_abbrev=False
     )
     parser.add_argument(
         "-d", "--driver",
@@ -28,17 +29,20 @@ def parse_args(available_drivers):
         default=available_drivers[0], # it should be __main__
         help="Which driver to run (default: %(default)s)"
     )
-    return parser.parse_args()
+    # anything we don't recognise belongs to the driver
+    return parser.parse_known_args()
 
 def main():
     drivers = discover_drivers()
-    args = parse_args(drivers)
+    args, driver_args = parse_args(drivers)
     driver = args.driver
+    sys.argv = [sys.argv[0]] + driver_args
 
     pkg = __package__ or "src"  
     module_name = f"{pkg}.drivers.{driver}"
 
-    print("Running on Python", sys.version) # version debug
+    # stderr, so drivers that print JSON keep stdout clean
+    print("Running on Python", sys.version, file=sys.stderr) # version debug
 
     try:
         driver = importlib.import_module(module_name)
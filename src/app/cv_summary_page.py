@@ -5,6 +5,7 @@ from PyQt5.QtGui import QFont
 from PyQt5 import uic
 import os
 from src.core.extractor import PDFExtractor
+from src.core.extraction_cache import get_extraction_cache
 from src.db.models import db_manager 
 from src.search.cv_grouper import CVGrouper
 
@@ -47,24 +48,13 @@ class CVSummaryPage(QWidget):
         query_data = db_manager.get_data_by_applicant_id(applicantId)
         applicant_data = query_data['application_details']
         applicant_profile = query_data['applicant_profile']
-        print(query_data)
         pdf_path = ""
         for data in applicant_data:
             if data['detail_id'] == detailId:
                 pdf_path = data['cv_path']
         
-        # fetch data here idk how bruh
-        extractor = PDFExtractor()
-        text = extractor.extract_single_pdf(pdf_path)["regex_format"]
-
-        data = self.cv_grouper.group_cv_data(text)
-
-        for key, value in data.items():
-            print("-------------------------------------------")
-            print(key.upper())
-            print("-------------------------------------------")
-            print(value)
-            print("-------------------------------------------")
+        # grouped once per CV version, then served from the local cache
+        data = get_extraction_cache().get_or_group(detailId, pdf_path, PDFExtractor(), self.cv_grouper)
 
         summary = applicant_profile
 
@@ -1,24 +1,15 @@
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Tuple, Optional
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QGridLayout, QFrame)
 from PyQt5.QtCore import Qt, pyqtSignal, QThread, QMetaObject
 from PyQt5.QtGui import QFont
 from PyQt5 import uic
 from src.db.models import db_manager
-from src.search.boyer_moore import BoyerMooreSearch
-from src.search.kmp import KMPSearch
-from src.search.levenshtein import LevenshteinSearch
-from src.search.searcher import KeywordSearcher
 
-import os, time
-from multiprocessing import Pool
-from src.search.search_workers import (
-    search_exact_worker,
-    search_fuzzy_worker
-)
+from src.services.search_service import SearchService
+from src.services.remote_search import RemoteSearchService
+from src.index.segments import get_live_index
 
-import time
-from multiprocessing import Pool
 import os
 import math
 
@@ -32,6 +23,12 @@ class SearchPage(QWidget):
         super().__init__()
         self.load_ui()
         self.use_multiprocessing = True # for benchmarking
+        # SEARCH_SERVICE_URL points at a running `-d serve`; otherwise search in-process
+        service_url = os.getenv("SEARCH_SERVICE_URL")
+        if service_url:
+            self.search_service = RemoteSearchService(service_url)
+        else:
+            self.search_service = SearchService(db_manager, index=get_live_index())
         self.setup_search_functionality()
     
     def load_ui(self):
@@ -85,102 +82,8 @@ class SearchPage(QWidget):
         self.search_thread.start()
 
     def _perform_search(self, keywords, algo_name, max_match):
-        fuzzy_tolerance = 0.2
-        fuzzy_threshold = 3
-        
-        applicants = db_manager.get_all_applicants_data()
-        exact_tasks = []
-        for app in applicants:
-            profile = app["applicant_profile"]
-            for detail in app["application_details"]:
-                task_detail = {
-                    **detail,
-                    "applicant_profile": profile
-                }
-                exact_tasks.append((task_detail, keywords, algo_name, ""))
-
-        t0 = time.time()
-        if self.use_multiprocessing:
-            with Pool(os.cpu_count()) as pool:
-                cv_results = pool.starmap(search_exact_worker, exact_tasks)
-        else:
-            cv_results = [
-                search_exact_worker(*args)
-                for args in exact_tasks
-            ]
-        t_exact = time.time() - t0
-
-        cv_results.sort(key=lambda r: r["exact_count"], reverse=True)
-        exact_selected = cv_results[:max_match]
-        exact_hits = [r for r in exact_selected if r["exact_count"] > 0]
-        E = len(exact_hits)
-
-        total_exact_scanned = len(exact_tasks) 
-        total_fuzzy_scanned = 0
-        fuzzy_selected: List[Dict[str, Any]] = []
-        if E < max_match:
-            # candidates for fuzzy are any CV with exact_count==0
-            no_exact = [r for r in cv_results if r["exact_count"] == 0]
-            total_fuzzy_scanned = len(no_exact)
-
-            # prepare fuzzy tasks on no_exact...
-            fuzzy_tasks = [
-                (idx, r["text"], keywords, fuzzy_tolerance)
-                for idx, r in enumerate(no_exact)
-            ]
-
-            t1 = time.time()
-            if self.use_multiprocessing:
-                with Pool(os.cpu_count()) as pool:
-                    fuzzy_out = pool.starmap(search_fuzzy_worker, fuzzy_tasks)
-            else:
-                fuzzy_out = [
-                    search_fuzzy_worker(*args)
-                    for args in fuzzy_tasks
-                ]
-            t_fuzzy = time.time() - t1
-
-            for idx, fuzzy_raw in fuzzy_out:
-                no_exact[idx]["fuzzy_raw"] = fuzzy_raw
-                # total fuzzy matches count
-                no_exact[idx]["fuzzy_count"] = sum(len(v) for v in fuzzy_raw.values())
-
-            # pick top (max_match - E) by fuzzy_count > 0
-            remaining = [r for r in no_exact if r.get("fuzzy_count", 0) > 0]
-            remaining.sort(key=lambda r: r["fuzzy_count"], reverse=True)
-            slots = max_match - E
-            fuzzy_selected = remaining[:slots]
-        else:
-            t_fuzzy = 0.0
-
-        for res in exact_selected:
-            res.setdefault("fuzzy_count", 0)
-        for res in fuzzy_selected:
-            res.setdefault("exact_count", 0)
-
-        all_candidates = exact_selected + fuzzy_selected
-        all_candidates = [
-            r for r in all_candidates
-            if (r["exact_count"] > 0) or (r["fuzzy_count"] > 0)
-        ]
-
-        all_candidates.sort(
-            key=lambda r: (r["exact_count"], r["fuzzy_count"]),
-            reverse=True
-        )
-
-        final_selection = all_candidates[:max_match]
-        
-        # Return all the data needed for the UI update
-        return {
-            'final_selection': final_selection,
-            't_exact': t_exact,
-            't_fuzzy': t_fuzzy,
-            'algo_name': algo_name,
-            'result_count': len(final_selection),
-            'total_exact_scanned': total_exact_scanned,
-            'total_fuzzy_scanned': total_fuzzy_scanned
-        }
+        self.search_service.use_multiprocessing = self.use_multiprocessing
+        return self.search_service.search(keywords, algo_name, max_match)
     
     def on_search_finished(self, result):
         # enable the button back
@@ -191,7 +94,6 @@ class SearchPage(QWidget):
         t_exact = result['t_exact']
         t_fuzzy = result['t_fuzzy']
         algo_name = result['algo_name']
-        result_count = result['result_count']
 
         t_exact_ms = t_exact * 1000
         t_fuzzy_ms = t_fuzzy * 1000
@@ -1,5 +1,13 @@
 from .extractor import PDFExtractor
+from .extraction_cache import ExtractionCache, get_extraction_cache
+from .tracing import Tracer, get_tracer
+from .profiling import QueryProfiler
 
 __all__ = [
-    'PDFExtractor'
+    'PDFExtractor',
+    'ExtractionCache',
+    'get_extraction_cache',
+    'Tracer',
+    'get_tracer',
+    'QueryProfiler'
 ]
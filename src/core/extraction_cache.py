@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from .tracing import get_tracer
+
+try:
+    _PROJECT_ROOT = next(
+        (p for p in Path(__file__).resolve().parents if (p / "pyproject.toml").exists()),
+        Path.cwd()
+    )
+except NameError:
+    _PROJECT_ROOT = Path.cwd()
+
+DEFAULT_CACHE_PATH = _PROJECT_ROOT / ".cache" / "extraction.sqlite3"
+
+PathLike = Union[str, Path]
+
+class ExtractionCache:
+    """
+    Persistent cache of PDFExtractor output, keyed by CV path.
+
+    An entry is reused while the file's mtime and size are unchanged; if they
+    moved, the content hash decides. Entries written with `put_text` have no
+    backing file (synthetic corpora) and are served as long as no real file
+    appears at that path.
+
+    The same database keeps CVGrouper output per application (`detail_id`),
+    tagged with the CV's content hash and the grouper version, so the CV
+    summary page doesn't re-extract and re-parse on every open.
+    """
+    def __init__(self, db_path: PathLike = DEFAULT_CACHE_PATH):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+
+    @property
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        return getattr(self._local, "connection", None)
+
+    @property
+    def _pid(self) -> Optional[int]:
+        return getattr(self._local, "pid", None)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite connections must not cross a fork or a thread (the search
+        # page and the live index read the cache off the UI thread), so each
+        # process and thread opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = self._local.connection = sqlite3.connect(str(self.db_path), timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS extraction (
+                    cv_path          TEXT PRIMARY KEY,
+                    mtime            REAL,
+                    size             INTEGER,
+                    content_hash     TEXT,
+                    regex_format     TEXT NOT NULL,
+                    pattern_matching TEXT NOT NULL,
+                    cached_at        REAL NOT NULL
+                )
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS cv_sections (
+                    detail_id       INTEGER PRIMARY KEY,
+                    cv_path         TEXT NOT NULL,
+                    content_hash    TEXT NOT NULL,
+                    grouper_version INTEGER NOT NULL,
+                    sections        TEXT NOT NULL,
+                    cached_at       REAL NOT NULL
+                )
+            """)
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    @staticmethod
+    def key(pdf_path: PathLike) -> str:
+        """Project-relative posix path when possible, so keys match the cv_path values stored in the DB"""
+        resolved = Path(pdf_path).resolve()
+        try:
+            return resolved.relative_to(_PROJECT_ROOT).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    @staticmethod
+    def file_hash(pdf_path: PathLike) -> str:
+        digest = hashlib.sha1()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def text_hash(regex_format: str) -> str:
+        """Stand-in content hash for synthetic entries, which have no file to hash"""
+        return "text:" + hashlib.sha1(regex_format.encode("utf-8")).hexdigest()
+
+    def get(self, pdf_path: PathLike) -> Optional[Dict[str, str]]:
+        key = self.key(pdf_path)
+        row = self.connection.execute(
+            "SELECT mtime, size, content_hash, regex_format, pattern_matching FROM extraction WHERE cv_path = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        mtime, size, content_hash, regex_format, pattern_matching = row
+        hit = {"regex_format": regex_format, "pattern_matching": pattern_matching}
+
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return hit if content_hash is None else None
+
+        if content_hash is None:
+            # a real file now shadows a synthetic entry
+            return None
+        if mtime == stat.st_mtime and size == stat.st_size:
+            return hit
+        if size == stat.st_size and self.file_hash(pdf_path) == content_hash:
+            # touched or copied, content unchanged
+            with self.connection:
+                self.connection.execute("UPDATE extraction SET mtime = ? WHERE cv_path = ?", (stat.st_mtime, key))
+            return hit
+        return None
+
+    def put(self, pdf_path: PathLike, extracted: Dict[str, str]) -> None:
+        try:
+            stat = os.stat(pdf_path)
+            content_hash = self.file_hash(pdf_path)
+        except OSError:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO extraction VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key(pdf_path), stat.st_mtime, stat.st_size, content_hash,
+                 extracted["regex_format"], extracted["pattern_matching"], time.time())
+            )
+
+    def put_text(self, entries: Iterable[Tuple[PathLike, str, str]]) -> int:
+        """Store pre-extracted (cv_path, regex_format, pattern_matching) entries that have no PDF on disk"""
+        now = time.time()
+        rows = [(self.key(path), None, None, None, regex_format, pattern_matching, now)
+                for path, regex_format, pattern_matching in entries]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO extraction VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def get_or_extract(self, pdf_path: PathLike, extractor) -> Dict[str, str]:
+        with get_tracer().span("cache_lookup"):
+            cached = self.get(pdf_path)
+        if cached is not None:
+            return cached
+        extracted = extractor.extract_single_pdf(Path(pdf_path))
+        if extracted["regex_format"] or extracted["pattern_matching"]:
+            self.put(pdf_path, extracted)
+        return extracted
+
+    def iter_entries(self, batch_size: int = 500) -> Iterable[Tuple[str, str, str, str]]:
+        """
+        Every cached (cv_path, content_hash, regex_format, pattern_matching)
+        in cv_path order, read in keyset-paginated batches so the corpus is
+        never in memory at once.
+        """
+        last = ""
+        while True:
+            rows = self.connection.execute(
+                "SELECT cv_path, content_hash, regex_format, pattern_matching FROM extraction "
+                "WHERE cv_path > ? ORDER BY cv_path LIMIT ?",
+                (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for cv_path, content_hash, regex_format, pattern_matching in rows:
+                yield cv_path, content_hash or self.text_hash(regex_format), regex_format, pattern_matching
+            last = rows[-1][0]
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM extraction").fetchone()[0]
+
+    def content_hash(self, pdf_path: PathLike) -> Optional[str]:
+        """
+        Hash of the CV as it is now. Unchanged files reuse the hash stored with
+        their extraction; synthetic entries hash their cached text.
+        """
+        key = self.key(pdf_path)
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            row = self.connection.execute(
+                "SELECT regex_format FROM extraction WHERE cv_path = ? AND content_hash IS NULL", (key,)
+            ).fetchone()
+            return self.text_hash(row[0]) if row else None
+
+        row = self.connection.execute(
+            "SELECT mtime, size, content_hash FROM extraction WHERE cv_path = ?", (key,)
+        ).fetchone()
+        if row and row[2] is not None and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            return row[2]
+        return self.file_hash(pdf_path)
+
+    def get_sections(self, detail_id: int, pdf_path: PathLike, grouper_version: int) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT content_hash, grouper_version, sections FROM cv_sections WHERE detail_id = ?", (detail_id,)
+        ).fetchone()
+        if row is None or row[1] != grouper_version or row[0] != self.content_hash(pdf_path):
+            return None
+        return json.loads(row[2])
+
+    def put_sections(self, detail_id: int, pdf_path: PathLike, grouper_version: int,
+                     sections: Dict[str, Any], content_hash: Optional[str] = None) -> None:
+        content_hash = content_hash or self.content_hash(pdf_path)
+        if content_hash is None:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cv_sections VALUES (?, ?, ?, ?, ?, ?)",
+                (detail_id, self.key(pdf_path), content_hash, grouper_version,
+                 json.dumps(sections, separators=(",", ":")), time.time())
+            )
+
+    def get_or_group(self, detail_id: int, pdf_path: PathLike, extractor, grouper) -> Dict[str, Any]:
+        """CVGrouper.group_cv_data() output for one application, computed once per CV version"""
+        with get_tracer().span("cache_lookup"):
+            cached = self.get_sections(detail_id, pdf_path, grouper.VERSION)
+        if cached is not None:
+            return cached
+        sections = grouper.group_cv_data(self.get_or_extract(pdf_path, extractor)["regex_format"])
+        self.put_sections(detail_id, pdf_path, grouper.VERSION, sections)
+        return sections
+
+    def clear(self) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM extraction")
+            self.connection.execute("DELETE FROM cv_sections")
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._local.connection = None
+
+_cache: Optional[ExtractionCache] = None
+
+def get_extraction_cache() -> ExtractionCache:
+    global _cache
+    if _cache is None:
+        _cache = ExtractionCache(os.getenv("EXTRACTION_CACHE_PATH", DEFAULT_CACHE_PATH))
+    return _cache
@@ -1,8 +1,11 @@
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from time import perf_counter
+from typing import Dict, Iterator, List, Tuple
 import fitz  # PyMuPDF
+from .tracing import get_tracer
+from .normalizer import normalize, pattern_matching_text, regex_text, to_ascii
 
 class PDFExtractor:
     def __init__(self, data_folder: str = "data"):
@@ -33,52 +36,81 @@ class PDFExtractor:
             return
         # print(f"[+] PDF Extractor initialized with data folder: {self.data_folder}")
 
+    def iter_page_texts(self, pdf_path: Path) -> Iterator[str]:
+        """
+        Yield the raw text of each page in order. The PDF is opened on the
+        first `next()` and closed as soon as the caller stops iterating, so
+        reading a long CV can end early.
+        """
+        tracer = get_tracer()
+        with tracer.span("pdf_open"):
+            doc = fitz.open(str(pdf_path))
+        elapsed = 0.0
+        try:
+            for page in doc:
+                started = perf_counter()
+                text = page.get_text()
+                elapsed += perf_counter() - started
+                yield text
+        finally:
+            doc.close()
+            tracer.record("extract", elapsed)
+
     def extract_text_from_pdf(self, pdf_path: Path) -> str:
             """Extract raw text from PDF file"""
             try:
-                doc = fitz.open(str(pdf_path))
-                text = ""
-                for page_num, page in enumerate(doc):
-                    # Add the text of the current page
-                    text += page.get_text()
-                    
-                    # If it's not the last page, add a clean separator (no more "Page Break")
-                    if page_num < len(doc) - 1:
-                        text += "\n\n"  # Changed from "\n\n--- Page Break ---\n\n"
-                        
-                doc.close()
-                return text
+                # pages joined by a clean separator (no more "Page Break")
+                return "\n\n".join(self.iter_page_texts(pdf_path))
             except Exception as e:
                 print(f"[-] Error extracting text from {pdf_path}: {e}")
                 return ""
 
     def format_for_regex(self, raw_text: str) -> str:
         """Format text for regex processing - preserve original structure with proper spacing"""
-        if not raw_text: return ""
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', raw_text)
-        text = re.sub(r'([a-z])(of|and|the|in|for|with|to)([A-Z])', r'\1 \2 \3', text)
-        text = re.sub(r'\.([A-Z])', r'. \1', text)
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r' *\n *', '\n', text)
-        sections = ['Skills', 'Summary', 'Highlights', 'Accomplishments', 'Experience', 
-                       'Education', 'Projects', 'Profile', 'Objective', 'About', 'Work Experience',
-                       'Technical Skills', 'Professional Experience', 'Career History', 'Employment',
-                       'Qualifications', 'Background', 'Training', 'Certifications']
-        for section in sections:
-            pattern1 = re.compile(f'({section.upper()}|{section})\\n([A-Z])')
-            text = pattern1.sub(r'\1\n\n\2', text)
-            pattern2 = re.compile(f'([a-z\\.])\\n({section.upper()}|{section})\\n')
-            text = pattern2.sub(r'\1\n\n\2\n', text)
-        return text.strip()
+        return regex_text(raw_text)
 
     def format_for_pattern_matching(self, raw_text: str) -> str:
         """Format text for pattern matching - continuous lowercase"""
         if not raw_text: return ""
+        if raw_text.isascii():
+            return pattern_matching_text(raw_text)
+        # \w keeps non-ASCII letters here, unlike the ASCII-folding fast path
         text = raw_text.lower()
         text = re.sub(r'[^\w\s\.,\-\+\(\)/]', ' ', text)
         text = re.sub(r'\s+', ' ', text)
         return text.strip()
 
+    def normalize_page(self, raw_page: str) -> str:
+        """
+        Pattern-matching format of one page. Pages are separated by
+        whitespace, which that format collapses to one space, so joining the
+        non-empty normalized pages with " " gives exactly the pattern-matching
+        text of the whole document.
+        """
+        return pattern_matching_text(raw_page)
+
+    def iter_pattern_pages(self, pdf_path: Path) -> Iterator[Tuple[str, str]]:
+        """Yield (raw page text, normalized page text) one page at a time"""
+        tracer = get_tracer()
+        elapsed = 0.0
+        try:
+            for raw_page in self.iter_page_texts(pdf_path):
+                started = perf_counter()
+                page = self.normalize_page(raw_page)
+                elapsed += perf_counter() - started
+                yield raw_page, page
+        finally:
+            tracer.record("normalize", elapsed)
+
+    def format_pages(self, raw_pages: List[str], pattern_text: str) -> Dict[str, str]:
+        """The extract_single_pdf() result for a fully read document whose pattern text is already known"""
+        raw_text = "\n\n".join(raw_pages)
+        if not raw_text:
+            return {"regex_format": "", "pattern_matching": ""}
+        with get_tracer().span("normalize"):
+            regex_format = regex_text(to_ascii(raw_text))
+        return {"regex_format": regex_format, "pattern_matching": pattern_text}
+
     def extract_single_pdf(self, pdf_path: Path) -> Dict[str, str]:
         """Extract text from a single PDF in both formats, ensuring ASCII-only characters."""
         # print(f"[*] Processing: {pdf_path.name}")
@@ -86,10 +118,8 @@ class PDFExtractor:
         if not raw_text:
             print(f"[-] No text extracted from {pdf_path.name}")
             return {"regex_format": "", "pattern_matching": ""}
-        ascii_text = re.sub(r'[^\x00-\x7F]+', ' ', raw_text)
-        regex_text = self.format_for_regex(ascii_text)
-        pattern_text = self.format_for_pattern_matching(ascii_text)
-        return {"regex_format": regex_text, "pattern_matching": pattern_text}
+        with get_tracer().span("normalize"):
+            return normalize(raw_text)
 
     def extract_all_pdfs(self) -> Dict[str, Dict[str, str]]:
         """
@@ -0,0 +1,88 @@
+import re
+from typing import Dict
+
+# Both output formats of PDFExtractor.extract_single_pdf, with far fewer
+# passes over the text: the pattern-matching format in one translate + split,
+# the regex format with a handful of precompiled patterns. Output is
+# identical to the original multi-pass code.
+
+_NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+
+def _pattern_table() -> bytes:
+    # lowercase letters/digits/underscore, keep the punctuation the searcher
+    # understands, everything else (whitespace included) becomes a space
+    table = bytearray(b' ' * 256)
+    for code in range(128):
+        char = chr(code)
+        if char.isalnum() or char == '_':
+            table[code] = ord(char.lower())
+        elif char in '.,-+()/':
+            table[code] = code
+    return bytes(table)
+
+_PATTERN_TABLE = _pattern_table()
+
+# a space between lowercase (or a full stop) and a following capital:
+# "manageTeams" -> "manage Teams", "end.Next" -> "end. Next"
+_CASE_BOUNDARY = re.compile(r'(?<=[a-z.])(?=[A-Z])')
+_SPACE_RUNS = re.compile(r'[ \t]{2,}|\t')
+_SPACE_AROUND_NEWLINE = re.compile(r'[ \t]*\n[ \t]*')
+
+SECTION_HEADERS = ['Skills', 'Summary', 'Highlights', 'Accomplishments', 'Experience',
+                   'Education', 'Projects', 'Profile', 'Objective', 'About', 'Work Experience',
+                   'Technical Skills', 'Professional Experience', 'Career History', 'Employment',
+                   'Qualifications', 'Background', 'Training', 'Certifications']
+
+# (literal that must occur for either pattern to match, header then capital, header after a line)
+_SECTION_PATTERNS = [
+    (
+        (f'{section}\n', f'{section.upper()}\n'),
+        re.compile(f'({section.upper()}|{section})\\n([A-Z])'),
+        re.compile(f'([a-z\\.])\\n({section.upper()}|{section})\\n'),
+    )
+    for section in SECTION_HEADERS
+]
+
+def to_ascii(text: str) -> str:
+    """Replace each run of non-ASCII characters with one space"""
+    if text.isascii():
+        return text
+    return _NON_ASCII.sub(' ', text)
+
+def pattern_matching_text(raw_text: str) -> str:
+    """
+    Continuous lowercase text for the exact and fuzzy matchers. Same as
+    `format_for_pattern_matching(to_ascii(raw_text))`: non-ASCII characters
+    encode to '?', which the table turns into a space like any other
+    character outside the kept classes, and split/join collapses the spaces.
+    """
+    if not raw_text:
+        return ""
+    folded = raw_text.encode('ascii', 'replace').translate(_PATTERN_TABLE)
+    return b' '.join(folded.split()).decode('ascii')
+
+def regex_text(text: str) -> str:
+    """
+    Structure-preserving text for regex parsing (CVGrouper). Same result as
+    the original pass-per-rule code: its "lowercase + of/and/the + capital"
+    rule can never match after the case-boundary split, and the section
+    rules only run for headers whose literal text is present, in the
+    original order, because each rule's output feeds the next one.
+    """
+    if not text:
+        return ""
+    text = _CASE_BOUNDARY.sub(' ', text)
+    text = _SPACE_RUNS.sub(' ', text)
+    text = _SPACE_AROUND_NEWLINE.sub('\n', text)
+    for literals, header_then_capital, header_after_line in _SECTION_PATTERNS:
+        if literals[0] in text or literals[1] in text:
+            text = header_then_capital.sub(r'\1\n\n\2', text)
+            text = header_after_line.sub(r'\1\n\n\2\n', text)
+    return text.strip()
+
+def normalize(raw_text: str) -> Dict[str, str]:
+    """Both extract_single_pdf formats for raw PDF text"""
+    return {
+        "regex_format": regex_text(to_ascii(raw_text)),
+        "pattern_matching": pattern_matching_text(raw_text)
+    }
@@ -0,0 +1,274 @@
+import os
+import atexit
+import re
+import sys
+import time
+import pstats
+import signal
+import cProfile
+import threading
+from pathlib import Path
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from .extraction_cache import _PROJECT_ROOT
+
+DEFAULT_PROFILE_DIR = _PROJECT_ROOT / ".cache" / "profiles"
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# what a pool worker needs to profile itself: (mode, sample interval in seconds)
+WorkerProfile = Tuple[str, float]
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+class StackSampler:
+    """
+    Statistical profiler: a daemon thread snapshots one thread's stack every
+    `interval` seconds and counts collapsed stacks ("a.py:f;b.py:g"), stopping
+    at `root` so pool and Qt plumbing above the profiled call is left out.
+    Used off the main thread (the GUI's search QThread), where signals can't
+    be handled; it only gets the GIL at switch intervals, so it is coarser.
+    """
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, root) -> None:
+        target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(target, root), daemon=True)
+        self._thread.start()
+
+    def _run(self, target: int, root) -> None:
+        while not self._stop.wait(self.interval):
+            if self._stop.is_set():
+                # timed out but only got the GIL once stop() was already joining
+                break
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                if frame is root:
+                    break
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Dict[str, int]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return dict(self.stacks)
+
+class SignalSampler:
+    """
+    Statistical profiler driven by SIGPROF, for code running in a process's
+    main thread (pool workers, CLI drivers). The handler runs between
+    bytecodes of the sampled thread itself, so short GIL-bound calls are
+    sampled as fairly as long ones. The CPU-time timer is armed once per
+    process and left running: re-arming it per call would round every short
+    call up to a kernel tick, and an idle process receives no signals.
+    """
+    _armed: Optional[Tuple[int, float]] = None
+    _active: Optional["SignalSampler"] = None
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._root = None
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    @staticmethod
+    def _dispatch(signum, frame) -> None:
+        sampler = SignalSampler._active
+        if sampler is not None:
+            sampler._record(frame)
+
+    def start(self, root) -> None:
+        self._root = root
+        SignalSampler._active = self
+        # timers don't survive fork, so a pool worker arms its own
+        armed = (os.getpid(), self.interval)
+        if SignalSampler._armed != armed:
+            signal.signal(signal.SIGPROF, SignalSampler._dispatch)
+            signal.siginterrupt(signal.SIGPROF, False)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            if SignalSampler._armed is None or SignalSampler._armed[0] != armed[0]:
+                atexit.register(SignalSampler.disarm)
+            SignalSampler._armed = armed
+
+    @staticmethod
+    def disarm() -> None:
+        # interpreter shutdown resets the handler, a live timer would then kill the process
+        if SignalSampler._armed is not None and SignalSampler._armed[0] == os.getpid():
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        SignalSampler._armed = None
+
+    def _record(self, frame) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            if frame is self._root:
+                break
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Dict[str, int]:
+        SignalSampler._active = None
+        return dict(self.stacks)
+
+class ProfileCapture:
+    """
+    Profiles the block it wraps. `payload` is picklable so pool workers can
+    return it: collapsed stack counts for "sample", the pstats table for
+    "cprofile", None when `mode` is None.
+    """
+    def __init__(self, mode: Optional[str] = None, interval: float = 0.001):
+        self.mode = mode
+        self.interval = interval
+        self.payload: Any = None
+        self._profiler: Any = None
+
+    def __enter__(self) -> "ProfileCapture":
+        if self.mode == "sample":
+            # root the sampled stacks at the function running the with-block
+            sampler = SignalSampler if SignalSampler.available() else StackSampler
+            self._profiler = sampler(self.interval)
+            self._profiler.start(sys._getframe(1))
+        elif self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        if self.mode == "sample":
+            self.payload = self._profiler.stop()
+        elif self.mode == "cprofile":
+            self._profiler.disable()
+            self._profiler.create_stats()
+            self.payload = self._profiler.stats
+        self._profiler = None
+        return False
+
+def capture_profile(options: Optional[WorkerProfile]) -> ProfileCapture:
+    """Worker-side entry point: profile only when the parent passed options"""
+    if options is None:
+        return ProfileCapture()
+    return ProfileCapture(*options)
+
+class ProfileSession:
+    """One search: the parent's capture plus whatever its pool workers sent back"""
+    def __init__(self, profiler: "QueryProfiler"):
+        self.profiler = profiler
+        self.stacks: Counter = Counter()
+        self.stats: Optional[pstats.Stats] = None
+
+    @property
+    def worker_options(self) -> WorkerProfile:
+        return (self.profiler.mode, self.profiler.interval)
+
+    def capture(self) -> ProfileCapture:
+        return _SessionCapture(self)
+
+    def merge(self, payload: Any) -> None:
+        if not payload:
+            return
+        if self.profiler.mode == "sample":
+            self.stacks.update(payload)
+        else:
+            stats = pstats.Stats()
+            stats.stats = payload
+            stats.get_top_level_stats()
+            if self.stats is None:
+                self.stats = stats
+            else:
+                self.stats.add(stats)
+
+    def finish(self, seconds: float, label: str = "search") -> Optional[Path]:
+        """Write the profile if the search was slower than the threshold; returns the file written"""
+        elapsed_ms = seconds * 1000
+        if elapsed_ms < self.profiler.threshold_ms:
+            return None
+
+        output_dir = Path(self.profiler.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:60] or "search"
+        stem = output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}_{int(elapsed_ms)}ms"
+
+        if self.profiler.mode == "sample":
+            path = stem.with_suffix(".folded")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        else:
+            if self.stats is None:
+                return None
+            path = stem.with_suffix(".prof")
+            self.stats.dump_stats(str(path))
+            with open(stem.with_suffix(".txt"), "w", encoding="utf-8") as f:
+                self.stats.stream = f
+                self.stats.sort_stats("cumulative").print_stats(40)
+        print(f"[*] Slow search ({elapsed_ms:.0f} ms >= {self.profiler.threshold_ms:.0f} ms), profile written to {path}")
+        return path
+
+class _SessionCapture(ProfileCapture):
+    def __init__(self, session: ProfileSession):
+        super().__init__(*session.worker_options)
+        self.session = session
+
+    def __exit__(self, *exc) -> bool:
+        super().__exit__(*exc)
+        self.session.merge(self.payload)
+        return False
+
+class QueryProfiler:
+    """
+    Opt-in profiling for slow searches.
+
+    Every search is profiled while a profiler is attached (in the parent and,
+    under multiprocessing, in each pool worker); the merged profile is only
+    written when the search took at least `threshold_ms`. "sample" mode writes
+    collapsed stacks (`.folded`, for flamegraph.pl or speedscope), "cprofile"
+    writes a `.prof` file plus a cumulative-time text report.
+    """
+    def __init__(
+        self,
+        threshold_ms: float = 1000.0,
+        mode: str = "sample",
+        interval_ms: float = 1.0,
+        output_dir: Any = DEFAULT_PROFILE_DIR
+    ):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}, expected one of {', '.join(PROFILE_MODES)}")
+        self.threshold_ms = threshold_ms
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.output_dir = output_dir
+
+    def session(self) -> ProfileSession:
+        return ProfileSession(self)
+
+    @classmethod
+    def from_env(cls) -> Optional["QueryProfiler"]:
+        """
+        SEARCH_PROFILE_THRESHOLD_MS turns profiling on; SEARCH_PROFILE_MODE,
+        SEARCH_PROFILE_INTERVAL_MS and SEARCH_PROFILE_DIR tune it.
+        """
+        threshold = os.getenv("SEARCH_PROFILE_THRESHOLD_MS")
+        if not threshold:
+            return None
+        return cls(
+            threshold_ms=float(threshold),
+            mode=os.getenv("SEARCH_PROFILE_MODE", "sample"),
+            interval_ms=float(os.getenv("SEARCH_PROFILE_INTERVAL_MS", "1")),
+            output_dir=os.getenv("SEARCH_PROFILE_DIR", DEFAULT_PROFILE_DIR)
+        )
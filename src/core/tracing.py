@@ -0,0 +1,164 @@
+import os
+import json
+from time import perf_counter
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# (stage, seconds, pid, cv)
+SpanRecord = Tuple[str, float, int, Optional[str]]
+
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("tracer", "stage", "cv", "start")
+
+    def __init__(self, tracer: "Tracer", stage: str, cv: Optional[str]):
+        self.tracer = tracer
+        self.stage = stage
+        self.cv = cv
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.stage, perf_counter() - self.start, self.cv)
+        return False
+
+class Tracer:
+    """
+    Collects per-stage spans for the search pipeline.
+
+    Disabled tracers hand out one shared no-op span, so instrumented code
+    costs a method call and an attribute check. Records are plain tuples, so
+    pool workers can `drain()` theirs into a result and the parent `merge()`s
+    them; summaries then break down by stage, by worker pid and by CV.
+    """
+    def __init__(self, enabled: bool = False, outliers: int = 10):
+        self.enabled = enabled
+        self.outliers = outliers
+        self.records: List[SpanRecord] = []
+
+    def span(self, stage: str, cv: Optional[str] = None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, cv)
+
+    def record(self, stage: str, seconds: float, cv: Optional[str] = None, pid: Optional[int] = None) -> None:
+        if self.enabled:
+            self.records.append((stage, seconds, pid or os.getpid(), cv))
+
+    def drain(self) -> List[SpanRecord]:
+        records, self.records = self.records, []
+        return records
+
+    def merge(self, records: List[SpanRecord], cv: Optional[str] = None) -> None:
+        """Add records from another process; `cv` labels records that came without one"""
+        if not self.enabled:
+            return
+        if cv is None:
+            self.records.extend(records)
+        else:
+            self.records.extend((stage, seconds, pid, record_cv or cv) for stage, seconds, pid, record_cv in records)
+
+    def reset(self) -> None:
+        self.records = []
+
+    def _by_stage(self) -> Dict[str, List[float]]:
+        stages: Dict[str, List[float]] = defaultdict(list)
+        for stage, seconds, _, _ in self.records:
+            stages[stage].append(seconds)
+        return stages
+
+    def summary(self) -> Dict[str, Any]:
+        stages = {}
+        for stage, durations in self._by_stage().items():
+            durations.sort()
+            count = len(durations)
+            stages[stage] = {
+                'count': count,
+                'total_ms': sum(durations) * 1000,
+                'mean_ms': sum(durations) / count * 1000,
+                'p50_ms': durations[count // 2] * 1000,
+                'p95_ms': durations[min(count - 1, int(count * 0.95))] * 1000,
+                'max_ms': durations[-1] * 1000,
+            }
+
+        workers: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        per_cv: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for stage, seconds, pid, cv in self.records:
+            workers[str(pid)][stage] += seconds * 1000
+            if cv is not None:
+                per_cv[cv][stage] += seconds * 1000
+
+        slowest = sorted(per_cv.items(), key=lambda item: sum(item[1].values()), reverse=True)[:self.outliers]
+        return {
+            'stages': stages,
+            'workers': {pid: dict(breakdown) for pid, breakdown in workers.items()},
+            'outliers': [
+                {'cv': cv, 'total_ms': sum(breakdown.values()), 'stages_ms': dict(breakdown)}
+                for cv, breakdown in slowest
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = "therecruiter_search") -> str:
+        """Prometheus text exposition format: one histogram of stage durations labelled by stage"""
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Duration of search pipeline stages.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, durations in sorted(self._by_stage().items()):
+            for bound in PROMETHEUS_BUCKETS:
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {sum(1 for d in durations if d <= bound)}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {len(durations)}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {sum(durations)}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {len(durations)}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        # write-then-rename so a node_exporter textfile collector never reads half a file
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(path + ".tmp", path)
+
+_tracer = Tracer(enabled=os.getenv("SEARCH_TRACE") == "1")
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer used by the extractor and the search workers"""
+    return _tracer
+
+@contextmanager
+def collect_spans(enabled: bool = False):
+    """
+    Turn the process tracer on for a block (if `enabled`) and hand back the
+    spans recorded inside it, removed from the tracer so long-lived pool
+    workers don't accumulate them.
+    """
+    tracer = _tracer
+    previous = tracer.enabled
+    mark = len(tracer.records)
+    tracer.enabled = previous or enabled
+    spans: List[SpanRecord] = []
+    try:
+        yield spans
+    finally:
+        tracer.enabled = previous
+        spans.extend(tracer.records[mark:])
+        del tracer.records[mark:]
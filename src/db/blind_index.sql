@@ -0,0 +1,23 @@
+ALTER TABLE ApplicantProfile ADD COLUMN name_bidx CHAR(64) DEFAULT NULL;
+ALTER TABLE ApplicantProfile ADD COLUMN phone_bidx CHAR(64) DEFAULT NULL;
+ALTER TABLE ApplicantProfile ADD COLUMN dob_bidx CHAR(64) DEFAULT NULL;
+ALTER TABLE ApplicantProfile ADD INDEX idx_name_bidx (name_bidx);
+ALTER TABLE ApplicantProfile ADD INDEX idx_phone_bidx (phone_bidx);
+ALTER TABLE ApplicantProfile ADD INDEX idx_dob_bidx (dob_bidx);
+
+CREATE TABLE IF NOT EXISTS ApplicantBlindToken (
+    applicant_id INT NOT NULL,
+    field VARCHAR(8) NOT NULL,
+    token CHAR(16) NOT NULL,
+    PRIMARY KEY (field, token, applicant_id),
+    INDEX idx_blind_token_applicant (applicant_id),
+    CONSTRAINT fk_blind_token_profile
+        FOREIGN KEY (applicant_id)
+        REFERENCES ApplicantProfile(applicant_id)
+        ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Adds the optional blind-index columns to an existing database.
+-- Run through the seeder ("Build blind indexes"), which also backfills them.
+-- One change per statement, so a rerun after a partial failure only
+-- trips "duplicate column/key" on the steps that already went through.
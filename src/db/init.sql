@@ -21,7 +21,16 @@ CREATE TABLE IF NOT EXISTS ApplicantProfile (
     last_name VARCHAR(50) DEFAULT NULL,
     date_of_birth DATE DEFAULT NULL,
     address VARCHAR(255) DEFAULT NULL,
-    phone_number VARCHAR(20) DEFAULT NULL
+    phone_number VARCHAR(20) DEFAULT NULL,
+    
+    -- keyed-hash blind indexes of the (possibly encrypted) fields above
+    name_bidx CHAR(64) DEFAULT NULL,
+    phone_bidx CHAR(64) DEFAULT NULL,
+    dob_bidx CHAR(64) DEFAULT NULL,
+    
+    INDEX idx_name_bidx (name_bidx),
+    INDEX idx_phone_bidx (phone_bidx),
+    INDEX idx_dob_bidx (dob_bidx)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ApplicationDetail table  
@@ -38,6 +47,21 @@ CREATE TABLE IF NOT EXISTS ApplicationDetail (
         ON UPDATE RESTRICT
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ApplicantBlindToken table (n-gram blind index for substring search)
+CREATE TABLE IF NOT EXISTS ApplicantBlindToken (
+    applicant_id INT NOT NULL,
+    field VARCHAR(8) NOT NULL,
+    token CHAR(16) NOT NULL,
+    
+    PRIMARY KEY (field, token, applicant_id),
+    INDEX idx_blind_token_applicant (applicant_id),
+    
+    CONSTRAINT fk_blind_token_profile 
+        FOREIGN KEY (applicant_id) 
+        REFERENCES ApplicantProfile(applicant_id) 
+        ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 SHOW TABLES;
 DESCRIBE ApplicantProfile;
 DESCRIBE ApplicationDetail;
\ No newline at end of file
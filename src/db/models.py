@@ -1,6 +1,11 @@
 import sys
 import os
-from typing import Optional, List, Dict, Any, Union
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Union
 
 try:
     import mysql.connector
@@ -25,11 +30,20 @@ except ImportError:
         sys.exit(1)
 
 try:
-    from encrypt import decrypt
+    from encrypt import decrypt, AESCipher
 except ImportError:
     print("[-] Warning: encrypt.py not found, encryption features disabled")
     encrypt = None
     decrypt = None
+    AESCipher = None
+
+try:
+    from blind_index import BlindIndexer, BIDX_COLUMNS
+except ImportError:
+    print("[-] Warning: blind_index.py not found, blind index lookups disabled")
+    BlindIndexer = None
+
+_BIRTH_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
 
 class _DatabaseConnection:
     def __init__(self) -> None:
@@ -89,10 +103,26 @@ class _DatabaseConnection:
             print(f"[-] Unexpected query error: {e}")
             return None
 
+PROFILE_FIELDS = ('first_name', 'last_name', 'date_of_birth', 'address', 'phone_number')
+PROFILE_CACHE_TTL = 300.0
+PROFILE_CACHE_MAX_SIZE = 4096
+
 class _AutoDecryptHelper:
-    def __init__(self, db_connection: _DatabaseConnection) -> None:
+    def __init__(
+        self,
+        db_connection: _DatabaseConnection,
+        cache_ttl: float = PROFILE_CACHE_TTL,
+        cache_max_size: int = PROFILE_CACHE_MAX_SIZE
+    ) -> None:
         self.db = db_connection
         self.encryption_key: Optional[bytes] = None
+        self.cipher: Optional[AESCipher] = None
+
+        # applicant_id -> (expires_at, raw field values, decrypted profile); plaintext never leaves memory
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self._profile_cache: "OrderedDict[Any, Tuple[float, Tuple[Any, ...], Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         try:
             config = get_db_config()
@@ -120,6 +150,8 @@ class _AutoDecryptHelper:
                 key_bytes = key_bytes[:16]
             
             self.encryption_key = key_bytes
+            self.cipher = AESCipher(key_bytes)
+            self.clear_profile_cache()
             return True
         except Exception as e:
             print(f"[-] Error setting encryption key: {e}")
@@ -145,20 +177,70 @@ class _AutoDecryptHelper:
             if not self.is_data_encrypted(text):
                 return text
             
-            if self.encryption_key is None or decrypt is None:
+            if self.cipher is None:
                 return text
             
             encrypted_bytes = bytes.fromhex(text)
-            decrypted_bytes = decrypt(self.encryption_key, encrypted_bytes)
+            decrypted_bytes = self.cipher.decrypt(encrypted_bytes)
             return decrypted_bytes.decode('utf-8')
         except Exception:
             return text
     
+    @staticmethod
+    def _raw_key(profile: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(profile.get(field) for field in PROFILE_FIELDS)
+
+    def _get_cached_profile(self, profile: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached plaintext for a raw row, or None on a miss. An entry
+        only counts if it is fresh and was decrypted from the same ciphertext,
+        so writes made outside this process are never served stale.
+        """
+        if self.cache_max_size <= 0:
+            return None
+        applicant_id = profile.get('applicant_id')
+        with self._cache_lock:
+            entry = self._profile_cache.get(applicant_id)
+            if entry is None:
+                return None
+            expires_at, raw_key, decrypted = entry
+            if expires_at < time.monotonic() or raw_key != self._raw_key(profile):
+                del self._profile_cache[applicant_id]
+                return None
+            self._profile_cache.move_to_end(applicant_id)
+            return dict(decrypted)
+
+    def _cache_profile(self, profile: Dict[str, Any], decrypted: Dict[str, Any]) -> None:
+        if self.cache_max_size <= 0:
+            return
+        applicant_id = profile.get('applicant_id')
+        with self._cache_lock:
+            self._profile_cache[applicant_id] = (
+                time.monotonic() + self.cache_ttl,
+                self._raw_key(profile),
+                dict(decrypted)
+            )
+            self._profile_cache.move_to_end(applicant_id)
+            while len(self._profile_cache) > self.cache_max_size:
+                self._profile_cache.popitem(last=False)
+
+    def invalidate_profile(self, applicant_id: int) -> None:
+        with self._cache_lock:
+            self._profile_cache.pop(applicant_id, None)
+
+    def clear_profile_cache(self) -> None:
+        with self._cache_lock:
+            self._profile_cache.clear()
+
     def process_profile_data(self, profile: Dict[str, Any]) -> Dict[str, Any]:
         if not profile:
             return profile
+
+        cached = self._get_cached_profile(profile)
+        if cached is not None:
+            return cached
         
-        return {
+        decrypted = {
             'applicant_id': profile['applicant_id'],
             'first_name': self.smart_decrypt(str(profile['first_name'])) if profile['first_name'] else '',
             'last_name': self.smart_decrypt(str(profile['last_name'])) if profile['last_name'] else '',
@@ -166,17 +248,220 @@ class _AutoDecryptHelper:
             'address': self.smart_decrypt(str(profile['address'])) if profile['address'] else '',
             'phone_number': self.smart_decrypt(str(profile['phone_number'])) if profile['phone_number'] else ''
         }
+        self._cache_profile(profile, decrypted)
+        return decrypted
 
-class _ApplicantProfile:
+    def process_profiles_data(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk counterpart of `process_profile_data`: cache hits are reused and
+        every encrypted field of the remaining profiles goes through a single
+        batch decryption.
+        """
+        results: List[Optional[Dict[str, Any]]] = [self._get_cached_profile(profile) for profile in profiles]
+        misses = [index for index, cached in enumerate(results) if cached is None]
+        if not misses:
+            return results
+
+        processed = {
+            index: {
+                'applicant_id': profiles[index]['applicant_id'],
+                **{field: str(profiles[index][field]) if profiles[index][field] else '' for field in PROFILE_FIELDS}
+            }
+            for index in misses
+        }
+
+        if self.cipher is not None:
+            targets = []
+            ciphertexts = []
+            for profile in processed.values():
+                for field in PROFILE_FIELDS:
+                    if self.is_data_encrypted(profile[field]):
+                        targets.append((profile, field))
+                        ciphertexts.append(bytes.fromhex(profile[field]))
+
+            try:
+                plaintexts = self.cipher.decrypt_many(ciphertexts)
+            except Exception as e:
+                print(f"[-] Batch decryption failed, decrypting per field: {e}")
+                for index in misses:
+                    results[index] = self.process_profile_data(profiles[index])
+                return results
+
+            for (profile, field), plaintext in zip(targets, plaintexts):
+                try:
+                    profile[field] = plaintext.decode('utf-8')
+                except UnicodeDecodeError:
+                    pass
+
+        for index, decrypted in processed.items():
+            self._cache_profile(profiles[index], decrypted)
+            results[index] = decrypted
+
+        return results
+
+class _BlindIndexHelper:
     def __init__(self, db_connection: _DatabaseConnection) -> None:
         self.db = db_connection
+        self.indexer: Optional[BlindIndexer] = None
+        self.available = False
+
+        try:
+            if BlindIndexer is None:
+                return
+
+            config = get_db_config()
+            password = getattr(config, 'get_blind_index_password', lambda: None)()
+            self.indexer = BlindIndexer(password or "default_key_123")
+            self.available = self._schema_ready()
+            if self.available:
+                print("[+] Blind index lookups enabled")
+            else:
+                print("[*] Blind index columns not found, profile searches will scan all rows")
+        except Exception as e:
+            print(f"[-] Error initializing blind index: {e}")
+            self.available = False
+
+    def _schema_ready(self) -> bool:
+        query = """
+        SELECT
+            (SELECT COUNT(*) FROM information_schema.COLUMNS
+             WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ApplicantProfile'
+             AND COLUMN_NAME IN ('name_bidx', 'phone_bidx', 'dob_bidx')) AS bidx_columns,
+            (SELECT COUNT(*) FROM information_schema.TABLES
+             WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ApplicantBlindToken') AS token_tables
+        """
+        result = self.db.execute_query(query)
+        if not result:
+            return False
+        return result[0]['bidx_columns'] == len(BIDX_COLUMNS) and result[0]['token_tables'] == 1
+
+    def candidate_ids(self, field: str, term: str, exact: bool = False) -> Optional[List[int]]:
+        """
+        Applicant IDs that may match `term`, or None when the index cannot
+        narrow the lookup (index missing, a substring lookup on a field
+        without n-gram tokens, or a term shorter than one n-gram).
+        """
+        if not self.available or self.indexer is None:
+            return None
+
+        if exact:
+            digest = self.indexer.digest(field, term)
+            if digest is None:
+                return None
+            query = f"SELECT applicant_id FROM ApplicantProfile WHERE {BIDX_COLUMNS[field]} = %s"
+            result = self.db.execute_query(query, (digest,))
+        else:
+            tokens = self.indexer.query_tokens(field, term)
+            if tokens is None:
+                return None
+            placeholders = ", ".join(["%s"] * len(tokens))
+            query = f"""
+            SELECT applicant_id FROM ApplicantBlindToken
+            WHERE field = %s AND token IN ({placeholders})
+            GROUP BY applicant_id
+            HAVING COUNT(*) = %s
+            """
+            result = self.db.execute_query(query, (field, *tokens, len(tokens)))
+
+        if result is None:
+            return None
+        return [row['applicant_id'] for row in result]
+
+    def index_profile(self, applicant_id: int, profile: Dict[str, Any]) -> bool:
+        """Rewrite the blind index of one applicant from its plaintext profile"""
+        if not self.available or self.indexer is None:
+            return False
+
+        plain = (profile.get('first_name'), profile.get('last_name'),
+                 profile.get('phone_number'), profile.get('date_of_birth'))
+        columns = self.indexer.profile_columns(*plain)
+        fields = ", ".join([f"{column} = %({column})s" for column in columns])
+        self.db.execute_query(
+            f"UPDATE ApplicantProfile SET {fields} WHERE applicant_id = %(applicant_id)s",
+            {**columns, 'applicant_id': applicant_id}
+        )
+
+        self.db.execute_query("DELETE FROM ApplicantBlindToken WHERE applicant_id = %s", (applicant_id,))
+        rows = self.indexer.profile_token_rows(applicant_id, *plain)
+        if rows:
+            values = ", ".join(["(%s, %s, %s)"] * len(rows))
+            params = tuple(value for row in rows for value in row)
+            self.db.execute_query(
+                f"INSERT INTO ApplicantBlindToken (applicant_id, field, token) VALUES {values}", params
+            )
+        return True
+
+class _CVIndexHelper:
+    def __init__(self, db_connection: _DatabaseConnection) -> None:
+        self.db = db_connection
+        self.index = None
+        self.available = False
+
+        try:
+            from src.index.segments import get_live_index
+            self.index = get_live_index()
+            self.available = self.index is not None
+            if self.available:
+                print("[+] Live CV index enabled")
+        except Exception as e:
+            print(f"[-] Error opening live CV index: {e}")
+            self.available = False
+
+    def _referenced(self, cv_path: str) -> bool:
+        result = self.db.execute_query("SELECT 1 FROM ApplicationDetail WHERE cv_path = %s LIMIT 1", (cv_path,))
+        # when unsure, keep the CV indexed; a stale entry only costs a lookup
+        return result is None or bool(result)
+
+    def cv_added(self, cv_path: Optional[str]) -> None:
+        if not self.available or not cv_path:
+            return
+        try:
+            self.index.put(cv_path)
+        except Exception as e:
+            print(f"[-] Error indexing CV {cv_path}: {e}")
+
+    def cv_removed(self, cv_path: Optional[str]) -> None:
+        """Drop a CV from the index once no application points at it"""
+        if not self.available or not cv_path or self._referenced(cv_path):
+            return
+        try:
+            self.index.delete(cv_path)
+        except Exception as e:
+            print(f"[-] Error removing CV {cv_path} from index: {e}")
+
+class _ApplicantProfile:
+    def __init__(
+        self,
+        db_connection: _DatabaseConnection,
+        auto_decrypt: Optional[_AutoDecryptHelper] = None,
+        blind_index: Optional[_BlindIndexHelper] = None
+    ) -> None:
+        self.db = db_connection
+        self.auto_decrypt = auto_decrypt
+        self.blind_index = blind_index
+
+    def _reindex(self, applicant_id: int) -> None:
+        if not self.blind_index or not self.blind_index.available:
+            return
+        try:
+            profile = self.get_by_id(applicant_id)
+            if not profile:
+                return
+            if self.auto_decrypt:
+                profile = self.auto_decrypt.process_profile_data(profile)
+            self.blind_index.index_profile(applicant_id, profile)
+        except Exception as e:
+            print(f"[-] Error updating blind index for applicant {applicant_id}: {e}")
     
     def insert(self, data: Dict[str, Any]) -> Optional[int]:
         query = """
         INSERT INTO ApplicantProfile (first_name, last_name, date_of_birth, address, phone_number)
         VALUES (%(first_name)s, %(last_name)s, %(date_of_birth)s, %(address)s, %(phone_number)s)
         """
-        return self.db.execute_query(query, data)
+        applicant_id = self.db.execute_query(query, data)
+        if applicant_id:
+            self._reindex(applicant_id)
+        return applicant_id
     
     def get_by_id(self, applicant_id: int) -> Optional[Dict[str, Any]]:
         query = "SELECT * FROM ApplicantProfile WHERE applicant_id = %s"
@@ -193,25 +478,46 @@ class _ApplicantProfile:
             fields = ", ".join([f"{key} = %({key})s" for key in data.keys()])
             query = f"UPDATE ApplicantProfile SET {fields} WHERE applicant_id = %(applicant_id)s"
             data['applicant_id'] = applicant_id
-            return self.db.execute_query(query, data)
+            result = self.db.execute_query(query, data)
+            if self.auto_decrypt:
+                self.auto_decrypt.invalidate_profile(applicant_id)
+            if result is not None and {'first_name', 'last_name', 'date_of_birth', 'phone_number'} & data.keys():
+                self._reindex(applicant_id)
+            return result
         except Exception as e:
             print(f"[-] Error updating applicant: {e}")
             return None
     
     def delete(self, applicant_id: int) -> Optional[int]:
         query = "DELETE FROM ApplicantProfile WHERE applicant_id = %s"
-        return self.db.execute_query(query, (applicant_id,))
+        result = self.db.execute_query(query, (applicant_id,))
+        if self.auto_decrypt:
+            self.auto_decrypt.invalidate_profile(applicant_id)
+        return result
 
 class _ApplicationDetail:
-    def __init__(self, db_connection: _DatabaseConnection) -> None:
+    def __init__(self, db_connection: _DatabaseConnection, cv_index: Optional[_CVIndexHelper] = None) -> None:
         self.db = db_connection
+        self.cv_index = cv_index
+    
+    def get_by_id(self, detail_id: int) -> Optional[Dict[str, Any]]:
+        query = "SELECT detail_id, applicant_id, application_role, cv_path FROM ApplicationDetail WHERE detail_id = %s"
+        result = self.db.execute_query(query, (detail_id,))
+        return result[0] if result else None
+    
+    def _cv_path(self, detail_id: int) -> Optional[str]:
+        detail = self.get_by_id(detail_id)
+        return detail['cv_path'] if detail else None
     
     def insert(self, data: Dict[str, Any]) -> Optional[int]:
         query = """
         INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path)
         VALUES (%(applicant_id)s, %(application_role)s, %(cv_path)s)
         """
-        return self.db.execute_query(query, data)
+        result = self.db.execute_query(query, data)
+        if result is not None and self.cv_index:
+            self.cv_index.cv_added(data.get('cv_path'))
+        return result
     
     def get_all_with_profiles(self) -> List[Dict[str, Any]]:
         query = """
@@ -236,17 +542,29 @@ class _ApplicationDetail:
     
     def update(self, detail_id: int, data: Dict[str, Any]) -> Optional[int]:
         try:
+            new_cv = data.get('cv_path')
+            old_cv = self._cv_path(detail_id) if new_cv and self.cv_index and self.cv_index.available else None
             fields = ", ".join([f"{key} = %({key})s" for key in data.keys()])
             query = f"UPDATE ApplicationDetail SET {fields} WHERE detail_id = %(detail_id)s"
             data['detail_id'] = detail_id
-            return self.db.execute_query(query, data)
+            result = self.db.execute_query(query, data)
+            if result is not None and new_cv and self.cv_index:
+                # same path or not, the file behind it may have changed
+                self.cv_index.cv_added(new_cv)
+                if old_cv != new_cv:
+                    self.cv_index.cv_removed(old_cv)
+            return result
         except Exception as e:
             print(f"[-] Error updating application detail: {e}")
             return None
     
     def delete(self, detail_id: int) -> Optional[int]:
+        old_cv = self._cv_path(detail_id) if self.cv_index and self.cv_index.available else None
         query = "DELETE FROM ApplicationDetail WHERE detail_id = %s"
-        return self.db.execute_query(query, (detail_id,))
+        result = self.db.execute_query(query, (detail_id,))
+        if result is not None and self.cv_index:
+            self.cv_index.cv_removed(old_cv)
+        return result
 
 class _DatabaseManager:
     def __init__(self) -> None:
@@ -255,6 +573,8 @@ class _DatabaseManager:
             self.applicant_profile: Optional[_ApplicantProfile] = None
             self.application_detail: Optional[_ApplicationDetail] = None
             self.auto_decrypt: Optional[_AutoDecryptHelper] = None
+            self.blind_index: Optional[_BlindIndexHelper] = None
+            self.cv_index: Optional[_CVIndexHelper] = None
         except Exception as e:
             print(f"[-] Error initializing DatabaseManager: {e}")
             raise
@@ -264,9 +584,11 @@ class _DatabaseManager:
             if not self.db_connection.connect():
                 return False
             
-            self.applicant_profile = _ApplicantProfile(self.db_connection)
-            self.application_detail = _ApplicationDetail(self.db_connection)
             self.auto_decrypt = _AutoDecryptHelper(self.db_connection)
+            self.blind_index = _BlindIndexHelper(self.db_connection)
+            self.applicant_profile = _ApplicantProfile(self.db_connection, self.auto_decrypt, self.blind_index)
+            self.cv_index = _CVIndexHelper(self.db_connection)
+            self.application_detail = _ApplicationDetail(self.db_connection, self.cv_index)
             
             print("[+] Database initialized successfully")
             return True
@@ -274,6 +596,12 @@ class _DatabaseManager:
             print(f"[-] Error initializing database: {e}")
             return False
     
+    def get_application_detail(self, detail_id: int) -> Optional[Dict[str, Any]]:
+        if not self.application_detail:
+            print("[-] Database not initialized")
+            return None
+        return self.application_detail.get_by_id(detail_id)
+    
     def get_data_by_applicant_id(self, applicant_id: int) -> Optional[Dict[str, Any]]:
         try:
             if not self.db_connection.connection:
@@ -316,136 +644,269 @@ class _DatabaseManager:
             print(f"[-] Error getting data for applicant ID {applicant_id}: {e}")
             return None
     
-    def get_all_applicants_data(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_all_applicants_data(
+        self,
+        limit: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
         try:
             if not self.db_connection.connection:
                 print("[-] No database connection")
                 return []
+
+            return self._fetch_applicants_data(limit=limit, timings=timings)
             
-            query = """
-            SELECT 
-                ap.applicant_id,
-                ap.first_name,
-                ap.last_name, 
-                ap.date_of_birth,
-                ap.address,
-                ap.phone_number,
-                ad.detail_id,
-                ad.application_role,
-                ad.cv_path
+        except Exception as e:
+            print(f"[-] Error getting all applicants data: {e}")
+            return []
+
+    def _fetch_applicants_data(
+        self,
+        where_clause: str = "",
+        params: Optional[List[Any]] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Load applicants joined with their applications in a single query.
+
+        `where_clause` filters ApplicantProfile (aliased `ap`) before the join,
+        so only the surviving profiles are decrypted. When `timings` is given,
+        seconds spent in 'db_fetch' and 'decrypt' are added to it.
+        """
+        started = time.perf_counter()
+        order = "DESC" if descending else "ASC"
+        columns = """
+            ap.applicant_id,
+            ap.first_name,
+            ap.last_name, 
+            ap.date_of_birth,
+            ap.address,
+            ap.phone_number,
+            ad.detail_id,
+            ad.application_role,
+            ad.cv_path
+        """
+
+        if limit:
+            where_sql = f"WHERE {where_clause}" if where_clause else ""
+            query = f"""
+            SELECT {columns}
+            FROM (
+                SELECT * FROM ApplicantProfile ap
+                {where_sql}
+                ORDER BY ap.applicant_id {order}
+                LIMIT {int(limit)}
+            ) ap
+            LEFT JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+            ORDER BY ap.applicant_id {order}, ad.detail_id ASC
+            """
+        else:
+            where_sql = f"WHERE {where_clause}" if where_clause else ""
+            query = f"""
+            SELECT {columns}
             FROM ApplicantProfile ap
             LEFT JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-            ORDER BY ap.applicant_id ASC, ad.detail_id ASC
+            {where_sql}
+            ORDER BY ap.applicant_id {order}, ad.detail_id ASC
             """
-            
-            if limit:
-                query = f"""
-                SELECT 
-                    ap.applicant_id,
-                    ap.first_name,
-                    ap.last_name, 
-                    ap.date_of_birth,
-                    ap.address,
-                    ap.phone_number,
-                    ad.detail_id,
-                    ad.application_role,
-                    ad.cv_path
-                FROM (
-                    SELECT * FROM ApplicantProfile 
-                    ORDER BY applicant_id ASC 
-                    LIMIT {limit}
-                ) ap
-                LEFT JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
-                ORDER BY ap.applicant_id ASC, ad.detail_id ASC
-                """
-            
-            result = self.db_connection.execute_query(query)
-            if not result:
-                return []
-            
-            applicants_dict = {}
-            
-            for row in result:
-                applicant_id = row['applicant_id']
-                
-                if applicant_id not in applicants_dict:
-                    if self.auto_decrypt:
-                        profile_data = {
-                            'applicant_id': applicant_id,
-                            'first_name': row['first_name'],
-                            'last_name': row['last_name'],
-                            'date_of_birth': row['date_of_birth'],
-                            'address': row['address'],
-                            'phone_number': row['phone_number']
-                        }
-                        decrypted_profile = self.auto_decrypt.process_profile_data(profile_data)
-                    else:
-                        decrypted_profile = {
-                            'applicant_id': applicant_id,
-                            'first_name': str(row['first_name']) if row['first_name'] else '',
-                            'last_name': str(row['last_name']) if row['last_name'] else '',
-                            'date_of_birth': str(row['date_of_birth']) if row['date_of_birth'] else '',
-                            'address': str(row['address']) if row['address'] else '',
-                            'phone_number': str(row['phone_number']) if row['phone_number'] else ''
-                        }
-                    
-                    applicants_dict[applicant_id] = {
-                        'applicant_profile': decrypted_profile,
-                        'application_details': [],
-                        'total_applications': 0
-                    }
-                
-                if row['detail_id'] is not None:
-                    application_detail = {
-                        'detail_id': row['detail_id'],
-                        'application_role': row['application_role'],
-                        'cv_path': row['cv_path']
-                    }
-                    applicants_dict[applicant_id]['application_details'].append(application_detail)
-                    applicants_dict[applicant_id]['total_applications'] += 1
-            
-            return list(applicants_dict.values())
-            
-        except Exception as e:
-            print(f"[-] Error getting all applicants data: {e}")
+
+        result = self.db_connection.execute_query(query, tuple(params) if params else None)
+        if not result:
             return []
+        
+        applicants_dict = {}
+        raw_profiles = []
+        
+        for row in result:
+            applicant_id = row['applicant_id']
+            
+            if applicant_id not in applicants_dict:
+                raw_profiles.append({
+                    'applicant_id': applicant_id,
+                    'first_name': row['first_name'],
+                    'last_name': row['last_name'],
+                    'date_of_birth': row['date_of_birth'],
+                    'address': row['address'],
+                    'phone_number': row['phone_number']
+                })
+                applicants_dict[applicant_id] = {
+                    'applicant_profile': None,
+                    'application_details': [],
+                    'total_applications': 0
+                }
+            
+            if row['detail_id'] is not None:
+                application_detail = {
+                    'detail_id': row['detail_id'],
+                    'application_role': row['application_role'],
+                    'cv_path': row['cv_path']
+                }
+                applicants_dict[applicant_id]['application_details'].append(application_detail)
+                applicants_dict[applicant_id]['total_applications'] += 1
+
+        fetched = time.perf_counter()
+        if self.auto_decrypt:
+            decrypted_profiles = self.auto_decrypt.process_profiles_data(raw_profiles)
+        else:
+            decrypted_profiles = [
+                {
+                    key: value if key == 'applicant_id' else (str(value) if value else '')
+                    for key, value in profile.items()
+                }
+                for profile in raw_profiles
+            ]
+        for profile in decrypted_profiles:
+            applicants_dict[profile['applicant_id']]['applicant_profile'] = profile
+
+        if timings is not None:
+            timings['db_fetch'] = timings.get('db_fetch', 0.0) + fetched - started
+            timings['decrypt'] = timings.get('decrypt', 0.0) + time.perf_counter() - fetched
+        
+        return list(applicants_dict.values())
+
+    @staticmethod
+    def _like_pattern(value: str) -> str:
+        escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escaped}%"
+
+    @staticmethod
+    def _ciphertext_guard(column: str) -> str:
+        """SQL predicate that is true when `column` looks like hex ciphertext"""
+        return f"({column} REGEXP '^[0-9A-Fa-f]+$' AND MOD(CHAR_LENGTH({column}), 32) = 0)"
+
+    def _plan_search(self, search_criteria: Dict[str, str]) -> Tuple[str, List[Any]]:
+        """
+        Translate `search_criteria` into a WHERE clause over ApplicantProfile.
+
+        Role and CV path are plaintext columns, so they are pushed down as-is.
+        They are substring matches (LIKE '%term%'), which no B-tree index can
+        serve, so ApplicationDetail is still scanned; what the pushdown saves
+        is loading and decrypting the profiles that cannot match.
+        Profile fields may be stored encrypted, so their predicates only filter
+        plaintext rows and let ciphertext rows through to be checked after
+        decryption. With encryption on every profile row is ciphertext, so
+        those predicates filter nothing and only role and CV path narrow the
+        fetch. The result is a superset of the matches; `advanced_search`
+        still applies every criterion to the decrypted data.
+        """
+        predicates: List[str] = []
+        params: List[Any] = []
+
+        role = search_criteria.get('role')
+        if role:
+            predicates.append(
+                "ap.applicant_id IN (SELECT applicant_id FROM ApplicationDetail WHERE application_role LIKE %s)"
+            )
+            params.append(self._like_pattern(role))
+
+        cv_path = search_criteria.get('cv_path')
+        if cv_path:
+            predicates.append(
+                "ap.applicant_id IN (SELECT applicant_id FROM ApplicationDetail WHERE cv_path LIKE %s)"
+            )
+            params.append(self._like_pattern(cv_path))
+
+        name = search_criteria.get('name')
+        if name:
+            predicates.append(
+                "(CONCAT(COALESCE(ap.first_name, ''), ' ', COALESCE(ap.last_name, '')) LIKE %s"
+                f" OR {self._ciphertext_guard('ap.first_name')}"
+                f" OR {self._ciphertext_guard('ap.last_name')})"
+            )
+            params.append(self._like_pattern(name))
+
+        for key, column in (('birth_date', 'ap.date_of_birth'),
+                            ('phone', 'ap.phone_number'),
+                            ('address', 'ap.address')):
+            value = search_criteria.get(key)
+            if value:
+                predicates.append(f"({column} LIKE %s OR {self._ciphertext_guard(column)})")
+                params.append(self._like_pattern(value))
+
+        return " AND ".join(predicates), params
+
+    def _matches_criteria(self, applicant: Dict[str, Any], search_criteria: Dict[str, str]) -> bool:
+        profile = applicant['applicant_profile']
+        applications = applicant['application_details']
+
+        # Name criteria
+        if 'name' in search_criteria and search_criteria['name']:
+            full_name = f"{profile['first_name']} {profile['last_name']}".lower()
+            if search_criteria['name'].lower() not in full_name:
+                return False
+        
+        # Birth date criteria
+        if 'birth_date' in search_criteria and search_criteria['birth_date']:
+            if search_criteria['birth_date'] not in profile['date_of_birth']:
+                return False
+        
+        # Phone criteria
+        if 'phone' in search_criteria and search_criteria['phone']:
+            if search_criteria['phone'] not in profile['phone_number']:
+                return False
+        
+        # Address criteria
+        if 'address' in search_criteria and search_criteria['address']:
+            if search_criteria['address'].lower() not in profile['address'].lower():
+                return False
+        
+        # Role criteria (check any application)
+        if 'role' in search_criteria and search_criteria['role']:
+            role = search_criteria['role'].lower()
+            if not any(app['application_role'] and role in app['application_role'].lower()
+                       for app in applications):
+                return False
+        
+        # CV path criteria (check any application)
+        if 'cv_path' in search_criteria and search_criteria['cv_path']:
+            cv_path = search_criteria['cv_path'].lower()
+            if not any(app['cv_path'] and cv_path in app['cv_path'].lower()
+                       for app in applications):
+                return False
+
+        return True
     
-    def search_applicants_by_name(self, search_term: str) -> List[Dict[str, Any]]:
+    def _fetch_blind_index_candidates(self, field: str, term: str, exact: bool) -> List[Dict[str, Any]]:
+        """Load the applicants the blind index points at, or every applicant without one"""
+        candidate_ids = self.blind_index.candidate_ids(field, term, exact) if self.blind_index else None
+        if candidate_ids is None:
+            return self._fetch_applicants_data(descending=True)
+        if not candidate_ids:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(candidate_ids))
+        return self._fetch_applicants_data(
+            f"ap.applicant_id IN ({placeholders})", candidate_ids, descending=True
+        )
+
+    @staticmethod
+    def _field_matches(field: str, value: str, term: str, exact: bool) -> bool:
+        if exact and BlindIndexer is not None:
+            return BlindIndexer.normalize(field, value) == BlindIndexer.normalize(field, term)
+        if exact:
+            return value == term
+        if field == 'name':
+            return term.lower() in value.lower()
+        return term in value
+
+    def search_applicants_by_name(self, search_term: str, exact: bool = False) -> List[Dict[str, Any]]:
         try:
             if not self.db_connection.connection:
                 print("[-] No database connection")
                 return []
 
-            profiles = self.applicant_profile.get_all()
-            if not profiles:
-                return []
-            
-            search_term_lower = search_term.lower()
-            matching_applicant_ids = []
-            
-            for profile in profiles:
-                if self.auto_decrypt:
-                    decrypted_profile = self.auto_decrypt.process_profile_data(profile)
-                    searchable_text = (
-                        decrypted_profile['first_name'].lower() + " " +
-                        decrypted_profile['last_name'].lower()
-                    )
-                else:
-                    searchable_text = (
-                        str(profile['first_name']).lower() + " " +
-                        str(profile['last_name']).lower()
-                    )
-                
-                if search_term_lower in searchable_text:
-                    matching_applicant_ids.append(profile['applicant_id'])
-            
-            matching_applicants_data = []
-            for applicant_id in matching_applicant_ids:
-                applicant_data = self.get_data_by_applicant_id(applicant_id)
-                if applicant_data:
-                    matching_applicants_data.append(applicant_data)
-            
-            return matching_applicants_data
+            candidates = self._fetch_blind_index_candidates('name', search_term, exact)
+            return [
+                applicant for applicant in candidates
+                if self._field_matches(
+                    'name',
+                    f"{applicant['applicant_profile']['first_name']} {applicant['applicant_profile']['last_name']}",
+                    search_term,
+                    exact
+                )
+            ]
             
         except Exception as e:
             print(f"[-] Error searching applicants by name: {e}")
@@ -511,69 +972,37 @@ class _DatabaseManager:
             print(f"[-] Error getting applicants by CV path: {e}")
             return []
     
-    def get_applicants_by_birth_date(self, birth_date_pattern: str) -> List[Dict[str, Any]]:
+    def get_applicants_by_birth_date(self, birth_date_pattern: str, exact: bool = False) -> List[Dict[str, Any]]:
         try:
             if not self.db_connection.connection:
                 print("[-] No database connection")
                 return []
 
-            profiles = self.applicant_profile.get_all()
-            if not profiles:
-                return []
-            
-            matching_applicant_ids = []
-            
-            for profile in profiles:
-                if self.auto_decrypt:
-                    decrypted_profile = self.auto_decrypt.process_profile_data(profile)
-                    birth_date = decrypted_profile['date_of_birth']
-                else:
-                    birth_date = str(profile['date_of_birth']) if profile['date_of_birth'] else ""
-                
-                if birth_date_pattern in birth_date:
-                    matching_applicant_ids.append(profile['applicant_id'])
-
-            matching_applicants_data = []
-            for applicant_id in matching_applicant_ids:
-                applicant_data = self.get_data_by_applicant_id(applicant_id)
-                if applicant_data:
-                    matching_applicants_data.append(applicant_data)
-            
-            return matching_applicants_data
+            candidates = self._fetch_blind_index_candidates('dob', birth_date_pattern, exact)
+            return [
+                applicant for applicant in candidates
+                if self._field_matches(
+                    'dob', str(applicant['applicant_profile']['date_of_birth'] or ''), birth_date_pattern, exact
+                )
+            ]
             
         except Exception as e:
             print(f"[-] Error getting applicants by birth date: {e}")
             return []
     
-    def get_applicants_by_phone(self, phone_pattern: str) -> List[Dict[str, Any]]:
+    def get_applicants_by_phone(self, phone_pattern: str, exact: bool = False) -> List[Dict[str, Any]]:
         try:
             if not self.db_connection.connection:
                 print("[-] No database connection")
                 return []
-            
-            profiles = self.applicant_profile.get_all()
-            if not profiles:
-                return []
-            
-            matching_applicant_ids = []
-            
-            for profile in profiles:
-                if self.auto_decrypt:
-                    decrypted_profile = self.auto_decrypt.process_profile_data(profile)
-                    phone_number = decrypted_profile['phone_number']
-                else:
-                    phone_number = str(profile['phone_number']) if profile['phone_number'] else ""
-                
-                if phone_pattern in phone_number:
-                    matching_applicant_ids.append(profile['applicant_id'])
 
-            matching_applicants_data = []
-            for applicant_id in matching_applicant_ids:
-                applicant_data = self.get_data_by_applicant_id(applicant_id)
-                if applicant_data:
-                    matching_applicants_data.append(applicant_data)
-            
-            return matching_applicants_data
+            candidates = self._fetch_blind_index_candidates('phone', phone_pattern, exact)
+            return [
+                applicant for applicant in candidates
+                if self._field_matches(
+                    'phone', str(applicant['applicant_profile']['phone_number'] or ''), phone_pattern, exact
+                )
+            ]
             
         except Exception as e:
             print(f"[-] Error getting applicants by phone: {e}")
@@ -619,63 +1048,15 @@ class _DatabaseManager:
                 print("[-] No database connection")
                 return []
 
-            all_applicants = self.get_all_applicants_data()
-            if not all_applicants:
+            where_clause, params = self._plan_search(search_criteria)
+            candidates = self._fetch_applicants_data(where_clause, params)
+            if not candidates:
                 return []
             
-            matching_applicants = []
-            
-            for applicant in all_applicants:
-                profile = applicant['applicant_profile']
-                applications = applicant['application_details']
-
-                matches = True
-                
-                # Name criteria
-                if 'name' in search_criteria and search_criteria['name']:
-                    full_name = f"{profile['first_name']} {profile['last_name']}".lower()
-                    if search_criteria['name'].lower() not in full_name:
-                        matches = False
-                
-                # Birth date criteria
-                if 'birth_date' in search_criteria and search_criteria['birth_date']:
-                    if search_criteria['birth_date'] not in profile['date_of_birth']:
-                        matches = False
-                
-                # Phone criteria
-                if 'phone' in search_criteria and search_criteria['phone']:
-                    if search_criteria['phone'] not in profile['phone_number']:
-                        matches = False
-                
-                # Address criteria
-                if 'address' in search_criteria and search_criteria['address']:
-                    if search_criteria['address'].lower() not in profile['address'].lower():
-                        matches = False
-                
-                # Role criteria (check any application)
-                if 'role' in search_criteria and search_criteria['role']:
-                    role_found = False
-                    for app in applications:
-                        if app['application_role'] and search_criteria['role'].lower() in app['application_role'].lower():
-                            role_found = True
-                            break
-                    if not role_found:
-                        matches = False
-                
-                # CV path criteria (check any application)
-                if 'cv_path' in search_criteria and search_criteria['cv_path']:
-                    cv_found = False
-                    for app in applications:
-                        if app['cv_path'] and search_criteria['cv_path'].lower() in app['cv_path'].lower():
-                            cv_found = True
-                            break
-                    if not cv_found:
-                        matches = False
-                
-                if matches:
-                    matching_applicants.append(applicant)
-            
-            return matching_applicants
+            return [
+                applicant for applicant in candidates
+                if self._matches_criteria(applicant, search_criteria)
+            ]
             
         except Exception as e:
             print(f"[-] Error in advanced search: {e}")
@@ -683,40 +1064,31 @@ class _DatabaseManager:
     
     def get_applicants_by_age_range(self, min_age: int, max_age: int) -> List[Dict[str, Any]]:
         try:
-            from datetime import datetime
+            if not self.db_connection.connection:
+                print("[-] No database connection")
+                return []
+
             current_year = datetime.now().year
             
             min_birth_year = current_year - max_age
             max_birth_year = current_year - min_age
-            
-            profiles = self.applicant_profile.get_all()
-            if not profiles:
-                return []
-            
-            matching_applicant_ids = []
-            
-            for profile in profiles:
-                if self.auto_decrypt:
-                    decrypted_profile = self.auto_decrypt.process_profile_data(profile)
-                    birth_date = decrypted_profile['date_of_birth']
-                else:
-                    birth_date = str(profile['date_of_birth']) if profile['date_of_birth'] else ""
-
-                try:
-                    import re
-                    year_match = re.search(r'\b(19|20)\d{2}\b', birth_date)
-                    if year_match:
-                        birth_year = int(year_match.group())
-                        if min_birth_year <= birth_year <= max_birth_year:
-                            matching_applicant_ids.append(profile['applicant_id'])
-                except (ValueError, AttributeError):
-                    continue
 
+            # plaintext birth dates are filtered by MySQL, ciphertext ones after decryption
+            where_clause = (
+                "(CAST(REGEXP_SUBSTR(ap.date_of_birth, '\\\\b(19|20)[0-9]{2}\\\\b') AS UNSIGNED)"
+                " BETWEEN %s AND %s"
+                f" OR {self._ciphertext_guard('ap.date_of_birth')})"
+            )
+            candidates = self._fetch_applicants_data(
+                where_clause, [min_birth_year, max_birth_year], descending=True
+            )
+            
             matching_applicants_data = []
-            for applicant_id in matching_applicant_ids:
-                applicant_data = self.get_data_by_applicant_id(applicant_id)
-                if applicant_data:
-                    matching_applicants_data.append(applicant_data)
+            for applicant in candidates:
+                birth_date = applicant['applicant_profile']['date_of_birth']
+                year_match = _BIRTH_YEAR_RE.search(birth_date)
+                if year_match and min_birth_year <= int(year_match.group()) <= max_birth_year:
+                    matching_applicants_data.append(applicant)
             
             return matching_applicants_data
             
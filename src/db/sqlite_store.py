@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+utils_dir = os.path.join(os.path.dirname(current_dir), 'utils')
+sys.path.insert(0, utils_dir)
+
+try:
+    from encrypt import AESCipher
+except ImportError:
+    print("[-] Warning: encrypt.py not found, encryption features disabled")
+    AESCipher = None
+
+PROFILE_FIELDS = ('first_name', 'last_name', 'date_of_birth', 'address', 'phone_number')
+
+class SQLiteApplicantStore:
+    """
+    Stand-in for `db_manager` backed by SQLite (in memory by default), for
+    benchmarks and headless tools that must run without MySQL. It mirrors the
+    ApplicantProfile/ApplicationDetail schema and the read API the search
+    path uses; profile fields can be stored AES-encrypted so the decrypt
+    stage costs what it does in production.
+    """
+    def __init__(self, path: str = ":memory:", encryption_key: Optional[str] = None) -> None:
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.cipher: Optional[AESCipher] = None
+        if encryption_key and AESCipher is not None:
+            key_bytes = encryption_key.encode('utf-8')[:16].ljust(16, b'\x00')
+            self.cipher = AESCipher(key_bytes)
+
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS ApplicantProfile (
+                applicant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                first_name TEXT,
+                last_name TEXT,
+                date_of_birth TEXT,
+                address TEXT,
+                phone_number TEXT
+            );
+            CREATE TABLE IF NOT EXISTS ApplicationDetail (
+                detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                applicant_id INTEGER NOT NULL REFERENCES ApplicantProfile(applicant_id) ON DELETE CASCADE,
+                application_role TEXT,
+                cv_path TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_detail_applicant ON ApplicationDetail (applicant_id);
+        """)
+
+    def _encrypt(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if self.cipher is None:
+            return str(value)
+        return self.cipher.encrypt(str(value).encode('utf-8')).hex()
+
+    def add_applicant(self, profile: Dict[str, Any], applications: Iterable[Dict[str, Any]] = ()) -> int:
+        cursor = self.connection.execute(
+            "INSERT INTO ApplicantProfile (applicant_id, first_name, last_name, date_of_birth, address, phone_number) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (profile.get('applicant_id'), *(self._encrypt(profile.get(field)) for field in PROFILE_FIELDS))
+        )
+        applicant_id = cursor.lastrowid
+        self.connection.executemany(
+            "INSERT INTO ApplicationDetail (applicant_id, application_role, cv_path) VALUES (?, ?, ?)",
+            [(applicant_id, application.get('application_role'), application['cv_path']) for application in applications]
+        )
+        return applicant_id
+
+    def load_manifest(self, manifest_path: str) -> int:
+        """Load applicants from the JSON-lines manifest written by scripts/cv_generator.py"""
+        count = 0
+        with self.connection, open(manifest_path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.add_applicant(record, [record])
+                count += 1
+        return count
+
+    def load_corpus_dir(self, corpus_dir: str, root: Optional[str] = None) -> int:
+        """One applicant per PDF under `corpus_dir`, with cv_path relative to `root` (default: cwd)"""
+        root_path = Path(root or os.getcwd()).resolve()
+        count = 0
+        with self.connection:
+            for pdf_path in sorted(Path(corpus_dir).resolve().rglob("*.pdf")):
+                try:
+                    cv_path = pdf_path.relative_to(root_path).as_posix()
+                except ValueError:
+                    cv_path = pdf_path.as_posix()
+                count += 1
+                self.add_applicant(
+                    {
+                        'first_name': f"Applicant{count}",
+                        'last_name': pdf_path.stem,
+                        'date_of_birth': "2000-01-01",
+                        'address': "Jl. Ganesha No. 10, Bandung",
+                        'phone_number': f"+62-812-{count:08d}"
+                    },
+                    [{'application_role': pdf_path.parent.name, 'cv_path': cv_path}]
+                )
+        return count
+
+    def _decrypt_profiles(self, profiles: List[Dict[str, Any]]) -> None:
+        if self.cipher is None:
+            return
+        targets = []
+        ciphertexts = []
+        for profile in profiles:
+            for field in PROFILE_FIELDS:
+                value = profile[field]
+                if value and len(value) % 32 == 0:
+                    try:
+                        ciphertexts.append(bytes.fromhex(value))
+                        targets.append((profile, field))
+                    except ValueError:
+                        pass
+        for (profile, field), plaintext in zip(targets, self.cipher.decrypt_many(ciphertexts)):
+            try:
+                profile[field] = plaintext.decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+
+    def _fetch_applicants_data(
+        self,
+        where_clause: str = "",
+        params: tuple = (),
+        limit: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        where_sql = f"WHERE {where_clause}" if where_clause else ""
+        limit_sql = f"LIMIT {int(limit)}" if limit else ""
+        rows = self.connection.execute(f"""
+            SELECT ap.applicant_id, ap.first_name, ap.last_name, ap.date_of_birth, ap.address, ap.phone_number,
+                   ad.detail_id, ad.application_role, ad.cv_path
+            FROM (SELECT * FROM ApplicantProfile {where_sql} ORDER BY applicant_id {limit_sql}) ap
+            LEFT JOIN ApplicationDetail ad ON ap.applicant_id = ad.applicant_id
+            ORDER BY ap.applicant_id, ad.detail_id
+        """, params).fetchall()
+
+        applicants: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            applicant = applicants.get(row['applicant_id'])
+            if applicant is None:
+                applicant = applicants[row['applicant_id']] = {
+                    'applicant_profile': {
+                        'applicant_id': row['applicant_id'],
+                        **{field: str(row[field]) if row[field] else '' for field in PROFILE_FIELDS}
+                    },
+                    'application_details': [],
+                    'total_applications': 0
+                }
+            if row['detail_id'] is not None:
+                applicant['application_details'].append({
+                    'detail_id': row['detail_id'],
+                    'application_role': row['application_role'],
+                    'cv_path': row['cv_path']
+                })
+                applicant['total_applications'] += 1
+
+        fetched = time.perf_counter()
+        self._decrypt_profiles([applicant['applicant_profile'] for applicant in applicants.values()])
+
+        if timings is not None:
+            timings['db_fetch'] = timings.get('db_fetch', 0.0) + fetched - started
+            timings['decrypt'] = timings.get('decrypt', 0.0) + time.perf_counter() - fetched
+        return list(applicants.values())
+
+    def get_all_applicants_data(
+        self,
+        limit: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        return self._fetch_applicants_data(limit=limit, timings=timings)
+
+    def get_data_by_applicant_id(self, applicant_id: int) -> Optional[Dict[str, Any]]:
+        applicants = self._fetch_applicants_data("applicant_id = ?", (applicant_id,))
+        return applicants[0] if applicants else None
+
+    def get_application_detail(self, detail_id: int) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT detail_id, applicant_id, application_role, cv_path FROM ApplicationDetail WHERE detail_id = ?",
+            (detail_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def close(self) -> None:
+        self.connection.close()
@@ -2,6 +2,7 @@ SET NAMES 'utf8mb4' COLLATE 'utf8mb4_unicode_ci';
 
 SET FOREIGN_KEY_CHECKS = 0;
 
+DROP TABLE IF EXISTS ApplicantBlindToken;
 DROP TABLE IF EXISTS ApplicationDetail;
 DROP TABLE IF EXISTS ApplicantProfile;
 
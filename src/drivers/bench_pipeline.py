@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+from contextlib import redirect_stdout
+from src.core.profiling import PROFILE_MODES, QueryProfiler
+from src.core.tracing import Tracer
+from src.index import FIELDS, RANKINGS, FieldedIndex, MappedIndex
+from src.db.sqlite_store import SQLiteApplicantStore
+from src.services.search_service import SearchService
+
+STAGES = ('db_fetch', 'decrypt', 'extract', 'exact_match', 'fuzzy_match', 'ranking', 'total')
+
+def _int_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+def _choice_list(choices):
+    def parse(value):
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        for item in items:
+            if item not in choices:
+                raise argparse.ArgumentTypeError(f"{item!r} is not one of {', '.join(choices)}")
+        return items
+    return parse
+
+def _field_weights(value):
+    weights = {}
+    for item in value.split(","):
+        field, sep, weight = item.partition("=")
+        field = field.strip()
+        if not sep or field not in FIELDS:
+            raise argparse.ArgumentTypeError(f"{item!r} is not section=weight with a section from {', '.join(FIELDS)}")
+        weights[field] = float(weight)
+    return weights
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="therecruiter -d bench_pipeline",
+        description="Run the full exact + fuzzy search pipeline headless and report per-stage timings as JSON."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--corpus", help="directory of CV PDFs, one synthetic applicant per file")
+    source.add_argument("--manifest", help="JSON-lines manifest from scripts/cv_generator.py")
+    parser.add_argument("--db", default=":memory:", help="SQLite file for the stand-in database (default: in memory)")
+    parser.add_argument("--encryption-key", help="store profiles AES-encrypted so the decrypt stage is exercised")
+    parser.add_argument("--keywords", default="python,sql,react,leadership",
+                        help="comma-separated keywords (default: %(default)s)")
+    parser.add_argument("--algo", default="KMP", choices=["BM", "KMP", "AC"])
+    parser.add_argument("--max-match", type=int, default=10)
+    parser.add_argument("--pool-sizes", type=_int_list, default=[os.cpu_count() or 1],
+                        help="pool sizes to sweep in multiprocessing mode (default: cpu count)")
+    parser.add_argument("--modes", type=_choice_list(["serial", "mp"]), default=["serial", "mp"],
+                        help="serial and/or mp (default: serial,mp)")
+    parser.add_argument("--cache", type=_choice_list(["on", "off"]), default=["off", "on"],
+                        help="extraction cache settings to sweep (default: off,on)")
+    parser.add_argument("--stop-early", action="store_true",
+                        help="stop reading a CV once every keyword matched (counts become lower bounds)")
+    parser.add_argument("--index", action="store_true",
+                        help="answer exact matches for cached CVs from an in-memory section-aware index")
+    parser.add_argument("--index-file",
+                        help="like --index, but memory-map this on-disk index (built from the cache first if missing)")
+    parser.add_argument("--field-weights", type=_field_weights,
+                        help="rank exact hits by section, e.g. skills=2,experience=1.5,other=0.5")
+    parser.add_argument("--ranking", default="bm25", choices=RANKINGS,
+                        help="BM25 relevance or raw hit counts (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per configuration (default: %(default)s)")
+    parser.add_argument("--trace-json", help="write a per-stage/per-worker/outlier span summary (JSON) here")
+    parser.add_argument("--trace-prom", help="write span histograms in Prometheus text format here")
+    parser.add_argument("--profile-threshold-ms", type=float,
+                        help="profile every run and keep those slower than this (written under .cache/profiles)")
+    parser.add_argument("--profile-mode", default="sample", choices=PROFILE_MODES)
+    parser.add_argument("--profile-dir", help="where to write slow-run profiles")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    out = sys.stdout
+    # the extractor and the pool workers log to stdout; keep it for the JSON
+    with redirect_stdout(sys.stderr):
+        store = SQLiteApplicantStore(args.db, args.encryption_key)
+        if args.manifest:
+            loaded = store.load_manifest(args.manifest)
+        else:
+            loaded = store.load_corpus_dir(args.corpus)
+        print(f"[+] Loaded {loaded} applicants into the stand-in database", file=sys.stderr)
+        if not loaded:
+            sys.exit("Error: nothing to search")
+
+        if args.manifest and "off" in args.cache:
+            print("[*] Manifest corpora written as 'cache' have no PDFs, runs with --cache off will find no text",
+                  file=sys.stderr)
+
+        keywords = [kw.strip() for kw in args.keywords.split(",") if kw.strip()]
+        configurations = []
+        for cache in args.cache:
+            for mode in args.modes:
+                for pool_size in (args.pool_sizes if mode == "mp" else [1]):
+                    configurations.append({'mode': mode, 'pool_size': pool_size, 'cache': cache})
+
+        index = None
+        index_ms = None
+        if args.index_file and not os.path.exists(args.index_file):
+            started = time.perf_counter()
+            FieldedIndex.from_cache(keep_text=True).save(args.index_file)
+            print(f"[+] Index written to {args.index_file} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        if args.index or args.index_file:
+            started = time.perf_counter()
+            index = MappedIndex(args.index_file) if args.index_file else FieldedIndex.from_cache()
+            index_ms = (time.perf_counter() - started) * 1000
+            if not len(index):
+                print("[*] The extraction cache is empty, every CV will be scanned", file=sys.stderr)
+
+        trace = bool(args.trace_json or args.trace_prom)
+        tracer = Tracer(enabled=trace)
+        profiler = None
+        if args.profile_threshold_ms is not None:
+            profiler = QueryProfiler(args.profile_threshold_ms, args.profile_mode)
+            if args.profile_dir:
+                profiler.output_dir = args.profile_dir
+        results = []
+        for config in configurations:
+            service = SearchService(
+                store,
+                pool_size=config['pool_size'],
+                use_multiprocessing=config['mode'] == "mp",
+                use_cache=config['cache'] == "on",
+                trace=trace,
+                profiler=profiler,
+                stop_early=args.stop_early,
+                index=index,
+                field_weights=args.field_weights,
+                ranking=args.ranking
+            )
+            runs = []
+            for _ in range(args.repeats):
+                result = service.search(keywords, args.algo, args.max_match)
+                runs.append({**result['timings'], 'result_count': result['result_count'],
+                             'cvs_scanned': result['total_exact_scanned']})
+            tracer.merge(service.tracer.drain())
+
+            # the first cached run may be filling the cache, so keep it apart from the steady state
+            steady = runs[1:] if len(runs) > 1 else runs
+            summary = {stage: statistics.median(run[stage] for run in steady) * 1000 for stage in STAGES}
+            results.append({
+                **config,
+                'first_run_ms': {stage: runs[0][stage] * 1000 for stage in STAGES},
+                'median_ms': summary,
+                'result_count': runs[-1]['result_count'],
+                'cvs_scanned': runs[-1]['cvs_scanned'],
+            })
+            print(f"[*] {config['mode']:>6} pool={config['pool_size']} cache={config['cache']}: "
+                  f"median total {summary['total']:.1f} ms", file=sys.stderr)
+
+        report = {
+            'meta': {
+                'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'applicants': loaded,
+                'keywords': keywords,
+                'algo': args.algo,
+                'max_match': args.max_match,
+                'repeats': args.repeats,
+                'encrypted_profiles': bool(args.encryption_key),
+                'stop_early': args.stop_early,
+                'indexed_cvs': len(index) if index is not None else None,
+                'index_file': args.index_file,
+                'index_load_ms': index_ms,
+                'field_weights': args.field_weights,
+                'ranking': args.ranking,
+            },
+            'results': results,
+        }
+
+        if args.trace_json:
+            tracer.write_json(args.trace_json)
+            print(f"[+] Trace summary written to {args.trace_json}", file=sys.stderr)
+        if args.trace_prom:
+            tracer.write_prometheus(args.trace_prom)
+            print(f"[+] Prometheus metrics written to {args.trace_prom}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"[+] Benchmark report written to {args.output}", file=sys.stderr)
+    else:
+        print(output, file=out)
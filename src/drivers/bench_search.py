@@ -0,0 +1,56 @@
+import sys
+import json
+import argparse
+from src.search.benchmark import ENGINES, run_benchmark
+
+def _int_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+def _float_list(value):
+    return [float(item) for item in value.split(",") if item]
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="therecruiter -d bench_search",
+        description="Benchmark the string-search engines and print the results as JSON."
+    )
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help="comma-separated engines to run (default: %(default)s)")
+    parser.add_argument("--text-lengths", type=_int_list, default=[10_000, 100_000], help="e.g. 10000,100000")
+    parser.add_argument("--keyword-counts", type=_int_list, default=[1, 5, 20], help="e.g. 1,5,20")
+    parser.add_argument("--keyword-lengths", type=_int_list, default=[4, 8, 16], help="e.g. 4,8,16")
+    parser.add_argument("--skews", type=_float_list, default=[0.0, 1.0],
+                        help="alphabet skew exponents, 0 = uniform letters (default: 0,1)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per case (default: %(default)s)")
+    parser.add_argument("--hit-ratio", type=float, default=0.5,
+                        help="fraction of keywords cut from the text (default: %(default)s)")
+    parser.add_argument("--fuzzy-max-text", type=int, default=20_000,
+                        help="skip fuzzy engines on longer texts (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no per-case progress on stderr")
+    args = parser.parse_args()
+
+    try:
+        report = run_benchmark(
+            engines=[name.strip() for name in args.engines.split(",") if name.strip()],
+            text_lengths=args.text_lengths,
+            keyword_counts=args.keyword_counts,
+            keyword_lengths=args.keyword_lengths,
+            skews=args.skews,
+            repeats=args.repeats,
+            hit_ratio=args.hit_ratio,
+            seed=args.seed,
+            fuzzy_max_text=args.fuzzy_max_text,
+            progress=not args.quiet
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"[+] Benchmark report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
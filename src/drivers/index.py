@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.extraction_cache import ExtractionCache, get_extraction_cache
+from src.core.extractor import PDFExtractor
+from src.index import FieldMap, FieldedIndex, SegmentedIndex, build_field_map
+from src.index.segments import DEFAULT_INDEX_DIR
+
+# (cache key, pdf path)
+IndexTask = Tuple[str, str]
+# (cache key, error, was cached, content hash, pattern text, field map ranges)
+Prepared = Tuple[str, Optional[str], bool, Optional[str], Optional[str], Optional[list]]
+
+_extractor: Optional[PDFExtractor] = None
+
+def _init_worker(data_root: str) -> None:
+    global _extractor
+    _extractor = PDFExtractor(data_root)
+
+def _prepare_chunk(tasks: List[IndexTask]) -> List[Prepared]:
+    """Pool worker: extract (or read from the cache) and section each CV, everything but tokenizing"""
+    cache = get_extraction_cache()
+    prepared = []
+    for key, pdf_path in tasks:
+        try:
+            cached = cache.get(pdf_path)
+            if cached is None and not os.path.exists(pdf_path):
+                prepared.append((key, "file not found", False, None, None, None))
+                continue
+            extracted = cached if cached is not None else cache.get_or_extract(pdf_path, _extractor)
+            if not extracted["pattern_matching"]:
+                prepared.append((key, "no text extracted", cached is not None, None, None, None))
+                continue
+            content_hash = cache.content_hash(pdf_path) or ExtractionCache.text_hash(extracted["regex_format"])
+            field_map = build_field_map(extracted["pattern_matching"], extracted["regex_format"])
+            prepared.append((key, None, cached is not None, content_hash, extracted["pattern_matching"],
+                             field_map.to_list()))
+        except Exception as e:
+            prepared.append((key, f"{type(e).__name__}: {e}", False, None, None, None))
+    return prepared
+
+def _progress(done: int, total: int, started: float, quiet: bool) -> None:
+    if quiet:
+        return
+    width = 30
+    filled = width * done // max(total, 1)
+    rate = done / max(time.perf_counter() - started, 1e-9)
+    end = "\n" if done >= total else ""
+    print(f"\r[*] [{'#' * filled}{'.' * (width - filled)}] {done}/{total} CVs ({rate:.0f} CVs/s)",
+          end=end, file=sys.stderr, flush=True)
+
+def _referenced_cvs(db: Any, data_root: str) -> Dict[str, str]:
+    """Cache key -> pdf path of every CV an application points at"""
+    tasks = {}
+    for applicant in db.get_all_applicants_data():
+        for detail in applicant["application_details"]:
+            pdf_path = Path(data_root) / detail["cv_path"]
+            tasks.setdefault(ExtractionCache.key(pdf_path), str(pdf_path))
+    return tasks
+
+def _verify(index: SegmentedIndex, expected: Dict[str, str], failed: Dict[str, str],
+            cache: ExtractionCache, sample: int) -> Dict[str, Any]:
+    """Every CV the DB references is indexed or a reported failure, and a sample reads back what was extracted"""
+    snapshot = index.snapshot()
+    missing = [key for key in expected if key not in failed and snapshot.doc_id(key) is None]
+    indexed = {doc[0] for _, doc in snapshot.iter_docs()}
+    orphans = sorted(indexed.difference(expected))
+
+    population = sorted(indexed.intersection(expected))
+    sampled = random.sample(population, min(sample, len(population)))
+    mismatched = []
+    for key in sampled:
+        doc_id = snapshot.doc_id(key)
+        cached = cache.get(expected[key])
+        if cached is None or snapshot.text(doc_id) != cached["pattern_matching"]:
+            mismatched.append(key)
+        elif snapshot.doc(doc_id)[1] != cache.content_hash(expected[key]):
+            mismatched.append(key)
+    return {
+        "ok": not missing and not mismatched,
+        "missing": missing[:20],
+        "missing_count": len(missing),
+        "orphans": orphans[:20],
+        "orphan_count": len(orphans),
+        "sampled": len(sampled),
+        "mismatched": mismatched[:20],
+    }
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="therecruiter -d index",
+        description="Extract every CV referenced in ApplicationDetail into the extraction cache and "
+                    "build the search index from it."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--manifest", help="index a JSON-lines manifest from scripts/cv_generator.py instead of MySQL")
+    source.add_argument("--corpus", help="index a directory of CV PDFs instead of MySQL")
+    parser.add_argument("--data-root", default="", help="directory cv_path values are relative to (default: cwd)")
+    parser.add_argument("--index-dir", default=os.getenv("CV_INDEX_DIR", str(DEFAULT_INDEX_DIR)),
+                        help="live index directory (default: CV_INDEX_DIR or .cache/index)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: cpu count - 1)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="CVs per pool task (default: %(default)s)")
+    parser.add_argument("--verify-sample", type=int, default=200,
+                        help="CVs whose indexed text is compared with the cache (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="also write the build report as JSON here")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress bar")
+    args = parser.parse_args()
+
+    if args.manifest or args.corpus:
+        from src.db.sqlite_store import SQLiteApplicantStore
+        db = SQLiteApplicantStore()
+        loaded = db.load_manifest(args.manifest) if args.manifest else db.load_corpus_dir(args.corpus)
+        print(f"[+] Loaded {loaded} applicants into the stand-in database")
+    else:
+        from src.db.models import db_manager
+        if not db_manager.initialize():
+            sys.exit("Error: could not connect to the database")
+        db = db_manager
+
+    started = time.perf_counter()
+    expected = _referenced_cvs(db, args.data_root)
+    if not expected:
+        sys.exit("Error: ApplicationDetail references no CVs")
+    workers = args.workers or max(1, cpu_count() - 1)
+    print(f"[*] Indexing {len(expected)} CVs into {args.index_dir} ({workers} workers)...")
+
+    tasks = sorted(expected.items())
+    chunks = [tasks[i:i + args.chunk_size] for i in range(0, len(tasks), args.chunk_size)]
+    index = FieldedIndex(keep_text=True)
+    failed: Dict[str, str] = {}
+    cached = extracted = text_chars = 0
+    t_extract = time.perf_counter()
+    with Pool(processes=workers, initializer=_init_worker, initargs=(args.data_root,)) as pool:
+        done = 0
+        for prepared in pool.imap_unordered(_prepare_chunk, chunks):
+            for key, error, was_cached, content_hash, text, field_map in prepared:
+                if error is not None:
+                    failed[key] = error
+                    continue
+                cached += was_cached
+                extracted += not was_cached
+                index.add_document(key, content_hash, text, "", field_map=FieldMap.from_list(field_map))
+                text_chars += len(text)
+            done += len(prepared)
+            _progress(done, len(tasks), t_extract, args.quiet)
+    t_extract = time.perf_counter() - t_extract
+
+    t_write = time.perf_counter()
+    live = SegmentedIndex(args.index_dir)
+    live.install(index)
+    t_write = time.perf_counter() - t_write
+    base_path = live.snapshot().base.path
+    elapsed = time.perf_counter() - started
+
+    print("[*] Verifying against the database...")
+    # read the DB again, so applications added during the build are checked too
+    verification = _verify(live, _referenced_cvs(db, args.data_root), failed,
+                           get_extraction_cache(), args.verify_sample)
+
+    report = {
+        "cvs": len(tasks),
+        "indexed": len(index),
+        "already_cached": cached,
+        "extracted": extracted,
+        "failed": len(failed),
+        "failures": dict(sorted(failed.items())[:50]),
+        "workers": workers,
+        "extract_seconds": round(t_extract, 3),
+        "write_seconds": round(t_write, 3),
+        "total_seconds": round(elapsed, 3),
+        "cvs_per_second": round(len(tasks) / max(t_extract, 1e-9), 1),
+        "text_mb_per_second": round(text_chars / 1e6 / max(t_extract, 1e-9), 2),
+        "index_file": str(base_path),
+        "index_bytes": os.path.getsize(base_path),
+        "terms": len(index.vocab),
+        "tokens": index.total_tokens,
+        "live_index": live.stats(),
+        "verification": verification,
+    }
+
+    print(f"[+] Indexed {report['indexed']}/{report['cvs']} CVs in {elapsed:.1f}s "
+          f"({report['cvs_per_second']} CVs/s, {report['already_cached']} already cached)")
+    print(f"[+] Index: {report['index_bytes'] / 1e6:.1f} MB, {report['terms']} terms, "
+          f"{report['tokens']} tokens -> {base_path}")
+    if failed:
+        print(f"[-] {len(failed)} CVs failed:")
+        for key, error in sorted(failed.items())[:10]:
+            print(f"    {key}: {error}")
+    if verification["ok"]:
+        print(f"[+] Verified: every referenced CV is indexed, {verification['sampled']} sampled texts match")
+    else:
+        print(f"[-] Verification failed: {verification['missing_count']} referenced CVs missing, "
+              f"{len(verification['mismatched'])} sampled texts differ from the cache")
+    if verification["orphan_count"]:
+        print(f"[*] {verification['orphan_count']} indexed CVs are no longer referenced")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[+] Build report written to {args.output}")
+    if not verification["ok"]:
+        sys.exit(1)
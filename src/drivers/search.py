@@ -0,0 +1,131 @@
+import sys
+import json
+import argparse
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, List
+
+from src.index import RANKINGS, get_live_index
+from src.services.search_service import SearchService, serialize_search
+
+ALGORITHMS = ("KMP", "BM", "AC")
+
+def _keywords(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(kw).strip() for kw in value if str(kw).strip()]
+
+def _parse_query(line: str, number: int, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    query = json.loads(line) if line.startswith("{") else {"keywords": line}
+    if not isinstance(query, dict):
+        raise ValueError("a query must be a JSON object")
+    return {
+        "id": query.get("id", number),
+        "keywords": _keywords(query.get("keywords", "")),
+        "algo": query.get("algo", defaults["algo"]),
+        "max_match": int(query.get("max_match", defaults["max_match"])),
+    }
+
+def _read_queries(path: str, defaults: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """
+    One query per line: a JSON object with "keywords" (a list or a comma-separated
+    string) and optionally "algo", "max_match", "id", or just comma-separated keywords.
+    A line that does not parse yields {"id": line number, "error": ...} instead,
+    so one bad line doesn't end the batch.
+    """
+    with (sys.stdin if path == "-" else open(path, encoding="utf-8")) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _parse_query(line, number, defaults)
+            except (ValueError, TypeError) as e:
+                yield {"id": number, "keywords": [], "error": f"unreadable query: {type(e).__name__}: {e}"}
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="therecruiter -d search",
+        description="Search the CVs without the GUI and print the ranked applicants as JSON."
+    )
+    parser.add_argument("keywords", nargs="*", help="keywords; each argument may be comma-separated")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="run every query in this JSON-lines file ('-' for stdin) and print one JSON line each")
+    parser.add_argument("--algo", default="KMP", choices=ALGORITHMS, help="exact-match algorithm (default: %(default)s)")
+    parser.add_argument("--max-match", type=int, default=10, help="applications to return (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="fuzzy tolerance, edits per keyword character (default: %(default)s)")
+    parser.add_argument("--ranking", default="bm25", choices=RANKINGS,
+                        help="BM25 relevance or raw hit counts (default: %(default)s)")
+    parser.add_argument("--positions", action="store_true", help="include every hit position in the output")
+    parser.add_argument("--no-index", action="store_true", help="scan every CV even if a search index has been built")
+    parser.add_argument("--serial", action="store_true", help="run the per-CV workers in this process")
+    parser.add_argument("--pool-size", type=int, help="worker processes (default: cpu count)")
+    parser.add_argument("--data-root", default="", help="directory cv_path values are relative to (default: cwd)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--manifest", help="search a JSON-lines manifest from scripts/cv_generator.py instead of MySQL")
+    source.add_argument("--corpus", help="search a directory of CV PDFs instead of MySQL")
+    parser.add_argument("-o", "--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    keywords = _keywords(",".join(args.keywords))
+    if not keywords and not args.queries:
+        parser.error("give keywords or --queries")
+    if args.max_match <= 0:
+        parser.error("--max-match must be positive")
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # the DB layer, the extractor and the workers log to stdout; keep it for the JSON
+        with redirect_stdout(sys.stderr):
+            if args.manifest or args.corpus:
+                from src.db.sqlite_store import SQLiteApplicantStore
+                db = SQLiteApplicantStore()
+                loaded = db.load_manifest(args.manifest) if args.manifest else db.load_corpus_dir(args.corpus)
+                print(f"[+] Loaded {loaded} applicants into the stand-in database")
+            else:
+                from src.db.models import db_manager
+                if not db_manager.initialize():
+                    sys.exit("Error: could not connect to the database")
+                db = db_manager
+
+            service = SearchService(
+                db,
+                pool_size=args.pool_size,
+                use_multiprocessing=not args.serial,
+                fuzzy_tolerance=args.tolerance,
+                data_root=args.data_root,
+                index=None if args.no_index else get_live_index(),
+                ranking=args.ranking
+            )
+
+            if not args.queries:
+                result = service.search(keywords, args.algo, args.max_match)
+                report = {
+                    "keywords": keywords,
+                    "max_match": args.max_match,
+                    "tolerance": args.tolerance,
+                    "ranking": args.ranking,
+                    **serialize_search(result, args.positions),
+                }
+                print(json.dumps(report, indent=2, default=str), file=out)
+                return
+
+            defaults = {"algo": args.algo, "max_match": args.max_match}
+            for query in _read_queries(args.queries, defaults):
+                line: Dict[str, Any] = {"id": query["id"], "keywords": query["keywords"]}
+                if "error" in query:
+                    line["error"] = query["error"]
+                elif not query["keywords"] or query["algo"] not in ALGORITHMS or query["max_match"] <= 0:
+                    line["error"] = "needs keywords, a known algo and a positive max_match"
+                else:
+                    try:
+                        result = service.search(query["keywords"], query["algo"], query["max_match"])
+                        line.update(serialize_search(result, args.positions))
+                    except Exception as e:
+                        line["error"] = f"{type(e).__name__}: {e}"
+                print(json.dumps(line, default=str), file=out, flush=True)
+                print(f"[*] Query {query['id']}: {line.get('result_count', 0)} results"
+                      + (f" ({line['error']})" if "error" in line else ""))
+    finally:
+        if out is not sys.stdout:
+            out.close()
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import ipaddress
+
+from src.index import RANKINGS, get_live_index
+from src.services.http_service import SearchHTTPService
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def run():
+    parser = argparse.ArgumentParser(
+        prog="therecruiter -d serve",
+        description="Serve search, applicant and CV summary lookups over local HTTP, so several clients "
+                    "share one warm index and worker pool. Point the GUI at it with SEARCH_SERVICE_URL."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--token", default=os.getenv("SEARCH_SERVICE_TOKEN"),
+                        help="bearer token every request but /health must carry; required unless --host is loopback "
+                             "(default: SEARCH_SERVICE_TOKEN)")
+    parser.add_argument("--pool-size", type=int, help="worker processes, 0 to search in the service threads "
+                                                      "(default: cpu count)")
+    parser.add_argument("--max-concurrent", type=int, default=4,
+                        help="searches run at the same time (default: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=16,
+                        help="searches waiting for a slot before new ones get 503 (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="fuzzy tolerance, edits per keyword character (default: %(default)s)")
+    parser.add_argument("--ranking", default="bm25", choices=RANKINGS,
+                        help="BM25 relevance or raw hit counts (default: %(default)s)")
+    parser.add_argument("--no-index", action="store_true", help="scan every CV even if a search index has been built")
+    parser.add_argument("--data-root", default="", help="directory cv_path values are relative to (default: cwd)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--manifest", help="serve a JSON-lines manifest from scripts/cv_generator.py instead of MySQL")
+    source.add_argument("--corpus", help="serve a directory of CV PDFs instead of MySQL")
+    args = parser.parse_args()
+
+    if args.max_concurrent <= 0 or args.max_queue < 0:
+        parser.error("--max-concurrent must be positive and --max-queue not negative")
+    if not args.token and not _is_loopback(args.host):
+        # /applicant and /cv/.../summary return decrypted personal data
+        parser.error(f"refusing to listen on {args.host} without a token, set SEARCH_SERVICE_TOKEN or --token")
+
+    if args.manifest or args.corpus:
+        from src.db.sqlite_store import SQLiteApplicantStore
+        db = SQLiteApplicantStore()
+        loaded = db.load_manifest(args.manifest) if args.manifest else db.load_corpus_dir(args.corpus)
+        print(f"[+] Loaded {loaded} applicants into the stand-in database")
+    else:
+        from src.db.models import db_manager
+        if not db_manager.initialize():
+            sys.exit("Error: could not connect to the database")
+        db = db_manager
+
+    index = None
+    if not args.no_index:
+        index = get_live_index()
+        if index is None:
+            print("[-] No search index built yet, every search scans the CVs (see -d index)")
+        else:
+            # page the document table in now rather than on the first request
+            started = time.perf_counter()
+            snapshot = index.snapshot()
+            for _ in snapshot.iter_docs():
+                pass
+            print(f"[+] Search index warm: {len(snapshot)} CVs in {time.perf_counter() - started:.2f}s")
+
+    service = SearchHTTPService(
+        db,
+        index=index,
+        pool_size=args.pool_size,
+        max_concurrent=args.max_concurrent,
+        max_queue=args.max_queue,
+        fuzzy_tolerance=args.tolerance,
+        data_root=args.data_root,
+        ranking=args.ranking,
+        token=args.token
+    )
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        auth = "token required" if args.token else "no token, loopback only"
+        print(f"[+] Serving on http://{host}:{port} ({auth}, Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        print("[*] Shutting down...")
+    finally:
+        service.close()
@@ -0,0 +1,27 @@
+from .fields import FIELDS, FieldMap, QueryTerm, build_field_map, parse_query
+from .fielded_index import FieldedIndex, keyword_positions, search_index
+from .ranking import BM25, RANKINGS
+from .storage import FORMAT_VERSION, IndexFormatError, MappedIndex, open_index, write_index
+from .segments import IndexSnapshot, SegmentedIndex, Tombstones, get_live_index
+
+__all__ = [
+    'FIELDS',
+    'FieldMap',
+    'QueryTerm',
+    'build_field_map',
+    'parse_query',
+    'FieldedIndex',
+    'keyword_positions',
+    'search_index',
+    'BM25',
+    'RANKINGS',
+    'FORMAT_VERSION',
+    'IndexFormatError',
+    'MappedIndex',
+    'open_index',
+    'write_index',
+    'IndexSnapshot',
+    'SegmentedIndex',
+    'Tombstones',
+    'get_live_index'
+]
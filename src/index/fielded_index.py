@@ -0,0 +1,262 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .fields import FieldMap, QueryTerm, build_field_map, parse_query, resolve_hits
+
+# one indexed CV: (cv_path, content_hash, tokens, characters, field map)
+DocInfo = Tuple[str, str, int, int, FieldMap]
+
+class TermLookup:
+    """
+    Term dictionary lookups the matcher needs, over one separator-joined
+    string of every term, so substring, prefix and suffix scans run in
+    `str.find` rather than a Python loop over the vocabulary.
+    """
+    def __init__(self, vocab: Sequence[str]):
+        self.vocab = vocab
+        self._text = "\0" + "\0".join(vocab) + "\0"
+        self._starts: List[int] = []
+        offset = 1
+        for term in vocab:
+            self._starts.append(offset)
+            offset += len(term) + 1
+
+    def _scan(self, needle: str) -> List[int]:
+        found = []
+        position = self._text.find(needle)
+        while position != -1:
+            found.append(position)
+            position = self._text.find(needle, position + 1)
+        return found
+
+    def _term_at(self, position: int) -> int:
+        return bisect_right(self._starts, position) - 1
+
+    def containing(self, fragment: str) -> List[int]:
+        ids = []
+        for position in self._scan(fragment):
+            term_id = self._term_at(position)
+            if not ids or ids[-1] != term_id:
+                ids.append(term_id)
+        return ids
+
+    def ending_with(self, suffix: str) -> List[int]:
+        # position 0 is the leading separator, which ends no term
+        return [self._term_at(position) for position in self._scan(suffix + "\0") if position > 0]
+
+    def starting_with(self, prefix: str) -> List[int]:
+        # nor does the trailing separator start one
+        return [self._term_at(position + 1) for position in self._scan("\0" + prefix)
+                if position + 1 < len(self._text)]
+
+def _offsets_in(term: str, fragment: str) -> List[int]:
+    # overlapping, like the exact-match algorithms report them
+    offsets = []
+    position = term.find(fragment)
+    while position != -1:
+        offsets.append(position)
+        position = term.find(fragment, position + 1)
+    return offsets
+
+class FieldedIndex:
+    """
+    Positional inverted index over the pattern-matching text of each CV,
+    with the CV's section layout stored next to it.
+
+    Tokens are the space-separated words of the pattern text and postings
+    hold each token's character offset, so a keyword lookup gives exactly
+    the positions a full-text scan would: a one-word keyword matches inside
+    any term containing it, a multi-word keyword is a term ending with its
+    first word, whole terms for the middle words and a term starting with
+    the last one, each token starting right after the previous one. A hit
+    belongs to the section whose character range holds its start, so
+    `skills:python` and section weights need no parsing at query time.
+
+    With `keep_text` the pattern texts are kept too, so a saved index can
+    hand CVs to the fuzzy stage without the extraction cache.
+    """
+    def __init__(self, keep_text: bool = False):
+        self.vocab: List[str] = []
+        self.term_ids: Dict[str, int] = {}
+        # term id -> doc id -> character offsets of the term in that CV
+        self.postings: List[Dict[int, List[int]]] = []
+        self.docs: List[DocInfo] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.total_tokens = 0
+        self.texts: Optional[List[str]] = [] if keep_text else None
+        self._lookup: Optional[TermLookup] = None
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, cv_path: str) -> bool:
+        return cv_path in self.doc_ids
+
+    @property
+    def avg_length(self) -> float:
+        """Mean CV length in tokens, for BM25 length normalization"""
+        return self.total_tokens / len(self.docs) if self.docs else 0.0
+
+    def add_document(self, cv_path: str, content_hash: str, pattern_text: str,
+                     regex_format: str, grouper=None, field_map: Optional[FieldMap] = None) -> int:
+        """Index one CV; each cv_path can be added once. A known `field_map` skips the grouper"""
+        if cv_path in self.doc_ids:
+            raise ValueError(f"{cv_path} is already indexed")
+        doc_id = len(self.docs)
+        tokens = pattern_text.split(" ") if pattern_text else []
+        char = 0
+        for token in tokens:
+            term_id = self.term_ids.get(token)
+            if term_id is None:
+                term_id = self.term_ids[token] = len(self.vocab)
+                self.vocab.append(token)
+                self.postings.append({})
+                self._lookup = None
+            self.postings[term_id].setdefault(doc_id, []).append(char)
+            char += len(token) + 1
+        self.docs.append((cv_path, content_hash, len(tokens), len(pattern_text),
+                          field_map or build_field_map(pattern_text, regex_format, grouper)))
+        self.doc_ids[cv_path] = doc_id
+        self.total_tokens += len(tokens)
+        if self.texts is not None:
+            self.texts.append(pattern_text)
+        return doc_id
+
+    @classmethod
+    def from_cache(cls, cache=None, grouper=None, keep_text: bool = False) -> "FieldedIndex":
+        """Index every CV in the extraction cache"""
+        from src.core.extraction_cache import get_extraction_cache
+        cache = cache or get_extraction_cache()
+        index = cls(keep_text)
+        for cv_path, content_hash, regex_format, pattern_text in cache.iter_entries():
+            index.add_document(cv_path, content_hash, pattern_text, regex_format, grouper)
+        return index
+
+    # -- reader interface used by the matcher --
+
+    @property
+    def lookup(self) -> TermLookup:
+        if self._lookup is None:
+            self._lookup = TermLookup(self.vocab)
+        return self._lookup
+
+    def term_postings(self, term_id: int) -> Iterable[Tuple[int, List[int]]]:
+        return self.postings[term_id].items()
+
+    def term_id(self, term: str) -> Optional[int]:
+        return self.term_ids.get(term)
+
+    def doc_id(self, cv_path: str) -> Optional[int]:
+        return self.doc_ids.get(cv_path)
+
+    def doc(self, doc_id: int) -> DocInfo:
+        return self.docs[doc_id]
+
+    def text(self, doc_id: int) -> Optional[str]:
+        return self.texts[doc_id] if self.texts is not None else None
+
+    def text_source(self, doc_id: int) -> Optional[Tuple[str, int]]:
+        """Where a pool worker can read the CV's text by itself; an in-memory index has nowhere"""
+        return None
+
+    def iter_docs(self) -> Iterable[Tuple[int, DocInfo]]:
+        return enumerate(self.docs)
+
+    def save(self, path) -> Any:
+        """Write the index in the on-disk format; open it again with `open_index`"""
+        from .storage import write_index
+        return write_index(self, path)
+
+    # -- queries --
+
+    def keyword_positions(self, keyword: str) -> Dict[int, List[int]]:
+        return keyword_positions(self, keyword)
+
+    def search(
+        self,
+        keywords: Sequence[str],
+        doc_ids: Optional[Iterable[int]] = None,
+        field_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        return search_index(self, keywords, doc_ids, field_weights)
+
+def keyword_positions(index, keyword: str) -> Dict[int, List[int]]:
+    """Doc id -> sorted character positions of `keyword` (case-insensitive) in that CV's pattern text"""
+    parts = keyword.lower().split(" ")
+    if not keyword or not all(parts[1:-1]):
+        # pattern text never has doubled spaces
+        return {}
+    lookup = index.lookup
+    vocab = lookup.vocab
+    found: Dict[int, List[int]] = {}
+
+    if len(parts) == 1:
+        fragment = parts[0]
+        for term_id in lookup.containing(fragment):
+            offsets = _offsets_in(vocab[term_id], fragment)
+            for doc_id, starts in index.term_postings(term_id):
+                positions = found.setdefault(doc_id, [])
+                for start in starts:
+                    positions.extend(start + offset for offset in offsets)
+    else:
+        # (doc, character where the next token has to start) -> where the match began
+        frontier: Dict[Tuple[int, int], int] = {}
+        for term_id in lookup.ending_with(parts[0]):
+            length = len(vocab[term_id])
+            for doc_id, starts in index.term_postings(term_id):
+                for start in starts:
+                    frontier[(doc_id, start + length + 1)] = start + length - len(parts[0])
+        for middle in parts[1:-1]:
+            if not frontier:
+                break
+            term_id = index.term_id(middle)
+            if term_id is None:
+                frontier = {}
+                break
+            advanced = {}
+            for doc_id, starts in index.term_postings(term_id):
+                for start in starts:
+                    began = frontier.get((doc_id, start))
+                    if began is not None:
+                        advanced[(doc_id, start + len(middle) + 1)] = began
+            frontier = advanced
+        if frontier:
+            for term_id in lookup.starting_with(parts[-1]):
+                for doc_id, starts in index.term_postings(term_id):
+                    for start in starts:
+                        began = frontier.get((doc_id, start))
+                        if began is not None:
+                            found.setdefault(doc_id, []).append(began)
+
+    for positions in found.values():
+        positions.sort()
+    return found
+
+def search_index(
+    index,
+    keywords: Sequence[str],
+    doc_ids: Optional[Iterable[int]] = None,
+    field_weights: Optional[Dict[str, float]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Exact hits of `keywords` (field prefixes allowed) per matching CV:
+    {"exact_raw": {keyword: positions, in query order}, "exact_fields":
+    {keyword: {field: count}}, "exact_score": weighted count}. CVs with no
+    hit are left out; `doc_ids` restricts the answer to those CVs.
+    """
+    terms: List[QueryTerm] = parse_query(keywords)
+    texts = list(dict.fromkeys(term.text for term in terms))
+    per_text = {text: keyword_positions(index, text) for text in texts}
+    wanted = None if doc_ids is None else set(doc_ids)
+
+    matched = set()
+    for positions in per_text.values():
+        matched.update(positions if wanted is None else wanted.intersection(positions))
+
+    results = {}
+    for doc_id in matched:
+        hits = {text: per_text[text].get(doc_id, []) for text in texts}
+        exact_raw, exact_fields, score = resolve_hits(terms, hits, index.doc(doc_id)[4], field_weights)
+        if any(exact_raw.values()):
+            results[doc_id] = {"exact_raw": exact_raw, "exact_fields": exact_fields, "exact_score": score}
+    return results
@@ -0,0 +1,158 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.core.normalizer import pattern_matching_text
+
+# CV sections a keyword can be restricted to; text outside any section header is "other"
+FIELDS = ("summary", "skills", "experience", "education", "other")
+
+# (start char, end char, field) in the pattern-matching text
+FieldRange = Tuple[int, int, str]
+
+class FieldMap:
+    """
+    Which CV section each character of a pattern-matching text belongs to,
+    as sorted, non-overlapping character ranges. Anything outside a range
+    (name and contact lines, unrecognised headings) is "other".
+    """
+    def __init__(self, ranges: Sequence[FieldRange] = ()):
+        self.ranges = sorted(ranges)
+        self._starts = [start for start, _, _ in self.ranges]
+
+    def field_at(self, position: int) -> str:
+        i = bisect_right(self._starts, position) - 1
+        if i >= 0 and position < self.ranges[i][1]:
+            return self.ranges[i][2]
+        return "other"
+
+    def to_list(self) -> List[list]:
+        return [list(r) for r in self.ranges]
+
+    @classmethod
+    def from_list(cls, items: Sequence[Sequence]) -> "FieldMap":
+        return cls([(int(start), int(end), field) for start, end, field in items])
+
+_grouper = None
+
+def _default_grouper():
+    global _grouper
+    if _grouper is None:
+        from src.search.cv_grouper import CVGrouper
+        _grouper = CVGrouper()
+    return _grouper
+
+def build_field_map(pattern_text: str, regex_format: str, grouper=None) -> FieldMap:
+    """
+    Map CVGrouper's sections onto the pattern-matching text.
+
+    Sections are found on the lines of the regex format; both formats come
+    from the same raw text and differ only in whitespace and case (the regex
+    format splits "JavaScript" into "Java Script"), so with spaces removed
+    they are the same characters. Each token of the pattern text is given to
+    the line that holds its first character, and a section's range runs from
+    the first to the last token of its content lines. If the two texts don't
+    line up (an entry written by other code), the map is empty.
+    """
+    if not pattern_text or not regex_format:
+        return FieldMap()
+    lines = regex_format.split("\n")
+    section_ranges = (grouper or _default_grouper()).section_line_ranges(lines)
+    if not section_ranges:
+        return FieldMap()
+
+    # offset of each line's first character, not counting spaces
+    line_starts: List[int] = []
+    squeezed = 0
+    for line in lines:
+        line_starts.append(squeezed)
+        squeezed += len(pattern_matching_text(line).replace(" ", ""))
+    line_starts.append(squeezed)
+
+    token_chars: List[int] = []
+    token_squeezed: List[int] = []
+    token_ends: List[int] = []
+    char = seen = 0
+    for token in pattern_text.split(" "):
+        token_chars.append(char)
+        token_squeezed.append(seen)
+        token_ends.append(char + len(token))
+        char += len(token) + 1
+        seen += len(token)
+    if seen != squeezed:
+        return FieldMap()
+
+    ranges: List[FieldRange] = []
+    for section, header_line, end_line in section_ranges:
+        low = bisect_right(token_squeezed, line_starts[header_line + 1] - 1)
+        high = bisect_right(token_squeezed, line_starts[end_line] - 1)
+        # tokens starting inside the header line belong to the header, not the content
+        if low < high:
+            ranges.append((token_chars[low], token_ends[high - 1], section))
+    return FieldMap(ranges)
+
+class QueryTerm:
+    """
+    One search keyword. "skills:python" restricts "python" to the Skills
+    section; anything without a known field prefix is searched as typed.
+    """
+    __slots__ = ("key", "text", "field")
+
+    def __init__(self, key: str, text: str, field: Optional[str] = None):
+        self.key = key
+        self.text = text
+        self.field = field
+
+    def __repr__(self) -> str:
+        return f"QueryTerm({self.key!r})"
+
+def parse_query(keywords: Sequence[str]) -> List[QueryTerm]:
+    terms = []
+    for keyword in keywords:
+        prefix, sep, rest = keyword.partition(":")
+        field = prefix.strip().lower()
+        if sep and rest.strip() and field in FIELDS:
+            terms.append(QueryTerm(keyword, rest.strip(), field))
+        else:
+            terms.append(QueryTerm(keyword, keyword))
+    return terms
+
+def needs_fields(terms: Sequence[QueryTerm], field_weights: Optional[Dict[str, float]]) -> bool:
+    return bool(field_weights) or any(term.field for term in terms)
+
+def resolve_hits(
+    terms: Sequence[QueryTerm],
+    hits: Dict[str, list],
+    field_map: Optional[FieldMap],
+    field_weights: Optional[Dict[str, float]] = None,
+    position=lambda hit: hit
+) -> Tuple[Dict[str, list], Dict[str, Dict[str, int]], float]:
+    """
+    Turn hits keyed by searched text into hits keyed by query term: drops
+    hits outside a term's field, counts each term's hits per field and sums
+    them weighted by `field_weights` (1.0 for fields not listed). Keys keep
+    the order the searcher reported them in. `position` gets the character
+    offset out of a hit, for fuzzy (position, distance) pairs.
+    Returns (hits per term, field counts per term, weighted score).
+    """
+    by_text: Dict[str, List[QueryTerm]] = {}
+    for term in terms:
+        by_text.setdefault(term.text, []).append(term)
+    weights = field_weights or {}
+
+    resolved: Dict[str, list] = {}
+    field_counts: Dict[str, Dict[str, int]] = {}
+    score = 0.0
+    for text, found in hits.items():
+        for term in by_text.get(text, ()):
+            counts: Dict[str, int] = {}
+            kept = []
+            for hit in found:
+                field = field_map.field_at(position(hit)) if field_map is not None else "other"
+                if term.field is not None and field != term.field:
+                    continue
+                kept.append(hit)
+                counts[field] = counts.get(field, 0) + 1
+                score += weights.get(field, 1.0)
+            resolved[term.key] = kept
+            field_counts[term.key] = counts
+    return resolved, field_counts, score
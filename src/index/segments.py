@@ -0,0 +1,483 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # no flock on Windows: one process at a time should write to an index directory there
+    fcntl = None
+
+from src.core.extraction_cache import DEFAULT_CACHE_PATH, ExtractionCache, PathLike, get_extraction_cache
+from .fielded_index import DocInfo, FieldedIndex
+from .storage import MappedIndex, write_index
+
+DEFAULT_INDEX_DIR = DEFAULT_CACHE_PATH.parent / "index"
+RETAIN_SECONDS = 600
+
+class Tombstones:
+    """Bitmap of the deleted doc ids of one segment"""
+    def __init__(self, bits: bytes = b"", count: int = 0):
+        self._bits = bytearray(bits)
+        self.count = count
+
+    def add(self, doc_id: int) -> bool:
+        byte, bit = divmod(doc_id, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        if self._bits[byte] >> bit & 1:
+            return False
+        self._bits[byte] |= 1 << bit
+        self.count += 1
+        return True
+
+    def __contains__(self, doc_id: int) -> bool:
+        byte, bit = divmod(doc_id, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] >> bit & 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        for byte, value in enumerate(self._bits):
+            if value:
+                for bit in range(8):
+                    if value >> bit & 1:
+                        yield byte * 8 + bit
+
+    def copy(self) -> "Tombstones":
+        return Tombstones(self._bits, self.count)
+
+class IndexSnapshot:
+    """
+    Read view of a SegmentedIndex at one moment: the base segment and the
+    delta segment as they were, minus their tombstones. Doc ids run over the
+    base first and continue into the delta. Writes that land after the
+    snapshot was taken are not visible; a CV updated since then reads as
+    not indexed, so a search scans it rather than using a stale copy.
+    """
+    def __init__(self, lock, base: Optional[MappedIndex], base_dead: Tombstones,
+                 delta: FieldedIndex, delta_dead: Tombstones):
+        self._lock = lock
+        self.base = base
+        self.base_dead = base_dead
+        self.delta = delta
+        self.delta_dead = delta_dead
+        self._offset = len(base) if base is not None else 0
+        self._limit = len(delta)
+        self._avg_length: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._offset - len(self.base_dead) + self._limit - len(self.delta_dead)
+
+    def __contains__(self, cv_path: str) -> bool:
+        return self.doc_id(cv_path) is not None
+
+    @property
+    def avg_length(self) -> float:
+        if self._avg_length is None:
+            tokens = (self.base.total_tokens if self.base is not None else 0) + sum(
+                doc[2] for doc in self.delta.docs[:self._limit])
+            tokens -= sum(self.base.doc(doc_id)[2] for doc_id in self.base_dead)
+            tokens -= sum(self.delta.docs[doc_id][2] for doc_id in self.delta_dead)
+            self._avg_length = tokens / len(self) if len(self) else 0.0
+        return self._avg_length
+
+    def _live(self, doc_id: int) -> bool:
+        if doc_id < self._offset:
+            return doc_id not in self.base_dead
+        return doc_id - self._offset < self._limit and doc_id - self._offset not in self.delta_dead
+
+    def doc_id(self, cv_path: str) -> Optional[int]:
+        with self._lock:
+            local = self.delta.doc_ids.get(cv_path)
+        if local is not None:
+            return self._offset + local if self._live(self._offset + local) else None
+        if self.base is not None:
+            local = self.base.doc_id(cv_path)
+            if local is not None and local not in self.base_dead:
+                return local
+        return None
+
+    def doc(self, doc_id: int) -> DocInfo:
+        if doc_id < self._offset:
+            return self.base.doc(doc_id)
+        return self.delta.doc(doc_id - self._offset)
+
+    def text(self, doc_id: int) -> Optional[str]:
+        if doc_id < self._offset:
+            return self.base.text(doc_id)
+        return self.delta.text(doc_id - self._offset)
+
+    def text_source(self, doc_id: int) -> Optional[Tuple[str, int]]:
+        if doc_id < self._offset:
+            return self.base.text_source(doc_id)
+        return None
+
+    def iter_docs(self) -> Iterable[Tuple[int, DocInfo]]:
+        for doc_id in range(self._offset + self._limit):
+            if self._live(doc_id):
+                yield doc_id, self.doc(doc_id)
+
+    def _per_segment(self, query, doc_ids: Optional[Iterable[int]]) -> Dict[int, Any]:
+        """Run `query(segment, local ids)` on both segments and key the answers by global doc id"""
+        base_ids: Optional[List[int]] = None
+        delta_ids: Optional[List[int]] = None
+        if doc_ids is not None:
+            base_ids, delta_ids = [], []
+            for doc_id in doc_ids:
+                if doc_id < self._offset:
+                    base_ids.append(doc_id)
+                else:
+                    delta_ids.append(doc_id - self._offset)
+        found: Dict[int, Any] = {}
+        if self.base is not None and (base_ids is None or base_ids):
+            found.update((doc_id, value) for doc_id, value in query(self.base, base_ids).items()
+                         if doc_id not in self.base_dead)
+        if self._limit and (delta_ids is None or delta_ids):
+            # the delta keeps growing under the writer, so read it under the writer's lock
+            with self._lock:
+                answer = query(self.delta, delta_ids)
+            found.update((self._offset + doc_id, value) for doc_id, value in answer.items()
+                         if doc_id < self._limit and doc_id not in self.delta_dead)
+        return found
+
+    def keyword_positions(self, keyword: str) -> Dict[int, List[int]]:
+        return self._per_segment(lambda segment, _: segment.keyword_positions(keyword), None)
+
+    def search(
+        self,
+        keywords: Sequence[str],
+        doc_ids: Optional[Iterable[int]] = None,
+        field_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        return self._per_segment(lambda segment, ids: segment.search(keywords, ids, field_weights), doc_ids)
+
+class SegmentedIndex:
+    """
+    Index that follows ApplicationDetail as CVs are added, replaced and
+    removed, log-structured so no write rewrites the whole index.
+
+    The bulk of the CVs sits in a memory-mapped base segment written by
+    `write_index`. A new or changed CV goes into a small in-memory delta
+    segment, and the copy it replaces, like a deleted CV, is marked in its
+    segment's tombstone bitmap. Once the delta or the tombstones grow past
+    a threshold, a background thread merges the live CVs of both segments
+    into a new base and swaps it in.
+
+    Every change is first appended to a journal in the index directory,
+    and the in-memory state is whatever the journal says on top of the
+    base, so other processes (the seeder, CLI drivers) writing to the same
+    directory are picked up on the next `refresh`. Each merge starts a new
+    generation of base and journal named in the CURRENT file; replaced
+    generations stay around for a while for pool workers still reading them.
+
+    Searches go through `snapshot()`, which SearchService calls per search.
+    """
+    def __init__(self, directory: PathLike = DEFAULT_INDEX_DIR, cache: Optional[ExtractionCache] = None,
+                 merge_docs: int = 500, merge_ratio: float = 0.1):
+        self.directory = Path(directory)
+        self.cache = cache
+        self.merge_docs = merge_docs
+        self.merge_ratio = merge_ratio
+        self._lock = threading.RLock()
+        self._merging: Optional[threading.Thread] = None
+        self._generation: Optional[str] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.refresh()
+
+    # -- files --
+
+    def _base_path(self, generation: str) -> Path:
+        return self.directory / f"base-{generation}.cvix"
+
+    def _journal_path(self, generation: str) -> Path:
+        return self.directory / f"journal-{generation}.log"
+
+    def _current(self) -> str:
+        try:
+            return (self.directory / "CURRENT").read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return "000000"
+
+    @staticmethod
+    def _next_generation(generation: str) -> str:
+        # the random part keeps two processes merging at once from writing the same file
+        return f"{int(generation.split('-')[0]) + 1:06d}-{os.urandom(4).hex()}"
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self.directory / "lock", "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    # -- state --
+
+    def _load(self, generation: str) -> None:
+        base_path = self._base_path(generation)
+        self._base = MappedIndex(base_path) if base_path.exists() else None
+        self._base_dead = Tombstones()
+        self._delta = FieldedIndex(keep_text=True)
+        self._delta_dead = Tombstones()
+        self._journal_offset = 0
+        self._replayed = 0
+        self._generation = generation
+
+    def refresh(self) -> None:
+        """Catch up with the journal, and with a new generation if another process merged"""
+        with self._lock:
+            generation = self._current()
+            if generation != self._generation:
+                self._load(generation)
+            self._replay()
+            self._maybe_merge()
+
+    def _replay(self) -> None:
+        journal = self._journal_path(self._generation)
+        try:
+            size = journal.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._journal_offset:
+            return
+        with open(journal, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read(size - self._journal_offset)
+        # whole lines only, a writer may be halfway through one
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                self._apply(entry["op"], entry["cv_path"])
+            except (ValueError, KeyError) as e:
+                print(f"[-] Skipping bad index journal entry {line[:80]!r}: {e}")
+            self._replayed += 1
+        self._journal_offset += end
+
+    def _extract(self, cv_path: str) -> Optional[Tuple[Dict[str, str], Optional[str]]]:
+        from src.core.extractor import PDFExtractor
+        cache = self.cache or get_extraction_cache()
+        # keys are project-relative, like ExtractionCache.key made them
+        pdf_path = DEFAULT_CACHE_PATH.parent.parent / cv_path
+        extracted = cache.get(pdf_path)
+        if extracted is None and pdf_path.exists():
+            extracted = cache.get_or_extract(pdf_path, PDFExtractor())
+        if not extracted or not extracted["pattern_matching"]:
+            return None
+        return extracted, cache.content_hash(pdf_path) or ExtractionCache.text_hash(extracted["regex_format"])
+
+    def _live_hash(self, cv_path: str) -> Optional[str]:
+        doc_id = self._delta.doc_ids.get(cv_path)
+        if doc_id is not None:
+            return self._delta.docs[doc_id][1]
+        if self._base is not None:
+            doc_id = self._base.doc_id(cv_path)
+            if doc_id is not None and doc_id not in self._base_dead:
+                return self._base.doc(doc_id)[1]
+        return None
+
+    def _tombstone(self, cv_path: str) -> None:
+        doc_id = self._delta.doc_ids.pop(cv_path, None)
+        if doc_id is not None:
+            self._delta_dead.add(doc_id)
+        if self._base is not None:
+            doc_id = self._base.doc_id(cv_path)
+            if doc_id is not None:
+                self._base_dead.add(doc_id)
+
+    def _apply(self, op: str, cv_path: str) -> None:
+        if op == "delete":
+            self._tombstone(cv_path)
+            return
+        if op != "put":
+            raise ValueError(f"unknown operation {op!r}")
+        found = self._extract(cv_path)
+        if found is None:
+            # nothing left to index under that path
+            self._tombstone(cv_path)
+            return
+        extracted, content_hash = found
+        if self._live_hash(cv_path) == content_hash:
+            return
+        self._tombstone(cv_path)
+        self._delta.add_document(cv_path, content_hash, extracted["pattern_matching"], extracted["regex_format"])
+
+    # -- writes --
+
+    def _append(self, op: str, cv_paths: Iterable[PathLike]) -> None:
+        lines = "".join(json.dumps({"op": op, "cv_path": ExtractionCache.key(cv_path)}) + "\n"
+                        for cv_path in cv_paths)
+        if not lines:
+            return
+        with self._file_lock():
+            with open(self._journal_path(self._current()), "a", encoding="utf-8") as f:
+                f.write(lines)
+        self.refresh()
+
+    def put(self, cv_path: PathLike) -> None:
+        """Index a new CV, or re-index one whose file changed; unchanged CVs are left alone"""
+        self._append("put", [cv_path])
+
+    def put_many(self, cv_paths: Iterable[PathLike]) -> None:
+        self._append("put", cv_paths)
+
+    def delete(self, cv_path: PathLike) -> None:
+        self._append("delete", [cv_path])
+
+    def delete_many(self, cv_paths: Iterable[PathLike]) -> None:
+        self._append("delete", cv_paths)
+
+    # -- merging --
+
+    def _maybe_merge(self) -> None:
+        base_docs = len(self._base) if self._base is not None else 0
+        live_delta = len(self._delta) - len(self._delta_dead)
+        if (live_delta >= self.merge_docs or self._replayed >= 4 * self.merge_docs
+                or len(self._base_dead) > max(self.merge_ratio * base_docs, self.merge_docs / 10)):
+            self.merge(wait=False)
+
+    def merge(self, wait: bool = True) -> None:
+        """
+        Fold the delta, the tombstones and the journal into a new base, in a
+        background thread unless `wait`, which also waits out a merge that
+        started before the latest writes.
+        """
+        with self._lock:
+            running = self._merging if self._merging is not None and self._merging.is_alive() else None
+        if running is not None:
+            if not wait:
+                return
+            running.join()
+        with self._lock:
+            if self._merging is None or not self._merging.is_alive():
+                if not (self._delta.doc_ids or len(self._base_dead) or self._replayed):
+                    return
+                frozen = (self._generation, self._journal_offset, self._base, self._base_dead.copy(),
+                          [(self._delta.docs[doc_id], self._delta.text(doc_id))
+                           for doc_id in self._delta.doc_ids.values()])
+                self._merging = threading.Thread(target=self._merge, args=frozen, daemon=True)
+                self._merging.start()
+            thread = self._merging
+        if wait:
+            thread.join()
+
+    def _merge(self, generation: str, journal_offset: int, base: Optional[MappedIndex],
+               base_dead: Tombstones, delta_docs: List[Tuple[DocInfo, str]]) -> None:
+        try:
+            merged = FieldedIndex(keep_text=True)
+            if base is not None:
+                for doc_id, doc in base.iter_docs():
+                    if doc_id in base_dead:
+                        continue
+                    text = base.text(doc_id)
+                    if text is None:
+                        found = self._extract(doc[0])
+                        if found is None:
+                            continue
+                        text = found[0]["pattern_matching"]
+                    merged.add_document(doc[0], doc[1], text, "", field_map=doc[4])
+            for doc, text in delta_docs:
+                merged.add_document(doc[0], doc[1], text, "", field_map=doc[4])
+            self._swap(merged, generation, journal_offset)
+        except Exception as e:
+            print(f"[-] Error merging CV index segments: {e}")
+
+    def _swap(self, index: FieldedIndex, generation: Optional[str], journal_offset: int) -> bool:
+        """
+        Write `index` as the base of the next generation and carry the
+        journal entries after `journal_offset` over to it. Gives up if
+        another process moved past `generation` first; None always swaps.
+        """
+        with self._file_lock():
+            current = self._current()
+            if generation is not None and current != generation:
+                return False
+            new = self._next_generation(current)
+            write_index(index, self._base_path(new))
+            try:
+                with open(self._journal_path(current), "rb") as f:
+                    f.seek(journal_offset)
+                    tail = f.read()
+            except FileNotFoundError:
+                tail = b""
+            tmp_path = self._journal_path(new).with_suffix(".tmp")
+            tmp_path.write_bytes(tail)
+            os.replace(tmp_path, self._journal_path(new))
+            tmp_path = self.directory / "CURRENT.tmp"
+            tmp_path.write_text(new + "\n", encoding="utf-8")
+            os.replace(tmp_path, self.directory / "CURRENT")
+
+            self._remove_old_generations()
+        self.refresh()
+        return True
+
+    def _remove_old_generations(self) -> None:
+        # a generation is deleted once its successor is RETAIN_SECONDS old, so
+        # searches that snapshotted it before the merge can still finish
+        bases = sorted(self.directory.glob("base-*.cvix"))
+        now = time.time()
+        for older, newer in zip(bases, bases[1:]):
+            try:
+                if now - newer.stat().st_mtime < RETAIN_SECONDS:
+                    continue
+                generation = older.stem.split("-", 1)[1]
+                older.unlink()
+                self._journal_path(generation).unlink()
+            except OSError:
+                pass
+
+    def install(self, index: FieldedIndex) -> None:
+        """
+        Replace the base with a full build. The whole journal is replayed on
+        top of it, so changes made while the build ran are not lost.
+        """
+        with self._lock:
+            thread = self._merging
+        if thread is not None:
+            thread.join()
+        self._swap(index, None, 0)
+
+    # -- reads --
+
+    def snapshot(self) -> IndexSnapshot:
+        self.refresh()
+        with self._lock:
+            return IndexSnapshot(self._lock, self._base, self._base_dead.copy(),
+                                 self._delta, self._delta_dead.copy())
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "generation": self._generation,
+                "base_docs": len(self._base) if self._base is not None else 0,
+                "base_deleted": len(self._base_dead),
+                "delta_docs": len(self._delta) - len(self._delta_dead),
+                "journal_entries": self._replayed
+            }
+
+_live: Optional[SegmentedIndex] = None
+
+def get_live_index() -> Optional[SegmentedIndex]:
+    """
+    The process's SegmentedIndex over CV_INDEX_DIR (default .cache/index),
+    or None until an index has been built there.
+    """
+    global _live
+    if _live is None:
+        directory = Path(os.getenv("CV_INDEX_DIR", DEFAULT_INDEX_DIR))
+        if not (directory / "CURRENT").exists():
+            return None
+        _live = SegmentedIndex(directory)
+    return _live
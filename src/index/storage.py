@@ -0,0 +1,350 @@
+import os
+import mmap
+import struct
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .fields import FIELDS, FieldMap
+from .fielded_index import DocInfo, FieldedIndex, TermLookup, keyword_positions, search_index
+
+# On-disk index, version 1. Little-endian throughout.
+#
+#   header   magic "CVIX", format version, term count, doc count, total tokens,
+#            then (offset, length) of each section below
+#   sections, each starting on an 8-byte boundary:
+#     TERM_TEXT      "\0term\0term\0...\0", terms sorted, utf-8
+#     TERM_STARTS    u64 per term: where it starts in TERM_TEXT
+#     POST_OFFSETS   u64 per term + 1: its slice of POSTINGS
+#     POSTINGS       per term, varints: doc count, then per doc the doc id
+#                    gap, position count, first position and position gaps
+#     DOC_TOKENS     u32 per doc
+#     DOC_CHARS      u32 per doc
+#     PATH_OFFSETS / PATH_TEXT     cv_path per doc (docs sorted by cv_path)
+#     HASH_OFFSETS / HASH_TEXT     content hash per doc
+#     TEXT_OFFSETS / TEXT          pattern-matching text per doc (may be empty)
+#     FIELD_OFFSETS  u32 per doc + 1: its slice of FIELD_RANGES, in ranges
+#     FIELD_RANGES   u32 triples (start, end, index into FIELDS)
+
+MAGIC = b"CVIX"
+FORMAT_VERSION = 1
+SECTIONS = (
+    "TERM_TEXT", "TERM_STARTS", "POST_OFFSETS", "POSTINGS", "DOC_TOKENS", "DOC_CHARS",
+    "PATH_OFFSETS", "PATH_TEXT", "HASH_OFFSETS", "HASH_TEXT", "TEXT_OFFSETS", "TEXT",
+    "FIELD_OFFSETS", "FIELD_RANGES"
+)
+_HEADER = struct.Struct("<4sIIIQ")
+_SECTION = struct.Struct("<QQ")
+_HEADER_SIZE = _HEADER.size + _SECTION.size * len(SECTIONS)
+
+PathLike = Union[str, Path]
+
+class IndexFormatError(Exception):
+    pass
+
+def _varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_varints(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            values.append(value | (byte << shift))
+            value = shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    return values
+
+def _u64(values: Iterable[int]) -> bytes:
+    values = list(values)
+    return struct.pack(f"<{len(values)}Q", *values)
+
+def _u32(values: Iterable[int]) -> bytes:
+    values = list(values)
+    return struct.pack(f"<{len(values)}I", *values)
+
+def _blob(strings: Sequence[str]) -> Tuple[bytes, bytes]:
+    """(u64 offsets, one per string + 1; the utf-8 strings back to back)"""
+    encoded = [s.encode("utf-8") for s in strings]
+    return _u64(accumulate([0] + [len(e) for e in encoded])), b"".join(encoded)
+
+def write_index(index: FieldedIndex, path: PathLike) -> Path:
+    """
+    Write `index` in the on-disk format, terms and docs sorted so lookups
+    are binary searches. The file is written next to `path` and renamed
+    into place, so readers never see half of it.
+    """
+    path = Path(path)
+    order = sorted(range(len(index.docs)), key=lambda doc_id: index.docs[doc_id][0])
+    new_doc_id = {old: new for new, old in enumerate(order)}
+    docs = [index.docs[old] for old in order]
+    texts = [index.text(old) or "" for old in order]
+
+    terms = sorted(range(len(index.vocab)), key=lambda term_id: index.vocab[term_id])
+    vocab = [index.vocab[term_id] for term_id in terms]
+    term_text = b"\0" + b"\0".join(term.encode("utf-8") for term in vocab) + b"\0"
+    term_starts = list(accumulate([1] + [len(term.encode("utf-8")) + 1 for term in vocab[:-1]])) if vocab else []
+
+    postings = bytearray()
+    post_offsets = [0]
+    for term_id in terms:
+        entries = sorted((new_doc_id[doc_id], positions) for doc_id, positions in index.term_postings(term_id))
+        _varint(len(entries), postings)
+        previous_doc = 0
+        for doc_id, positions in entries:
+            _varint(doc_id - previous_doc, postings)
+            _varint(len(positions), postings)
+            previous = 0
+            for position in positions:
+                _varint(position - previous, postings)
+                previous = position
+            previous_doc = doc_id
+        post_offsets.append(len(postings))
+
+    field_codes = {field: code for code, field in enumerate(FIELDS)}
+    field_offsets = [0]
+    field_ranges: List[int] = []
+    for doc in docs:
+        for start, end, field in doc[4].ranges:
+            field_ranges.extend((start, end, field_codes[field]))
+        field_offsets.append(len(field_ranges) // 3)
+
+    path_offsets, path_text = _blob([doc[0] for doc in docs])
+    hash_offsets, hash_text = _blob([doc[1] or "" for doc in docs])
+    text_offsets, text = _blob(texts)
+    sections = [
+        term_text, _u64(term_starts), _u64(post_offsets), bytes(postings),
+        _u32(doc[2] for doc in docs), _u32(doc[3] for doc in docs),
+        path_offsets, path_text, hash_offsets, hash_text, text_offsets, text,
+        _u32(field_offsets), _u32(field_ranges)
+    ]
+
+    table = []
+    offset = _HEADER_SIZE
+    for section in sections:
+        offset += -offset % 8
+        table.append((offset, len(section)))
+        offset += len(section)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(vocab), len(docs), index.total_tokens))
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for (start, _), section in zip(table, sections):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, path)
+    return path
+
+class _Strings:
+    """Read-only sequence of the utf-8 strings in one offsets/blob pair"""
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+class _SortedTerms:
+    """The sorted vocabulary as a sequence, read straight from TERM_TEXT"""
+    def __init__(self, text: memoryview, starts: memoryview):
+        self.text = text
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> str:
+        start = self.starts[i]
+        end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else len(self.text) - 1
+        return str(self.text[start:end], "utf-8")
+
+class _MappedTermLookup(TermLookup):
+    """TermLookup over the mapped TERM_TEXT, scanned in place"""
+    def __init__(self, buffer: mmap.mmap, offset: int, length: int, vocab: _SortedTerms):
+        self.vocab = vocab
+        self._buffer = buffer
+        self._offset = offset
+        self._end = offset + length
+        self._starts = vocab.starts
+        self._length = length
+
+    def _scan(self, needle: str) -> List[int]:
+        encoded = needle.encode("utf-8")
+        found = []
+        position = self._buffer.find(encoded, self._offset, self._end)
+        while position != -1:
+            found.append(position - self._offset)
+            position = self._buffer.find(encoded, position + 1, self._end)
+        return found
+
+    def starting_with(self, prefix: str) -> List[int]:
+        return [self._term_at(position + 1) for position in self._scan("\0" + prefix)
+                if position + 1 < self._length]
+
+class MappedIndex:
+    """
+    Read-only FieldedIndex loaded from a file written by `write_index`.
+
+    The file is memory-mapped and read in place: opening it costs the header
+    and a few array views whatever the corpus size, and every process that
+    maps the same file (the app, CLI drivers, pool workers) shares one copy
+    in the OS page cache. Postings are decoded per term on first use.
+    """
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except Exception:
+            self._buffer.close()
+            raise
+        self._postings = lru_cache(maxsize=4096)(self._decode_postings)
+
+    def _open(self) -> None:
+        if len(self._buffer) < _HEADER_SIZE:
+            raise IndexFormatError(f"{self.path} is too short to be an index")
+        magic, version, n_terms, n_docs, total_tokens = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise IndexFormatError(f"{self.path} is not an index file")
+        if version != FORMAT_VERSION:
+            raise IndexFormatError(f"{self.path} has index format {version}, expected {FORMAT_VERSION}")
+        self.total_tokens = total_tokens
+        self._n_docs = n_docs
+
+        view = memoryview(self._buffer)
+        self._views = [view]
+        sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(self._buffer, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(self._buffer):
+                raise IndexFormatError(f"{self.path} is truncated")
+            sections[name] = (offset, length, view[offset:offset + length])
+            self._views.append(sections[name][2])
+
+        def array(name: str, code: str) -> memoryview:
+            cast = sections[name][2].cast(code)
+            self._views.append(cast)
+            return cast
+
+        self._term_starts = array("TERM_STARTS", "Q")
+        self._post_offsets = array("POST_OFFSETS", "Q")
+        self._postings_data = sections["POSTINGS"][2]
+        self._doc_tokens = array("DOC_TOKENS", "I")
+        self._doc_chars = array("DOC_CHARS", "I")
+        self._paths = _Strings(array("PATH_OFFSETS", "Q"), sections["PATH_TEXT"][2])
+        self._hashes = _Strings(array("HASH_OFFSETS", "Q"), sections["HASH_TEXT"][2])
+        self._texts = _Strings(array("TEXT_OFFSETS", "Q"), sections["TEXT"][2])
+        self._field_offsets = array("FIELD_OFFSETS", "I")
+        self._field_ranges = array("FIELD_RANGES", "I")
+
+        term_offset, term_length, term_view = sections["TERM_TEXT"]
+        self.vocab = _SortedTerms(term_view, self._term_starts)
+        if len(self.vocab) != n_terms or len(self._paths) != n_docs:
+            raise IndexFormatError(f"{self.path} has inconsistent section sizes")
+        self.lookup = _MappedTermLookup(self._buffer, term_offset, term_length, self.vocab)
+
+    def close(self) -> None:
+        self._postings.cache_clear()
+        # mmap refuses to close while views into it exist
+        for view in reversed(self._views):
+            view.release()
+        self._buffer.close()
+
+    def __len__(self) -> int:
+        return self._n_docs
+
+    def __contains__(self, cv_path: str) -> bool:
+        return self.doc_id(cv_path) is not None
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_tokens / self._n_docs if self._n_docs else 0.0
+
+    # -- reader interface used by the matcher --
+
+    def _decode_postings(self, term_id: int) -> List[Tuple[int, List[int]]]:
+        values = _decode_varints(self._postings_data[self._post_offsets[term_id]:self._post_offsets[term_id + 1]])
+        entries = []
+        cursor = 1
+        doc_id = 0
+        for _ in range(values[0]):
+            doc_id += values[cursor]
+            count = values[cursor + 1]
+            entries.append((doc_id, list(accumulate(values[cursor + 2:cursor + 2 + count]))))
+            cursor += 2 + count
+        return entries
+
+    def term_postings(self, term_id: int) -> Iterable[Tuple[int, List[int]]]:
+        return self._postings(term_id)
+
+    def term_id(self, term: str) -> Optional[int]:
+        i = bisect_left(self.vocab, term)
+        if i < len(self.vocab) and self.vocab[i] == term:
+            return i
+        return None
+
+    def doc_id(self, cv_path: str) -> Optional[int]:
+        i = bisect_left(self._paths, cv_path)
+        if i < len(self._paths) and self._paths[i] == cv_path:
+            return i
+        return None
+
+    def doc(self, doc_id: int) -> DocInfo:
+        ranges = self._field_ranges[self._field_offsets[doc_id] * 3:self._field_offsets[doc_id + 1] * 3]
+        field_map = FieldMap([(ranges[i], ranges[i + 1], FIELDS[ranges[i + 2]]) for i in range(0, len(ranges), 3)])
+        return (self._paths[doc_id], self._hashes[doc_id], self._doc_tokens[doc_id],
+                self._doc_chars[doc_id], field_map)
+
+    def text(self, doc_id: int) -> Optional[str]:
+        """The CV's pattern-matching text, if the index was written with texts"""
+        text = self._texts[doc_id]
+        return text if text or not self._doc_chars[doc_id] else None
+
+    def text_source(self, doc_id: int) -> Optional[Tuple[str, int]]:
+        """(index file, doc id) for pool workers, which map the file themselves"""
+        return (str(self.path), doc_id) if self.text(doc_id) is not None else None
+
+    def iter_docs(self) -> Iterable[Tuple[int, DocInfo]]:
+        for doc_id in range(self._n_docs):
+            yield doc_id, self.doc(doc_id)
+
+    # -- queries --
+
+    def keyword_positions(self, keyword: str) -> Dict[int, List[int]]:
+        return keyword_positions(self, keyword)
+
+    def search(
+        self,
+        keywords: Sequence[str],
+        doc_ids: Optional[Iterable[int]] = None,
+        field_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        return search_index(self, keywords, doc_ids, field_weights)
+
+_opened: Dict[Tuple[int, str], Tuple[float, MappedIndex]] = {}
+
+def open_index(path: PathLike) -> MappedIndex:
+    """
+    The process's MappedIndex for `path`, reopened when the file was
+    replaced; pool workers call this to reach the same mapped file.
+    """
+    key = (os.getpid(), str(Path(path).resolve()))
+    mtime = os.stat(key[1]).st_mtime
+    cached = _opened.get(key)
+    if cached is None or cached[0] != mtime:
+        _opened[key] = (mtime, MappedIndex(key[1]))
+    return _opened[key][1]
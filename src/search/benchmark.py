@@ -0,0 +1,168 @@
+import os
+import sys
+import time
+import random
+import platform
+import tracemalloc
+from itertools import accumulate, product
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .boyer_moore import BoyerMooreSearch
+from .kmp import KMPSearch
+from .aho_corasick import AhoCorasickSearch
+from .levenshtein import LevenshteinSearch
+from .searcher import KeywordSearcher
+
+ALPHABET = "etaoinshrdlcumwfgypbvkjxqz"
+
+EngineFactory = Callable[[List[str]], KeywordSearcher]
+# name -> {'factory': EngineFactory, 'fuzzy': bool}
+ENGINES: Dict[str, Dict[str, Any]] = {}
+
+def register_engine(name: str, factory: EngineFactory, fuzzy: bool = False) -> None:
+    """Make an engine available to the benchmark; the factory gets the query keywords"""
+    ENGINES[name] = {'factory': factory, 'fuzzy': fuzzy}
+
+register_engine("BM", lambda keywords: KeywordSearcher(BoyerMooreSearch()))
+register_engine("KMP", lambda keywords: KeywordSearcher(KMPSearch()))
+register_engine("AC", lambda keywords: KeywordSearcher(AhoCorasickSearch(keywords)))
+register_engine("LEV", lambda keywords: KeywordSearcher(LevenshteinSearch(tolerance=0.2)), fuzzy=True)
+
+def generate_text(rng: random.Random, length: int, skew: float) -> str:
+    """
+    Lowercase text over a 26-letter alphabet plus spaces. Letter frequencies
+    follow 1 / rank**skew, so skew=0 is uniform and larger values concentrate
+    the text on a few letters (more partial matches, fewer long skips).
+    """
+    weights = list(accumulate(1.0 / (rank ** skew) for rank in range(1, len(ALPHABET) + 1)))
+    letters = rng.choices(ALPHABET, cum_weights=weights, k=length)
+    # words of 2-10 letters
+    position = rng.randint(2, 10)
+    while position < length:
+        letters[position] = " "
+        position += rng.randint(3, 11)
+    return "".join(letters)
+
+def generate_keywords(rng: random.Random, text: str, count: int, length: int, hit_ratio: float) -> List[str]:
+    """Keywords of `length` chars; about `hit_ratio` of them are cut from the text so they match"""
+    keywords = []
+    for _ in range(count):
+        if rng.random() < hit_ratio and len(text) > length:
+            start = rng.randrange(len(text) - length)
+            keyword = text[start:start + length]
+        else:
+            keyword = "".join(rng.choices(ALPHABET, k=length))
+        keywords.append(keyword)
+    return keywords
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def benchmark_case(engine: str, text: str, keywords: List[str], repeats: int) -> Dict[str, Any]:
+    spec = ENGINES[engine]
+
+    build_start = time.perf_counter()
+    searcher = spec['factory'](keywords)
+    build_seconds = time.perf_counter() - build_start
+
+    latencies = []
+    result: Dict[str, List[Any]] = {}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = searcher.search(text, keywords)
+        latencies.append(time.perf_counter() - start)
+
+    # separate pass so tracemalloc overhead stays out of the timings
+    tracemalloc.start()
+    spec['factory'](keywords).search(text, keywords)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    median = percentile(latencies, 0.5)
+    text_megabytes = len(text.encode("utf-8")) / 1e6
+    return {
+        'build_ms': build_seconds * 1000,
+        'latency_ms': {
+            'min': latencies[0] * 1000,
+            'p50': median * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000,
+            'mean': sum(latencies) / len(latencies) * 1000,
+        },
+        'throughput_mb_s': text_megabytes / median if median > 0 else None,
+        'peak_memory_bytes': peak_bytes,
+        'match_counts': {keyword: len(result.get(keyword, [])) for keyword in keywords},
+    }
+
+def run_benchmark(
+    engines: Optional[List[str]] = None,
+    text_lengths: Sequence[int] = (10_000, 100_000),
+    keyword_counts: Sequence[int] = (1, 5, 20),
+    keyword_lengths: Sequence[int] = (4, 8, 16),
+    skews: Sequence[float] = (0.0, 1.0),
+    repeats: int = 5,
+    hit_ratio: float = 0.5,
+    seed: int = 0,
+    fuzzy_max_text: int = 20_000,
+    progress: bool = True
+) -> Dict[str, Any]:
+    """
+    Run every engine over the cross product of workload parameters and return
+    a JSON-serialisable report. Each workload is generated from `seed`, so two
+    runs with the same arguments search identical texts and keywords.
+    """
+    engines = list(engines or ENGINES.keys())
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown engines: {', '.join(unknown)} (available: {', '.join(ENGINES)})")
+
+    results = []
+    for text_length, skew, keyword_count, keyword_length in product(text_lengths, skews, keyword_counts, keyword_lengths):
+        rng = random.Random(f"{seed}:{text_length}:{skew}:{keyword_count}:{keyword_length}")
+        text = generate_text(rng, text_length, skew)
+        keywords = generate_keywords(rng, text, keyword_count, keyword_length, hit_ratio)
+        workload = {
+            'text_length': text_length,
+            'skew': skew,
+            'keyword_count': keyword_count,
+            'keyword_length': keyword_length,
+        }
+
+        exact_counts = None
+        for engine in engines:
+            if ENGINES[engine]['fuzzy'] and text_length > fuzzy_max_text:
+                results.append({'engine': engine, **workload, 'skipped': f"text longer than fuzzy_max_text ({fuzzy_max_text})"})
+                continue
+
+            measurement = benchmark_case(engine, text, keywords, repeats)
+            if not ENGINES[engine]['fuzzy']:
+                # exact engines must agree with each other on every workload
+                if exact_counts is None:
+                    exact_counts = measurement['match_counts']
+                measurement['consistent'] = measurement['match_counts'] == exact_counts
+            measurement['total_matches'] = sum(measurement.pop('match_counts').values())
+            results.append({'engine': engine, **workload, **measurement})
+
+            if progress:
+                print(f"[*] {engine:>4} n={text_length} skew={skew} k={keyword_count} m={keyword_length}: "
+                      f"p50 {measurement['latency_ms']['p50']:.2f} ms", file=sys.stderr)
+
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeats': repeats,
+            'hit_ratio': hit_ratio,
+            'engines': engines,
+        },
+        'results': results,
+    }
@@ -1,7 +1,52 @@
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+BULLETS = '•·▪▫◦‣⁃'
+
+# _extract_summary
+NAME_LINE = re.compile(r'^\s*[A-Z][a-z]+\s+[A-Z][a-z]+\s*$')
+CONTACT_LINE = re.compile(r'@|\.com|phone|email|address|\+\d|\(\d{3}\)', re.IGNORECASE)
+CAPS_LINE = re.compile(r'^[A-Z\s]+$')
+
+# _clean_section_content
+BLANK_LINES = re.compile(r'\n\s*\n')
+SPACE_RUNS = re.compile(r'[ \t]+')
+BULLET_PREFIX = re.compile(rf'^\s*[{BULLETS}]\s*', re.MULTILINE)
+DASH_PREFIX = re.compile(r'^\s*[-*]\s*', re.MULTILINE)
+NUMBER_PREFIX = re.compile(r'^\s*\d+\.\s*', re.MULTILINE)
+
+# _parse_skills
+SKILL_SEPARATORS = re.compile(rf'[{BULLETS}\-\*|;\n]')
+SKILL_LABEL = re.compile(r'^(Programming Languages?|Languages?|Frameworks?|Tools?|Technologies?|Software|Databases?|Platforms?|Skills?)\s*:?\s*', re.IGNORECASE)
+DIGITS_ONLY = re.compile(r'^\d+$')
+
+# _parse_experience / _is_job_header / _extract_job_info
+DESCRIPTION_BULLET = re.compile(rf'^[{BULLETS}\-\*]\s*')
+JOB_HEADER_PATTERNS = [
+    re.compile(r'.+\s*[-–—]\s*.+\s*\([^)]*\d{4}[^)]*\)', re.IGNORECASE),  # Position - Company (Year)
+    re.compile(r'.+,\s*.+\s*\([^)]*\d{4}[^)]*\)', re.IGNORECASE),         # Position, Company (Year)
+    re.compile(r'.+\s*\([^)]*\d{4}[^)]*\)', re.IGNORECASE),               # Position (Year)
+    re.compile(r'(\d{4}[-–—]\d{4}|\d{4}[-–—]Present|\d{4})\s*:?\s*.+', re.IGNORECASE),  # Year: Position
+]
+FOUR_DIGITS = re.compile(r'\d{4}')
+JOB_TITLE_WORD = re.compile(r'(engineer|developer|manager|analyst|specialist|coordinator|assistant|director|lead|senior|junior)', re.IGNORECASE)
+DASHED_ENTRY = re.compile(r'^(.+?)\s*[-–—]\s*(.+?)\s*\(([^)]+)\)', re.IGNORECASE)
+COMMA_ENTRY = re.compile(r'^(.+?),\s*(.+?)\s*\(([^)]+)\)', re.IGNORECASE)
+PAREN_ENTRY = re.compile(r'^(.+?)\s*\(([^)]+)\)', re.IGNORECASE)
+YEAR_FIRST_ENTRY = re.compile(r'^(\d{4}[-–—]\d{4}|\d{4}[-–—]Present|\d{4})\s*:?\s*(.+)', re.IGNORECASE)
+
+# _parse_education / _extract_education_info / _clean_degree / _normalize_year
+YEAR = re.compile(r'\b(19|20)\d{2}\b')
+PARENS_AND_COMMAS = re.compile(r'[(),]')
+DEGREE_PREFIX = re.compile(r'^(Bachelor of|Master of|PhD in|Doctor of|Associate of|BS in|BA in|MS in|MA in|MBA|BSc|MSc)\s*', re.IGNORECASE)
+PRESENT = re.compile(r'present', re.IGNORECASE)
+LONG_DASHES = re.compile(r'[–—]')
+SINGLE_YEAR = re.compile(r'^\d{4}$')
 
 class CVGrouper:
+    # bump whenever group_cv_data's output changes, so persisted sections are recomputed
+    VERSION = 1
+
     def __init__(self):
         # Define comprehensive patterns for each section
         self.section_patterns = {
@@ -29,51 +74,92 @@ class CVGrouper:
                 r'(?:POSITIONS|Positions|ROLES|Roles|BACKGROUND|Background)'
             ]
         }
-    
-    def extract_cv_sections(self, formatted_text: str) -> Dict[str, str]:
-        results = {
-            'summary': '',
-            'skills': '',
-            'education': '',
-            'experience': ''
-        }
-        
-        lines = formatted_text.split('\n')
+        self._compile_section_patterns()
+
+    def _compile_section_patterns(self) -> None:
+        """
+        Compile the header patterns once. Each section pattern gets a
+        full-line header regex and an inline regex, and all of them are also
+        joined into one alternation per kind so a CV's lines are scanned
+        once: lines the alternation rejects (nearly all of them) can't match
+        any single pattern, and only the few it accepts are checked pattern
+        by pattern.
+        """
+        self._compiled_patterns: List[Tuple[str, int, "re.Pattern", "re.Pattern"]] = []
+        for section_name, patterns in self.section_patterns.items():
+            for index, pattern in enumerate(patterns):
+                self._compiled_patterns.append((
+                    section_name,
+                    index,
+                    re.compile(f'^\\s*{pattern}\\s*:?\\s*$', re.IGNORECASE),
+                    re.compile(f'({pattern})\\s*:?', re.IGNORECASE)
+                ))
+        alternatives = '|'.join(f'(?:{pattern})' for patterns in self.section_patterns.values() for pattern in patterns)
+        self._any_header = re.compile(f'^\\s*(?:{alternatives})\\s*:?\\s*$', re.IGNORECASE)
+        self._any_inline = re.compile(f'(?:{alternatives})', re.IGNORECASE)
+
+    def _find_sections(self, lines: List[str], inline: bool) -> Dict[str, int]:
+        """
+        Line of each section's header: for the first of its patterns (in
+        order) that matches any line, the first line it matches.
+        """
+        candidate_filter = self._any_inline.search if inline else self._any_header.match
+        first_lines: Dict[Tuple[str, int], int] = {}
+        for line_num, line in enumerate(lines):
+            if not candidate_filter(line):
+                continue
+            for section_name, index, header, inline_pattern in self._compiled_patterns:
+                key = (section_name, index)
+                if key in first_lines:
+                    continue
+                if (inline_pattern.search(line) if inline else header.match(line)):
+                    first_lines[key] = line_num
+
         section_positions = {}
-        
+        for section_name, index, _, _ in self._compiled_patterns:
+            if section_name not in section_positions and (section_name, index) in first_lines:
+                section_positions[section_name] = first_lines[(section_name, index)]
+        return section_positions
+    
+    def section_line_ranges(self, lines: List[str]) -> List[Tuple[str, int, int]]:
+        """
+        (section, header line, end line) for each section found in the lines
+        of a formatted CV, in text order. A section's content is the lines
+        after its header up to the end line (the next header or the end).
+        """
         # Find section headers and their positions
-        for section_name, patterns in self.section_patterns.items():
-            for pattern in patterns:
-                header_pattern = f'^\\s*{pattern}\\s*:?\\s*$'
-                
-                for line_num, line in enumerate(lines):
-                    if re.match(header_pattern, line, re.IGNORECASE):
-                        if section_name not in section_positions:
-                            section_positions[section_name] = line_num
-                        break
+        section_positions = self._find_sections(lines, inline=False)
         
         # If no clear headers found, try inline patterns
         if not section_positions:
-            for section_name, patterns in self.section_patterns.items():
-                for pattern in patterns:
-                    inline_pattern = f'({pattern})\\s*:?'
-                    
-                    for line_num, line in enumerate(lines):
-                        if re.search(inline_pattern, line, re.IGNORECASE):
-                            if section_name not in section_positions:
-                                section_positions[section_name] = line_num
-                            break
+            section_positions = self._find_sections(lines, inline=True)
         
-        # Extract content for each found section
         sorted_positions = sorted(section_positions.items(), key=lambda x: x[1])
-        
+        ranges = []
         for i, (section_name, start_line) in enumerate(sorted_positions):
             # Determine end line (next section or end of text)
             if i + 1 < len(sorted_positions):
                 end_line = sorted_positions[i + 1][1]
             else:
                 end_line = len(lines)
-            
+            ranges.append((section_name, start_line, end_line))
+        return ranges
+
+    def extract_cv_sections(self, formatted_text: str) -> Dict[str, str]:
+        results = {
+            'summary': '',
+            'skills': '',
+            'education': '',
+            'experience': ''
+        }
+        
+        lines = formatted_text.split('\n')
+        
+        # Extract content for each found section
+        section_ranges = self.section_line_ranges(lines)
+        section_positions = {section_name: start_line for section_name, start_line, _ in section_ranges}
+        
+        for section_name, start_line, end_line in section_ranges:
             # Extract content between start and end
             content_lines = []
             for line_num in range(start_line + 1, end_line):
@@ -100,11 +186,11 @@ class CVGrouper:
         summary_start = 0
         for i, line in enumerate(lines[:first_section_line]):
             # Skip obvious header info (names, emails, phones, addresses)
-            if re.search(r'^\s*[A-Z][a-z]+\s+[A-Z][a-z]+\s*$', line):  # Likely a name
+            if NAME_LINE.search(line):  # Likely a name
                 summary_start = i + 1
-            elif re.search(r'@|\.com|phone|email|address|\+\d|\(\d{3}\)', line, re.IGNORECASE):
+            elif CONTACT_LINE.search(line):
                 summary_start = i + 1
-            elif line.strip() and not re.search(r'^[A-Z\s]+$', line):  # Not all caps header
+            elif line.strip() and not CAPS_LINE.search(line):  # Not all caps header
                 break
         
         # Extract summary content
@@ -112,7 +198,7 @@ class CVGrouper:
         for i in range(summary_start, first_section_line):
             if i < len(lines):
                 line = lines[i].strip()
-                if line and not re.match(r'^[A-Z\s]+$', line):  # Skip all-caps headers
+                if line and not CAPS_LINE.match(line):  # Skip all-caps headers
                     summary_lines.append(line)
         
         return '\n'.join(summary_lines[:10])  # Limit to first 10 lines
@@ -137,13 +223,13 @@ class CVGrouper:
             return ""
         
         # Remove excessive whitespace
-        content = re.sub(r'\n\s*\n', '\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
+        content = BLANK_LINES.sub('\n', content)
+        content = SPACE_RUNS.sub(' ', content)
         
         # Remove bullet points and list markers
-        content = re.sub(r'^\s*[•·▪▫◦‣⁃]\s*', '', content, flags=re.MULTILINE)
-        content = re.sub(r'^\s*[-*]\s*', '', content, flags=re.MULTILINE)
-        content = re.sub(r'^\s*\d+\.\s*', '', content, flags=re.MULTILINE)
+        content = BULLET_PREFIX.sub('', content)
+        content = DASH_PREFIX.sub('', content)
+        content = NUMBER_PREFIX.sub('', content)
         
         return content.strip()
     
@@ -154,9 +240,7 @@ class CVGrouper:
         skills = []
         
         # Replace bullet points and other markers with commas
-        text = re.sub(r'[•·▪▫◦‣⁃\-\*]', ',', skills_text)
-        text = re.sub(r'[|;]', ',', text)
-        text = re.sub(r'\n', ',', text)
+        text = SKILL_SEPARATORS.sub(',', skills_text)
         
         # Split by commas and process
         raw_skills = text.split(',')
@@ -164,10 +248,10 @@ class CVGrouper:
         for skill in raw_skills:
             skill = skill.strip()
             # Remove common prefixes/labels
-            skill = re.sub(r'^(Programming Languages?|Languages?|Frameworks?|Tools?|Technologies?|Software|Databases?|Platforms?|Skills?)\s*:?\s*', '', skill, flags=re.IGNORECASE)
+            skill = SKILL_LABEL.sub('', skill)
             
             # Skip empty or invalid entries
-            if len(skill) > 1 and not re.match(r'^\d+$', skill):
+            if len(skill) > 1 and not DIGITS_ONLY.match(skill):
                 # Handle grouped skills like "HTML/CSS/JavaScript"
                 if '/' in skill:
                     sub_skills = skill.split('/')
@@ -221,7 +305,7 @@ class CVGrouper:
                         desc_line = lines[line_idx].strip()
                         if desc_line:
                             # Clean up description line
-                            desc_line = re.sub(r'^[•·▪▫◦‣⁃\-\*]\s*', '', desc_line)
+                            desc_line = DESCRIPTION_BULLET.sub('', desc_line)
                             description_lines.append(desc_line)
                 
                 job_info['description'] = ' '.join(description_lines)
@@ -231,26 +315,19 @@ class CVGrouper:
     
     def _is_job_header(self, line: str) -> bool:
         # Check for common job header patterns
-        patterns = [
-            r'.+\s*[-–—]\s*.+\s*\([^)]*\d{4}[^)]*\)',  # Position - Company (Year)
-            r'.+,\s*.+\s*\([^)]*\d{4}[^)]*\)',         # Position, Company (Year)
-            r'.+\s*\([^)]*\d{4}[^)]*\)',               # Position (Year)
-            r'(\d{4}[-–—]\d{4}|\d{4}[-–—]Present|\d{4})\s*:?\s*.+',  # Year: Position
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, line, re.IGNORECASE):
+        for pattern in JOB_HEADER_PATTERNS:
+            if pattern.match(line):
                 return True
         
         # Additional check for lines that contain job-related keywords and years
-        if re.search(r'\d{4}', line) and re.search(r'(engineer|developer|manager|analyst|specialist|coordinator|assistant|director|lead|senior|junior)', line, re.IGNORECASE):
+        if FOUR_DIGITS.search(line) and JOB_TITLE_WORD.search(line):
             return True
             
         return False
     
     def _extract_job_info(self, line: str) -> Optional[Dict[str, str]]:        
         # Pattern 1: "Position - Company (Year-Year)"
-        match = re.match(r'^(.+?)\s*[-–—]\s*(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
+        match = DASHED_ENTRY.match(line)
         if match:
             return {
                 'position': match.group(1).strip(),
@@ -259,7 +336,7 @@ class CVGrouper:
             }
         
         # Pattern 2: "Position, Company (Year)"
-        match = re.match(r'^(.+?),\s*(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
+        match = COMMA_ENTRY.match(line)
         if match:
             return {
                 'position': match.group(1).strip(),
@@ -268,8 +345,8 @@ class CVGrouper:
             }
         
         # Pattern 3: "Position (Year-Year)"
-        match = re.match(r'^(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
-        if match and re.search(r'\d{4}', match.group(2)):
+        match = PAREN_ENTRY.match(line)
+        if match and FOUR_DIGITS.search(match.group(2)):
             return {
                 'position': match.group(1).strip(),
                 'year': self._normalize_year(match.group(2).strip()),
@@ -277,7 +354,7 @@ class CVGrouper:
             }
         
         # Pattern 4: Year first "2020-2021: Position at Company"
-        match = re.match(r'^(\d{4}[-–—]\d{4}|\d{4}[-–—]Present|\d{4})\s*:?\s*(.+)', line, re.IGNORECASE)
+        match = YEAR_FIRST_ENTRY.match(line)
         if match:
             return {
                 'position': match.group(2).strip(),
@@ -306,7 +383,7 @@ class CVGrouper:
             
             for line in lines:
                 # Check if line contains a year
-                year_match = re.search(r'\b(19|20)\d{2}\b', line)
+                year_match = YEAR.search(line)
                 if year_match:
                     current_entry['year'] = year_match.group()
                 
@@ -358,7 +435,7 @@ class CVGrouper:
     
     def _extract_education_info(self, line: str) -> Optional[Dict[str, str]]:        
         # Pattern 1: "Degree - Institution (Year)"
-        match = re.match(r'^(.+?)\s*[-–—]\s*(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
+        match = DASHED_ENTRY.match(line)
         if match:
             return {
                 'major': self._clean_degree(match.group(1).strip()),
@@ -367,7 +444,7 @@ class CVGrouper:
             }
         
         # Pattern 2: "Degree, Institution (Year)"
-        match = re.match(r'^(.+?),\s*(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
+        match = COMMA_ENTRY.match(line)
         if match:
             return {
                 'major': self._clean_degree(match.group(1).strip()),
@@ -376,8 +453,8 @@ class CVGrouper:
             }
         
         # Pattern 3: "Degree (Year)"
-        match = re.match(r'^(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
-        if match and re.search(r'\d{4}', match.group(2)):
+        match = PAREN_ENTRY.match(line)
+        if match and FOUR_DIGITS.search(match.group(2)):
             return {
                 'major': self._clean_degree(match.group(1).strip()),
                 'institution': '',
@@ -385,7 +462,7 @@ class CVGrouper:
             }
         
         # Pattern 4: "Institution - Degree (Year)"
-        match = re.match(r'^(.+?)\s*[-–—]\s*(.+?)\s*\(([^)]+)\)', line, re.IGNORECASE)
+        match = DASHED_ENTRY.match(line)
         if match and self._looks_like_institution(match.group(1)) and self._looks_like_degree(match.group(2)):
             return {
                 'major': self._clean_degree(match.group(2).strip()),
@@ -395,12 +472,12 @@ class CVGrouper:
         
         # Pattern 5: Just degree with year somewhere in line
         if self._looks_like_degree(line):
-            year_match = re.search(r'\b(19|20)\d{2}\b', line)
+            year_match = YEAR.search(line)
             year = year_match.group() if year_match else ''
             
             # Remove year from line to get clean degree
-            clean_line = re.sub(r'\b(19|20)\d{2}\b', '', line).strip()
-            clean_line = re.sub(r'[(),]', '', clean_line).strip()
+            clean_line = YEAR.sub('', line).strip()
+            clean_line = PARENS_AND_COMMAS.sub('', clean_line).strip()
             
             return {
                 'major': self._clean_degree(clean_line),
@@ -412,7 +489,7 @@ class CVGrouper:
     
     def _clean_degree(self, degree: str) -> str:        
         # Remove common prefixes
-        degree = re.sub(r'^(Bachelor of|Master of|PhD in|Doctor of|Associate of|BS in|BA in|MS in|MA in|MBA|BSc|MSc)\s*', '', degree, flags=re.IGNORECASE)
+        degree = DEGREE_PREFIX.sub('', degree)
         return degree.strip()
     
     def _normalize_year(self, year_str: str) -> str:        
@@ -420,13 +497,13 @@ class CVGrouper:
             return ""
         
         # Handle "Present" case
-        year_str = re.sub(r'present', 'Present', year_str, flags=re.IGNORECASE)
+        year_str = PRESENT.sub('Present', year_str)
         
         # Normalize dashes
-        year_str = re.sub(r'[–—]', '-', year_str)
+        year_str = LONG_DASHES.sub('-', year_str)
         
         # Handle single years
-        if re.match(r'^\d{4}$', year_str):
+        if SINGLE_YEAR.match(year_str):
             return year_str
         
         return year_str.strip()
\ No newline at end of file
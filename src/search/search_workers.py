@@ -1,38 +1,147 @@
+import time
 from pathlib import Path
 from src.core.extractor import PDFExtractor
+from src.core.extraction_cache import get_extraction_cache
+from src.core.tracing import SpanRecord, collect_spans, get_tracer
+from src.core.profiling import WorkerProfile, capture_profile
 from src.search.boyer_moore import BoyerMooreSearch
 from src.search.aho_corasick import AhoCorasickSearch
 from src.search.kmp import KMPSearch
 from src.search.searcher import KeywordSearcher
-from typing import Tuple, List, Dict, Any
+from src.index.fields import FieldMap, build_field_map, needs_fields, parse_query, resolve_hits
+from typing import Tuple, List, Dict, Any, Iterator, Optional
+
+def _search_pages(
+    ks: KeywordSearcher,
+    pages: Iterator[str],
+    keywords: List[str],
+    stop_early: bool
+) -> Tuple[str, Dict[str, List[int]], bool, float]:
+    """
+    Match keywords page by page over normalized page texts. Each new page is
+    searched together with the last (longest keyword - 1) characters before
+    it, keeping only matches that end in the new page, so hits spanning a
+    page break are found once and positions equal those in the joined text.
+    With `stop_early`, reading stops once every keyword has matched.
+    Returns (text read so far, exact hits, whether every page was read,
+    seconds spent matching).
+    """
+    exact: Dict[str, List[int]] = {kw: [] for kw in keywords}
+    lengths = {kw: len(kw.lower()) for kw in keywords}
+    overlap = max(lengths.values(), default=1) - 1
+    parts: List[str] = []
+    length = 0
+    tail = ""
+    matching = 0.0
+    complete = True
+    for page in pages:
+        if not page:
+            continue
+        sep = " " if parts else ""
+        chunk = tail + sep + page
+        offset = length - len(tail)
+        started = time.perf_counter()
+        for kw, positions in ks.search(chunk, keywords).items():
+            exact[kw].extend(offset + pos for pos in positions if offset + pos + lengths[kw] > length)
+        matching += time.perf_counter() - started
+        parts.append(sep + page)
+        length += len(sep) + len(page)
+        tail = chunk[-overlap:] if overlap else ""
+        if stop_early and all(exact.get(kw) for kw in keywords):
+            complete = False
+            break
+    if not parts:
+        exact = ks.search("", keywords)
+    get_tracer().record("match", matching)
+    return "".join(parts), exact, complete, matching
 
 def search_exact_worker(
     detail: Dict[str, Any],
     keywords: List[str],
     algo_name: str,
-    data_root: str
+    data_root: str,
+    use_cache: bool = True,
+    trace: bool = False,
+    profile: Optional[WorkerProfile] = None,
+    stop_early: bool = False,
+    field_weights: Optional[Dict[str, float]] = None
 ) -> Dict[str, Any]:
     """
     Perform exact-match (BM or KMP) on a single CV and record missing keywords.
+    Extracted text comes from the extraction cache unless `use_cache` is False.
+    With `stop_early`, a CV that has to be read from its PDF is streamed page
+    by page and reading stops once every keyword has matched; its counts are
+    then lower bounds and "complete" is False.
+    Keywords may be limited to a section ("skills:python"); when one is, or
+    `field_weights` is given, the CV's sections are mapped (and stop_early
+    is ignored), hits are counted per section under "exact_fields" and
+    weighted into "exact_score", which is otherwise the plain hit count.
+    With `trace`, the result carries this CV's tracing spans under "spans";
+    with `profile`, its profiler payload under "profile".
     """
     # Build a Path object so extractor.pdf_path.name works
     pdf_path = Path(data_root) / detail["cv_path"]
+    terms = parse_query(keywords)
+    with_fields = needs_fields(terms, field_weights)
+    search_keys = list(dict.fromkeys(term.text for term in terms)) if with_fields else keywords
 
-    extractor = PDFExtractor(data_root)
-    # Pass a Path, not a str
-    text = extractor.extract_single_pdf(pdf_path)["pattern_matching"]
+    with capture_profile(profile) as capture, collect_spans(trace) as spans:
+        t0 = time.perf_counter()
+        extractor = PDFExtractor(data_root)
+        cache = get_extraction_cache() if use_cache else None
+        text = None
+        regex_format = ""
+        if not stop_early or with_fields:
+            # Pass a Path, not a str
+            if cache is not None:
+                extracted = cache.get_or_extract(pdf_path, extractor)
+            else:
+                extracted = extractor.extract_single_pdf(pdf_path)
+            text, regex_format = extracted["pattern_matching"], extracted["regex_format"]
+        elif cache is not None:
+            with get_tracer().span("cache_lookup"):
+                cached = cache.get(pdf_path)
+            if cached is not None:
+                text = cached["pattern_matching"]
+        t1 = time.perf_counter()
 
-    # Choose algorithm
-    algo = None
-    if algo_name == "BM":
-        algo = BoyerMooreSearch() 
-    elif algo_name == "KMP":
-        algo = KMPSearch()
-    else:
-        algo = AhoCorasickSearch(keywords)
+        # Choose algorithm
+        algo = None
+        if algo_name == "BM":
+            algo = BoyerMooreSearch() 
+        elif algo_name == "KMP":
+            algo = KMPSearch()
+        else:
+            # the automaton matches its own patterns, so give it exactly what the searcher looks for
+            algo = AhoCorasickSearch([key.lower() for key in search_keys])
+
+        ks   = KeywordSearcher(algo, case_sensitive=False, whole_word=False)
+        complete = True
+        if text is not None:
+            with get_tracer().span("match"):
+                exact = ks.search(text, search_keys)
+            t_match = time.perf_counter() - t1
+        else:
+            raw_pages: List[str] = []
+            def pages():
+                for raw_page, page in extractor.iter_pattern_pages(pdf_path):
+                    raw_pages.append(raw_page)
+                    yield page
+            try:
+                text, exact, complete, t_match = _search_pages(ks, pages(), keywords, stop_early)
+            except Exception as e:
+                print(f"[-] Error extracting text from {pdf_path}: {e}")
+                text, exact, t_match = "", {kw: [] for kw in keywords}, 0.0
+            if cache is not None and complete and text:
+                cache.put(pdf_path, extractor.format_pages(raw_pages, text))
+        # page streaming interleaves reading and matching, so split by the measured matching time
+        t_extract = time.perf_counter() - t0 - t_match
+
+        field_map = exact_fields = score = None
+        if with_fields:
+            field_map = build_field_map(text, regex_format)
+            exact, exact_fields, score = resolve_hits(terms, exact, field_map, field_weights)
 
-    ks   = KeywordSearcher(algo, case_sensitive=False, whole_word=False)
-    exact = ks.search(text, keywords)
     count = sum(len(v) for v in exact.values())
     missing = [kw for kw, locs in exact.items() if not locs]
 
@@ -41,18 +150,34 @@ def search_exact_worker(
         "text":        text,
         "exact_raw":   exact,
         "exact_count": count,
-        "missing":     missing
+        "exact_score": count if score is None else score,
+        "exact_fields": exact_fields,
+        "field_map":   field_map,
+        "missing":     missing,
+        "t_extract":   t_extract,
+        "t_match":     t_match,
+        "complete":    complete,
+        "spans":       spans,
+        "profile":     capture.payload
     }
 
 def search_fuzzy_worker(
     idx: int,
-    text: str,
+    text: Optional[str],
+    source: Optional[Tuple[str, int]],
     missing: List[str],
-    tolerance: float
-) -> Tuple[int, Dict[str, List[Tuple[int,int]]]]:
+    tolerance: float,
+    trace: bool = False,
+    profile: Optional[WorkerProfile] = None,
+    field_map: Optional[FieldMap] = None
+) -> Tuple[int, Dict[str, List[Tuple[int,int]]], List[SpanRecord], Any]:
     """
     Perform fuzzy-match (Levenshtein) on one CV's missing keywords.
-    Returns (original index, fuzzy_raw) so results can be merged back.
+    With no `text`, it is read from `source`, an (index file, doc id) pair.
+    Section-limited keywords only keep hits inside their section of
+    `field_map`.
+    Returns (original index, fuzzy_raw, spans, profile payload) so results
+    can be merged back.
     """
     from src.search.levenshtein import LevenshteinSearch
     from src.search.searcher import KeywordSearcher
@@ -62,8 +187,18 @@ def search_fuzzy_worker(
     ks_fuzzy   = KeywordSearcher(fuzzy_algo, case_sensitive=False)
 
     if not missing:
-        return idx, {}
-
-    fuzzy = ks_fuzzy.search(text, missing)
-    return idx, fuzzy
+        return idx, {}, [], None
+    if text is None:
+        from src.index.storage import open_index
+        text = open_index(source[0]).text(source[1]) or ""
 
+    terms = parse_query(missing)
+    with_fields = needs_fields(terms, None)
+    with capture_profile(profile) as capture, collect_spans(trace) as spans:
+        with get_tracer().span("fuzzy_match"):
+            if with_fields:
+                fuzzy = ks_fuzzy.search(text, list(dict.fromkeys(term.text for term in terms)))
+                fuzzy, _, _ = resolve_hits(terms, fuzzy, field_map, position=lambda hit: hit[0])
+            else:
+                fuzzy = ks_fuzzy.search(text, missing)
+    return idx, fuzzy, spans, capture.payload
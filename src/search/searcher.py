@@ -65,6 +65,10 @@ class KeywordSearcher:
                     for m in pattern.finditer(proc_text):
                         filtered[m.group(1)].append(m.start())
                     raw = filtered
+                else:
+                    # every keyword, in query order, even where the algorithm
+                    # (Aho-Corasick) only reports the ones it found
+                    raw = {nk: raw.get(nk, []) for nk in proc_keys}
 
             return {
                 norm_to_orig.get(nk, nk): positions
@@ -0,0 +1,297 @@
+import hmac
+import json
+import signal
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.core.extraction_cache import get_extraction_cache
+from src.core.extractor import PDFExtractor
+from src.search.cv_grouper import CVGrouper
+from src.services.search_service import SearchService, serialize_search
+
+ALGORITHMS = ("KMP", "BM", "AC")
+MAX_BODY = 64 * 1024
+REQUEST_TIMEOUT = 30.0
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _ignore_sigint() -> None:
+    # Ctrl+C reaches the whole process group; the service closes the pool itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+class _SerializedDB:
+    """Calls into the DB one at a time: db_manager shares a single MySQL connection between callers"""
+    def __init__(self, db: Any):
+        self._db = db
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+        return call
+
+class SearchHTTPService:
+    """
+    Local HTTP front for the search pipeline, so several desktop clients
+    share one warm index and one worker pool instead of each doing the
+    search work on its own machine.
+
+      GET|POST /search              keywords, algo, max_match, positions
+      GET /applicant/{id}           profile and applications
+      GET /cv/{detail_id}/summary   grouped CV sections
+      GET /health
+
+    Requests are handled on the asyncio loop; searches and DB calls run in
+    a thread pool, and searches fan their per-CV work out to the shared
+    process pool. Identical searches in flight at the same time run once
+    and every caller gets the result. At most `max_concurrent` searches
+    run at a time with up to `max_queue` more waiting; beyond that the
+    service answers 503 with Retry-After rather than queueing without bound.
+
+    Applicant and summary responses carry decrypted personal data. With a
+    `token`, every route but /health needs "Authorization: Bearer <token>";
+    without one the service must only listen on loopback (see -d serve).
+    """
+    def __init__(
+        self,
+        db: Any,
+        index: Any = None,
+        pool_size: Optional[int] = None,
+        max_concurrent: int = 4,
+        max_queue: int = 16,
+        fuzzy_tolerance: float = 0.2,
+        data_root: str = "",
+        ranking: str = "bm25",
+        token: Optional[str] = None
+    ):
+        self.db = _SerializedDB(db)
+        self.token = token
+        self.index = index
+        self.data_root = data_root
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        # fork the workers before any thread exists
+        self.pool = Pool(pool_size, initializer=_ignore_sigint) if pool_size != 0 else None
+        self.search_service = SearchService(
+            self.db,
+            pool_size=pool_size,
+            use_multiprocessing=self.pool is not None,
+            fuzzy_tolerance=fuzzy_tolerance,
+            data_root=data_root,
+            index=index,
+            ranking=ranking,
+            pool=self.pool
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent + 2)
+        self._local = threading.local()
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.stats = {"requests": 0, "searches": 0, "coalesced": 0, "rejected": 0}
+
+    # -- work run in the thread pool --
+
+    def _grouper(self) -> CVGrouper:
+        grouper = getattr(self._local, "grouper", None)
+        if grouper is None:
+            grouper = self._local.grouper = CVGrouper()
+        return grouper
+
+    def _run_search(self, keywords: Tuple[str, ...], algo: str, max_match: int) -> Dict[str, Any]:
+        return serialize_search(self.search_service.search(list(keywords), algo, max_match), with_positions=True)
+
+    def _applicant(self, applicant_id: int) -> Optional[Dict[str, Any]]:
+        return self.db.get_data_by_applicant_id(applicant_id)
+
+    def _summary(self, detail_id: int) -> Optional[Dict[str, Any]]:
+        detail = self.db.get_application_detail(detail_id)
+        if detail is None:
+            return None
+        pdf_path = Path(self.data_root) / detail["cv_path"]
+        sections = get_extraction_cache().get_or_group(detail_id, pdf_path, PDFExtractor(self.data_root),
+                                                       self._grouper())
+        return {**detail, **sections}
+
+    # -- request handling --
+
+    async def _call(self, func, *args) -> Any:
+        return await asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    async def _searched(self, key: Tuple) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.stats["searches"] += 1
+            return await self._call(self._run_search, *key)
+
+    async def search(self, keywords, algo: str, max_match: int) -> Dict[str, Any]:
+        key = (tuple(keywords), algo, max_match)
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            if len(self._in_flight) >= self.max_concurrent + self.max_queue:
+                self.stats["rejected"] += 1
+                raise HTTPError(503, "too many searches in progress, retry shortly")
+            future = self._in_flight[key] = asyncio.ensure_future(self._searched(key))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shielded, so one client hanging up doesn't cancel the search for the others
+        return await asyncio.shield(future)
+
+    def _search_params(self, method: str, query: Dict[str, list], body: bytes) -> Dict[str, Any]:
+        if method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(400, "body is not JSON")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "body must be a JSON object")
+        else:
+            params = {name: values[-1] for name, values in query.items()}
+
+        keywords = params.get("keywords", "")
+        if isinstance(keywords, str):
+            keywords = keywords.split(",")
+        keywords = [str(kw).strip() for kw in keywords if str(kw).strip()]
+        algo = str(params.get("algo", "KMP"))
+        try:
+            max_match = int(params.get("max_match", 10))
+        except (TypeError, ValueError):
+            raise HTTPError(400, "max_match must be an integer")
+        if not keywords:
+            raise HTTPError(400, "keywords are required")
+        if algo not in ALGORITHMS:
+            raise HTTPError(400, f"algo must be one of {', '.join(ALGORITHMS)}")
+        if max_match <= 0:
+            raise HTTPError(400, "max_match must be positive")
+        positions = str(params.get("positions", "")).lower() in ("1", "true", "yes")
+        return {"keywords": keywords, "algo": algo, "max_match": max_match, "positions": positions}
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        if not self.token:
+            return True
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip().encode(), self.token.encode())
+
+    async def dispatch(self, method: str, target: str, body: bytes,
+                       headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        if parts != ["health"] and not self._authorized(headers or {}):
+            raise HTTPError(401, "missing or wrong bearer token")
+
+        if parts == ["search"]:
+            if method not in ("GET", "POST"):
+                raise HTTPError(405, "use GET or POST")
+            params = self._search_params(method, query, body)
+            result = await self.search(params["keywords"], params["algo"], params["max_match"])
+            if not params["positions"]:
+                result = {**result, "results": [
+                    {k: v for k, v in entry.items() if k not in ("exact_positions", "fuzzy_positions")}
+                    for entry in result["results"]
+                ]}
+            return 200, {"keywords": params["keywords"], "max_match": params["max_match"], **result}
+
+        if method != "GET":
+            raise HTTPError(405, "use GET")
+        if parts == ["health"]:
+            return 200, {"status": "ok", "in_flight": len(self._in_flight), **self.stats,
+                         "indexed_cvs": len(self.index) if self.index is not None else None}
+        if len(parts) == 2 and parts[0] == "applicant" and parts[1].isdigit():
+            applicant = await self._call(self._applicant, int(parts[1]))
+            if applicant is None:
+                raise HTTPError(404, f"no applicant {parts[1]}")
+            return 200, applicant
+        if len(parts) == 3 and parts[0] == "cv" and parts[1].isdigit() and parts[2] == "summary":
+            summary = await self._call(self._summary, int(parts[1]))
+            if summary is None:
+                raise HTTPError(404, f"no application {parts[1]}")
+            return 200, summary
+        raise HTTPError(404, f"no route for {url.path}")
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        elif status == 401:
+            headers.append('WWW-Authenticate: Bearer realm="therecruiter"')
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), REQUEST_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await asyncio.wait_for(reader.readexactly(length), REQUEST_TIMEOUT) if length else b""
+
+                self.stats["requests"] += 1
+                try:
+                    status, payload = await self.dispatch(method.upper(), target, body, headers)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"[-] Error handling {method} {target}: {e}")
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, ready=None) -> None:
+        """Serve until cancelled; `ready(server)` is called once the socket is listening"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        server = await asyncio.start_server(self._handle, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
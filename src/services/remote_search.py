@@ -0,0 +1,79 @@
+import os
+import json
+from typing import Any, Dict, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+class RemoteSearchService:
+    """
+    Drop-in for SearchService that asks a running `-d serve` instance
+    instead of searching locally. `search()` returns the same shape
+    SearchService.search does, so SearchPage can use either. The bearer
+    token defaults to SEARCH_SERVICE_TOKEN, the same variable the service reads.
+    """
+    def __init__(self, base_url: str, timeout: float = 60.0, token: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token = token if token is not None else os.getenv("SEARCH_SERVICE_TOKEN")
+        # the service decides how to run the workers; kept so callers can set it either way
+        self.use_multiprocessing = True
+
+    def _request(self, path: str, payload: Dict[str, Any] = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = Request(self.base_url + path, data=data, headers=headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"search service answered {e.code}: {message}")
+        except URLError as e:
+            raise RuntimeError(f"search service at {self.base_url} is unreachable: {e.reason}")
+
+    def search(self, keywords: List[str], algo_name: str, max_match: int) -> Dict[str, Any]:
+        response = self._request("/search", {
+            "keywords": keywords, "algo": algo_name, "max_match": max_match, "positions": True
+        })
+        final_selection = []
+        for entry in response["results"]:
+            final_selection.append({
+                "detail": {
+                    "detail_id": entry["detail_id"],
+                    "applicant_id": entry["applicant_id"],
+                    "application_role": entry["application_role"],
+                    "cv_path": entry["cv_path"],
+                    "applicant_profile": {
+                        "applicant_id": entry["applicant_id"],
+                        "first_name": entry["first_name"],
+                        "last_name": entry["last_name"],
+                    },
+                },
+                "exact_raw": entry.get("exact_positions", {}),
+                "fuzzy_raw": {kw: [tuple(hit) for hit in hits]
+                              for kw, hits in entry.get("fuzzy_positions", {}).items()},
+                "exact_count": entry["exact_count"],
+                "fuzzy_count": entry["fuzzy_count"],
+                "score": entry["score"],
+            })
+        return {
+            "final_selection": final_selection,
+            "t_exact": response["t_exact_ms"] / 1000,
+            "t_fuzzy": response["t_fuzzy_ms"] / 1000,
+            "algo_name": response["algo"],
+            "result_count": response["result_count"],
+            "total_exact_scanned": response["total_exact_scanned"],
+            "total_fuzzy_scanned": response["total_fuzzy_scanned"],
+            "timings": {stage: ms / 1000 for stage, ms in response["timings_ms"].items()},
+        }
+
+    def applicant(self, applicant_id: int) -> Dict[str, Any]:
+        return self._request(f"/applicant/{applicant_id}")
+
+    def cv_summary(self, detail_id: int) -> Dict[str, Any]:
+        return self._request(f"/cv/{detail_id}/summary")
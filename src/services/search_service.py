@@ -0,0 +1,407 @@
+import os
+import time
+from pathlib import Path
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional
+
+from src.core.extraction_cache import ExtractionCache, get_extraction_cache
+from src.core.extractor import PDFExtractor
+from src.core.profiling import ProfileSession, QueryProfiler
+from src.core.tracing import Tracer
+from src.index.fields import parse_query
+from src.index.ranking import BM25, RANKINGS, exact_frequencies, fuzzy_frequencies, token_length
+from src.search.search_workers import (
+    search_exact_worker,
+    search_fuzzy_worker
+)
+
+class SearchService:
+    """
+    The exact-then-fuzzy CV search behind SearchPage, without any Qt.
+
+    Args:
+      db: anything with `get_all_applicants_data(timings=...)`; defaults to the
+          MySQL-backed `db_manager`, benchmarks pass a SQLite stand-in.
+      pool_size: worker processes when multiprocessing (default: cpu count).
+      use_multiprocessing: run the per-CV workers in a Pool or inline.
+      use_cache: read extracted CV text through the extraction cache.
+      data_root: directory `cv_path` values are relative to.
+      trace: collect per-stage spans into `self.tracer` (summed across
+          searches until `self.tracer.reset()`).
+      profiler: profile searches and keep the ones slower than its
+          threshold; defaults to `QueryProfiler.from_env()`.
+      stop_early: stop reading a CV's PDF once every keyword has matched.
+          Exact counts of those CVs become lower bounds, so only use it when
+          presence matters more than ranking by count.
+      index: a FieldedIndex, MappedIndex or SegmentedIndex; CVs it holds
+          get their exact hits from it instead of a scan, the rest are
+          scanned as usual. A FieldedIndex or MappedIndex is a snapshot, so
+          keep it in step with the CVs; a SegmentedIndex follows them and
+          is read through a fresh snapshot per search. When it has the CV
+          texts, the fuzzy stage reads them from it as well; pool workers
+          map a mapped segment's file themselves instead of being sent the
+          text.
+      field_weights: weight per CV section ("skills", "experience", ...,
+          "other") for ranking exact hits; 1.0 for sections not listed.
+      ranking: "bm25" scores CVs with BM25 over their length and the
+          keywords' document frequencies, fuzzy hits weighted by edit
+          distance; "count" ranks by raw hit counts. Either way, CVs with
+          exact hits rank above fuzzy-only ones. Scores are in 'score'.
+      pool: a long-lived multiprocessing Pool to run the workers in, shared
+          by concurrent searches (the HTTP service's); the service never
+          closes it. Without one, each search starts and stops its own.
+
+    Keywords can be limited to a section with a prefix, e.g. "skills:python".
+    """
+    def __init__(
+        self,
+        db: Any = None,
+        pool_size: Optional[int] = None,
+        use_multiprocessing: bool = True,
+        use_cache: bool = True,
+        fuzzy_tolerance: float = 0.2,
+        data_root: str = "",
+        trace: bool = False,
+        profiler: Optional[QueryProfiler] = None,
+        stop_early: bool = False,
+        index: Any = None,
+        field_weights: Optional[Dict[str, float]] = None,
+        ranking: str = "bm25",
+        pool: Optional[Any] = None
+    ):
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}, expected one of {', '.join(RANKINGS)}")
+        if db is None:
+            from src.db.models import db_manager
+            db = db_manager
+        self.db = db
+        self.pool_size = pool_size or os.cpu_count()
+        self.use_multiprocessing = use_multiprocessing
+        self.use_cache = use_cache
+        self.fuzzy_tolerance = fuzzy_tolerance
+        self.data_root = data_root
+        self.tracer = Tracer(enabled=trace)
+        self.profiler = profiler if profiler is not None else QueryProfiler.from_env()
+        self.stop_early = stop_early
+        self.index = index
+        self.field_weights = field_weights
+        self.ranking = ranking
+        self.bm25 = BM25()
+        self.pool = pool
+
+    def _run(self, pool: Optional[Any], worker, tasks: List[tuple]) -> List[Any]:
+        if pool is not None:
+            return pool.starmap(worker, tasks)
+        return [worker(*args) for args in tasks]
+
+    def _cache_key(self, detail: Dict[str, Any]) -> str:
+        return ExtractionCache.key(Path(self.data_root) / detail["cv_path"])
+
+    def _reader(self) -> Any:
+        # a live index changes under us, so each search reads one snapshot of it
+        if self.index is not None and hasattr(self.index, "snapshot"):
+            return self.index.snapshot()
+        return self.index
+
+    def _split_indexed(self, index: Any, exact_tasks: List[tuple]) -> Dict[int, int]:
+        """Task position -> index doc id, for the CVs the index can answer"""
+        if index is None:
+            return {}
+        indexed = {}
+        for position, task in enumerate(exact_tasks):
+            doc_id = index.doc_id(self._cache_key(task[0]))
+            if doc_id is not None:
+                indexed[position] = doc_id
+        return indexed
+
+    def _search_index(self, index: Any, keywords: List[str], tasks: List[tuple],
+                      indexed: Dict[int, int]) -> Dict[int, Dict[str, Any]]:
+        """Exact-worker-shaped results for the indexed CVs by task position, without reading their text"""
+        hits = index.search(keywords, doc_ids=indexed.values(), field_weights=self.field_weights)
+        empty = {term.key: [] for term in parse_query(keywords)}
+        results = {}
+        for position, doc_id in indexed.items():
+            found = hits.get(doc_id)
+            exact = found["exact_raw"] if found else dict(empty)
+            count = sum(len(v) for v in exact.values())
+            results[position] = {
+                "detail":       tasks[position][0],
+                "text":         None,
+                "exact_raw":    exact,
+                "exact_count":  count,
+                "exact_score":  found["exact_score"] if found else 0.0,
+                "exact_fields": found["exact_fields"] if found else None,
+                "field_map":    index.doc(doc_id)[4],
+                "length":       index.doc(doc_id)[2],
+                "index_doc":    doc_id,
+                "missing":      [kw for kw, locs in exact.items() if not locs],
+                "complete":     True
+            }
+        return results
+
+    def _score_exact(self, keywords: List[str], cv_results: List[Dict[str, Any]]) -> Optional[tuple]:
+        """
+        'score' for every CV: BM25 of its exact hits, or the (weighted) hit
+        count. Returns the corpus statistics the fuzzy stage scores with.
+        """
+        if self.ranking == "count":
+            for r in cv_results:
+                r["score"] = r["exact_score"]
+            return None
+        keys = [term.key for term in parse_query(keywords)]
+        lengths = [token_length(r) for r in cv_results]
+        avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+        matched = [i for i, r in enumerate(cv_results) if r["exact_count"] > 0]
+        tf = [exact_frequencies(cv_results[i], keys, self.field_weights) for i in matched]
+        df = [sum(1 for row in tf if row[column]) for column in range(len(keys))]
+        scores = self.bm25.scores(tf, [lengths[i] for i in matched], avg_length, len(cv_results), df)
+        for r in cv_results:
+            r["score"] = 0.0
+        for i, score in zip(matched, scores):
+            cv_results[i]["score"] = score
+        return len(cv_results), avg_length, df
+
+    def _score_fuzzy(self, keywords: List[str], candidates: List[Dict[str, Any]], corpus: Optional[tuple]) -> None:
+        if corpus is None:
+            for r in candidates:
+                r["score"] = r.get("fuzzy_count", 0)
+            return
+        n_docs, avg_length, exact_df = corpus
+        terms = parse_query(keywords)
+        keys = [term.key for term in terms]
+        tf = [fuzzy_frequencies(r, keys, [term.text for term in terms]) for r in candidates]
+        # a CV counts towards a keyword's df for an exact or a fuzzy hit
+        df = [exact + sum(1 for row in tf if row[column]) for column, exact in enumerate(exact_df)]
+        scores = self.bm25.scores(tf, [token_length(r) for r in candidates], avg_length, n_docs, df)
+        for r, score in zip(candidates, scores):
+            r["score"] = score
+
+    def _fuzzy_source(self, index: Any, result: Dict[str, Any]) -> tuple:
+        """(text, (index file, doc id)) for a fuzzy task; workers read mapped texts themselves"""
+        doc_id = result.pop("index_doc", None)
+        if result["text"] is None and doc_id is not None and self.use_multiprocessing:
+            source = index.text_source(doc_id)
+            if source is not None:
+                return None, source
+        if result["text"] is None and doc_id is not None:
+            result["text"] = index.text(doc_id)
+        return self._load_text(result), None
+
+    def _load_text(self, result: Dict[str, Any]) -> str:
+        # index-served CVs only need their text when they go on to the fuzzy stage
+        if result["text"] is None:
+            pdf_path = Path(self.data_root) / result["detail"]["cv_path"]
+            extracted = get_extraction_cache().get_or_extract(pdf_path, PDFExtractor(self.data_root))
+            result["text"] = extracted["pattern_matching"]
+        return result["text"]
+
+    def search(self, keywords: List[str], algo_name: str, max_match: int) -> Dict[str, Any]:
+        """
+        Rank CVs by exact keyword hits, topping up with fuzzy hits when fewer
+        than `max_match` CVs match exactly. Besides the results, returns
+        wall-clock seconds per stage in 'timings' ('extract' and 'exact_match'
+        are summed across workers, so they can exceed 't_exact'). With a
+        profiler attached, slow searches also report 'profile_path'.
+        """
+        if self.profiler is None:
+            return self._search(keywords, algo_name, max_match)
+
+        session = self.profiler.session()
+        with session.capture():
+            result = self._search(keywords, algo_name, max_match, session)
+        profile_path = session.finish(result['timings']['total'], label=f"{algo_name}-{'-'.join(keywords)}")
+        if profile_path is not None:
+            result['profile_path'] = str(profile_path)
+        return result
+
+    def _search(
+        self,
+        keywords: List[str],
+        algo_name: str,
+        max_match: int,
+        session: Optional[ProfileSession] = None
+    ) -> Dict[str, Any]:
+        # the parent's capture already sees inline workers, so only pool workers profile themselves
+        worker_profile = session.worker_options if session is not None and self.use_multiprocessing else None
+        timings: Dict[str, float] = {
+            'db_fetch': 0.0, 'decrypt': 0.0, 'extract': 0.0,
+            'exact_match': 0.0, 'fuzzy_match': 0.0, 'ranking': 0.0
+        }
+        t_start = time.perf_counter()
+
+        applicants = self.db.get_all_applicants_data(timings=timings)
+        self.tracer.record('db_fetch', timings['db_fetch'])
+        self.tracer.record('decrypt', timings['decrypt'])
+        exact_tasks = []
+        for app in applicants:
+            profile = app["applicant_profile"]
+            for detail in app["application_details"]:
+                task_detail = {
+                    **detail,
+                    "applicant_profile": profile
+                }
+                exact_tasks.append((task_detail, keywords, algo_name, self.data_root, self.use_cache,
+                                    self.tracer.enabled, worker_profile, self.stop_early, self.field_weights))
+
+        index = self._reader()
+        indexed = self._split_indexed(index, exact_tasks)
+        scan_tasks = [task for position, task in enumerate(exact_tasks) if position not in indexed]
+        if self.use_multiprocessing and self.pool is not None:
+            pool = self.pool
+        else:
+            pool = Pool(self.pool_size) if self.use_multiprocessing and scan_tasks else None
+        try:
+            t0 = time.perf_counter()
+            cv_results = self._run(pool, search_exact_worker, scan_tasks)
+            if indexed:
+                t_index = time.perf_counter()
+                from_index = self._search_index(index, keywords, exact_tasks, indexed)
+                t_index = time.perf_counter() - t_index
+                timings['exact_match'] += t_index
+                self.tracer.record('match', t_index)
+                # back in task order, so ties rank the same as a full scan
+                scanned = iter(cv_results)
+                cv_results = [from_index[position] if position in from_index else next(scanned)
+                              for position in range(len(exact_tasks))]
+            t_exact = time.perf_counter() - t0
+            for r in cv_results:
+                timings['extract'] += r.pop("t_extract", 0.0)
+                timings['exact_match'] += r.pop("t_match", 0.0)
+                self.tracer.merge(r.pop("spans", []), cv=r["detail"]["cv_path"])
+                payload = r.pop("profile", None)
+                if session is not None:
+                    session.merge(payload)
+
+            t_rank = time.perf_counter()
+            corpus = self._score_exact(keywords, cv_results)
+            cv_results.sort(key=lambda r: r["score"], reverse=True)
+            exact_selected = cv_results[:max_match]
+            exact_hits = [r for r in exact_selected if r["exact_count"] > 0]
+            E = len(exact_hits)
+            timings['ranking'] += time.perf_counter() - t_rank
+
+            total_exact_scanned = len(exact_tasks)
+            total_fuzzy_scanned = 0
+            fuzzy_selected: List[Dict[str, Any]] = []
+            if E < max_match:
+                # candidates for fuzzy are any CV with exact_count==0
+                no_exact = [r for r in cv_results if r["exact_count"] == 0]
+                total_fuzzy_scanned = len(no_exact)
+
+                t_load = time.perf_counter()
+                fuzzy_tasks = [
+                    (idx, *self._fuzzy_source(index, r), keywords, self.fuzzy_tolerance, self.tracer.enabled,
+                     worker_profile, r.pop("field_map", None))
+                    for idx, r in enumerate(no_exact)
+                ]
+                timings['extract'] += time.perf_counter() - t_load
+                if pool is None and self.use_multiprocessing:
+                    pool = Pool(self.pool_size)
+
+                t1 = time.perf_counter()
+                fuzzy_out = self._run(pool, search_fuzzy_worker, fuzzy_tasks)
+                t_fuzzy = time.perf_counter() - t1
+                timings['fuzzy_match'] += t_fuzzy
+
+                t_rank = time.perf_counter()
+                for idx, fuzzy_raw, spans, payload in fuzzy_out:
+                    self.tracer.merge(spans, cv=no_exact[idx]["detail"]["cv_path"])
+                    if session is not None:
+                        session.merge(payload)
+                    no_exact[idx]["fuzzy_raw"] = fuzzy_raw
+                    # total fuzzy matches count
+                    no_exact[idx]["fuzzy_count"] = sum(len(v) for v in fuzzy_raw.values())
+
+                # pick top (max_match - E) by fuzzy_count > 0
+                remaining = [r for r in no_exact if r.get("fuzzy_count", 0) > 0]
+                self._score_fuzzy(keywords, remaining, corpus)
+                remaining.sort(key=lambda r: r["score"], reverse=True)
+                slots = max_match - E
+                fuzzy_selected = remaining[:slots]
+                timings['ranking'] += time.perf_counter() - t_rank
+            else:
+                t_fuzzy = 0.0
+        finally:
+            if pool is not None and pool is not self.pool:
+                pool.close()
+                pool.join()
+
+        t_rank = time.perf_counter()
+        for res in exact_selected:
+            res.setdefault("fuzzy_count", 0)
+        for res in fuzzy_selected:
+            res.setdefault("exact_count", 0)
+        for res in cv_results:
+            res.pop("field_map", None)
+            res.pop("index_doc", None)
+
+        all_candidates = exact_selected + fuzzy_selected
+        all_candidates = [
+            r for r in all_candidates
+            if (r["exact_count"] > 0) or (r["fuzzy_count"] > 0)
+        ]
+
+        all_candidates.sort(
+            key=lambda r: (r["exact_count"] > 0, r["score"]),
+            reverse=True
+        )
+
+        final_selection = all_candidates[:max_match]
+        timings['ranking'] += time.perf_counter() - t_rank
+        timings['total'] = time.perf_counter() - t_start
+        self.tracer.record('ranking', timings['ranking'])
+
+        return {
+            'final_selection': final_selection,
+            't_exact': t_exact,
+            't_fuzzy': t_fuzzy,
+            'algo_name': algo_name,
+            'result_count': len(final_selection),
+            'total_exact_scanned': total_exact_scanned,
+            'total_fuzzy_scanned': total_fuzzy_scanned,
+            'timings': timings
+        }
+
+def serialize_search(result: Dict[str, Any], with_positions: bool = False) -> Dict[str, Any]:
+    """
+    JSON-ready form of a `search()` result for headless callers: the ranked
+    applications with per-keyword hit counts and scores, plus scan counts
+    and stage timings in milliseconds. CV texts are left out; hit
+    positions (exact offsets, fuzzy (offset, distance) pairs) only with
+    `with_positions`.
+    """
+    results = []
+    for rank, r in enumerate(result['final_selection'], 1):
+        detail = r['detail']
+        profile = detail.get('applicant_profile') or {}
+        exact = r.get('exact_raw') or {}
+        fuzzy = r.get('fuzzy_raw') or {}
+        entry = {
+            'rank': rank,
+            'applicant_id': profile.get('applicant_id', detail.get('applicant_id')),
+            'detail_id': detail.get('detail_id'),
+            'name': f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip(),
+            'first_name': profile.get('first_name'),
+            'last_name': profile.get('last_name'),
+            'application_role': detail.get('application_role'),
+            'cv_path': detail.get('cv_path'),
+            'score': r.get('score', 0.0),
+            'exact_count': r.get('exact_count', 0),
+            'fuzzy_count': r.get('fuzzy_count', 0),
+            'exact': {kw: len(hits) for kw, hits in exact.items()},
+            'fuzzy': {kw: len(hits) for kw, hits in fuzzy.items() if hits},
+        }
+        if with_positions:
+            entry['exact_positions'] = exact
+            entry['fuzzy_positions'] = {kw: [list(hit) for hit in hits] for kw, hits in fuzzy.items() if hits}
+        results.append(entry)
+    return {
+        'algo': result['algo_name'],
+        'result_count': result['result_count'],
+        'total_exact_scanned': result['total_exact_scanned'],
+        'total_fuzzy_scanned': result['total_fuzzy_scanned'],
+        't_exact_ms': result['t_exact'] * 1000,
+        't_fuzzy_ms': result['t_fuzzy'] * 1000,
+        'timings_ms': {stage: seconds * 1000 for stage, seconds in result['timings'].items()},
+        'results': results,
+    }
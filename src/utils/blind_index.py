@@ -0,0 +1,107 @@
+# Keyed-hash blind indexes for the encrypted ApplicantProfile fields.
+# The ciphertext itself is not searchable, so next to it we store
+#   - an HMAC of the normalized full value (equality lookups), and
+#   - for names only, truncated HMACs of every n-gram (substring lookups).
+# Both are useless without the key, and lookups only ever return
+# candidates: callers must still decrypt and verify the real value.
+#
+# N-gram tokens are deterministic, so their frequencies leak the frequencies
+# of the underlying n-grams. Phone numbers and birth dates have about 1000
+# possible digit 3-grams, few enough to map tokens back to digits and undo
+# the encryption, so those fields get the full-value HMAC only and substring
+# lookups on them scan and decrypt. Name n-grams leak letter-frequency
+# statistics in the same way, which is the accepted cost of name search.
+
+import hmac
+import hashlib
+from typing import Dict, List, Optional, Set, Tuple
+
+NGRAM_SIZE = 3
+TOKEN_HEX_LENGTH = 16
+
+FIELD_NAME = 'name'
+FIELD_PHONE = 'phone'
+FIELD_BIRTH_DATE = 'dob'
+
+# fields with substring (n-gram) tokens in ApplicantBlindToken
+NGRAM_FIELDS = (FIELD_NAME,)
+
+# ApplicantProfile column holding the full-value HMAC of each field
+BIDX_COLUMNS = {
+    FIELD_NAME: 'name_bidx',
+    FIELD_PHONE: 'phone_bidx',
+    FIELD_BIRTH_DATE: 'dob_bidx',
+}
+
+class BlindIndexer:
+    def __init__(self, key_string: str, ngram_size: int = NGRAM_SIZE) -> None:
+        if ngram_size < 1:
+            raise ValueError("ngram_size must be positive")
+        # derive a dedicated key so the blind index never reuses the AES key directly
+        self.key = hmac.new(key_string.encode('utf-8'), b'therecruiter-blind-index', hashlib.sha256).digest()
+        self.ngram_size = ngram_size
+
+    @staticmethod
+    def normalize(field: str, value: Optional[str]) -> str:
+        """Normalize a value so equal inputs hash equally (and substrings stay substrings)"""
+        if not value:
+            return ''
+        value = str(value)
+        if field == FIELD_NAME:
+            return value.lower()
+        if field == FIELD_PHONE:
+            return ''.join(c for c in value if c.isdigit())
+        return value.strip()
+
+    @staticmethod
+    def full_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+        return f"{first_name or ''} {last_name or ''}"
+
+    def _mac(self, field: str, value: str) -> str:
+        return hmac.new(self.key, f"{field}:{value}".encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def digest(self, field: str, value: Optional[str]) -> Optional[str]:
+        """HMAC of the normalized full value, or None for empty values"""
+        normalized = self.normalize(field, value)
+        if not normalized.strip():
+            return None
+        return self._mac(field, normalized)
+
+    def tokens(self, field: str, value: Optional[str]) -> Set[str]:
+        """Truncated HMACs of every n-gram in the normalized value, none for fields outside NGRAM_FIELDS"""
+        if field not in NGRAM_FIELDS:
+            return set()
+        normalized = self.normalize(field, value)
+        n = self.ngram_size
+        grams = {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+        return {self._mac(field, gram)[:TOKEN_HEX_LENGTH] for gram in grams}
+
+    def query_tokens(self, field: str, term: str) -> Optional[List[str]]:
+        """
+        Tokens a matching row must all have, or None when the index cannot
+        narrow the search: the field has no n-gram tokens, or the term is
+        shorter than one n-gram.
+        """
+        if field not in NGRAM_FIELDS or len(self.normalize(field, term)) < self.ngram_size:
+            return None
+        return sorted(self.tokens(field, term))
+
+    def profile_columns(self, first_name: Optional[str], last_name: Optional[str],
+                        phone_number: Optional[str], date_of_birth: Optional[str]) -> Dict[str, Optional[str]]:
+        """Full-value blind index columns for a plaintext profile"""
+        return {
+            BIDX_COLUMNS[FIELD_NAME]: self.digest(FIELD_NAME, self.full_name(first_name, last_name)),
+            BIDX_COLUMNS[FIELD_PHONE]: self.digest(FIELD_PHONE, phone_number),
+            BIDX_COLUMNS[FIELD_BIRTH_DATE]: self.digest(FIELD_BIRTH_DATE, date_of_birth),
+        }
+
+    def profile_token_rows(self, applicant_id: int, first_name: Optional[str], last_name: Optional[str],
+                           phone_number: Optional[str], date_of_birth: Optional[str]) -> List[Tuple[int, str, str]]:
+        """(applicant_id, field, token) rows for ApplicantBlindToken"""
+        rows = []
+        for field, value in ((FIELD_NAME, self.full_name(first_name, last_name)),
+                             (FIELD_PHONE, phone_number),
+                             (FIELD_BIRTH_DATE, date_of_birth)):
+            for token in sorted(self.tokens(field, value)):
+                rows.append((applicant_id, field, token))
+        return rows
@@ -26,6 +26,7 @@ class DatabaseConfig:
             self.password: str = os.getenv('DB_PASSWORD', '')
 
             self.encryption_password: Optional[str] = os.getenv('ENCRYPTION_PASSWORD')
+            self.blind_index_password: Optional[str] = os.getenv('BLIND_INDEX_PASSWORD')
             
         except ValueError as e:
             raise ValueError(f"Invalid database configuration: {e}")
@@ -65,6 +66,15 @@ class DatabaseConfig:
     def has_encryption_password(self) -> bool:
         return self.encryption_password is not None and len(self.encryption_password.strip()) > 0
 
+    def has_blind_index_password(self) -> bool:
+        return self.blind_index_password is not None and len(self.blind_index_password.strip()) > 0
+
+    def get_blind_index_password(self) -> Optional[str]:
+        # falls back to the encryption password so existing setups need no new variable
+        if self.blind_index_password and self.blind_index_password.strip():
+            return self.blind_index_password
+        return self.encryption_password
+
 _config: Optional[DatabaseConfig] = None
 
 def get_db_config() -> DatabaseConfig:
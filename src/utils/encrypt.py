@@ -5,6 +5,14 @@
 
 # import time
 
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    # optional, only used by AESCipher.decrypt_many for batch decryption
+    np = None
+
 N_ROUNDS = 10
 
 s_box = (
@@ -48,65 +56,33 @@ inv_s_box = (
 def bytes2matrix(text):
     return [list(text[i:i+4]) for i in range(0, len(text), 4)]
 
-def matrix2bytes(matrix):
-    out = []
-    for r in matrix:
-        for c in r:
-            out.append(c.to_bytes(2,byteorder='little').decode())
-    return ''.join(out)
-
-def shift_rows(s):
-    s[0][1], s[1][1], s[2][1], s[3][1] = s[1][1], s[2][1], s[3][1], s[0][1]
-    s[0][2], s[1][2], s[2][2], s[3][2] = s[2][2], s[3][2], s[0][2], s[1][2]
-    s[0][3], s[1][3], s[2][3], s[3][3] = s[3][3], s[0][3], s[1][3], s[2][3]
-
-def inv_shift_rows(s):
-    s[0][1], s[1][1], s[2][1], s[3][1] = s[3][1], s[0][1], s[1][1], s[2][1]
-    s[0][2], s[1][2], s[2][2], s[3][2] = s[2][2], s[3][2], s[0][2], s[1][2]
-    s[0][3], s[1][3], s[2][3], s[3][3] = s[1][3], s[2][3], s[3][3], s[0][3]
-
-def sub_bytes(s, sbox=s_box):
-    for i in range(len(s)):
-        for j in range(len(s[i])):
-            s[i][j] = sbox[s[i][j]]
-
-def inv_sub_bytes(s, sbox=inv_s_box):
-    for i in range(len(s)):
-        for j in range(len(s[i])):
-            s[i][j] = (sbox[s[i][j]])
-
-
-def add_round_key(s, k):
-    for i in range(len(s)):
-        for j in range(len(s[i])):
-            s[i][j] = (s[i][j] ^ k[i][j])
-
 xtime = lambda a: (((a << 1) ^ 0x1B) & 0xFF) if (a & 0x80) else (a << 1)
 
-def mix_single_column(a):
-    t = a[0] ^ a[1] ^ a[2] ^ a[3]
-    u = a[0]
-    a[0] ^= t ^ xtime(a[0] ^ a[1])
-    a[1] ^= t ^ xtime(a[1] ^ a[2])
-    a[2] ^= t ^ xtime(a[2] ^ a[3])
-    a[3] ^= t ^ xtime(a[3] ^ u)
-
-
-def mix_columns(s):
-    for i in range(4):
-        mix_single_column(s[i])
-
-
-def inv_mix_columns(s):
-    for i in range(4):
-        u = xtime(xtime(s[i][0] ^ s[i][2]))
-        v = xtime(xtime(s[i][1] ^ s[i][3]))
-        s[i][0] ^= u
-        s[i][1] ^= v
-        s[i][2] ^= u
-        s[i][3] ^= v
-
-    mix_columns(s)
+def _gmul(a, b):
+    # multiplication in GF(2^8), only used to build the tables below
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = xtime(a)
+        b >>= 1
+    return result
+
+def _build_tables(box, coefficients):
+    # T-tables merge SubBytes and MixColumns: table[x] is the column that
+    # byte x contributes after substitution, tables 1-3 are its byte rotations
+    t0 = []
+    for x in range(256):
+        v = box[x]
+        c0, c1, c2, c3 = (_gmul(v, c) for c in coefficients)
+        t0.append((c0 << 24) | (c1 << 16) | (c2 << 8) | c3)
+    t1 = tuple(((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in t0)
+    t2 = tuple(((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in t1)
+    t3 = tuple(((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in t2)
+    return tuple(t0), t1, t2, t3
+
+Te0, Te1, Te2, Te3 = _build_tables(s_box, (2, 1, 1, 3))
+Td0, Td1, Td2, Td3 = _build_tables(inv_s_box, (14, 9, 13, 11))
 
 def expand_key(master_key):
     # Round constants https://en.wikipedia.org/wiki/AES_key_schedule#Round_constants
@@ -157,77 +133,197 @@ def pkcs7_unpad(data):
         
     return data[:-padding_length]
 
-def encrypt_block(key, plaintext_block):
-    round_keys = expand_key(key)
-    
-    state = bytes2matrix(plaintext_block)
-
-    add_round_key(state, round_keys[0])
-
-    for i in range(1, N_ROUNDS):
-        sub_bytes(state, s_box)
-        shift_rows(state)
-        mix_columns(state)
-        add_round_key(state, round_keys[i])
-
-    sub_bytes(state, s_box)
-    shift_rows(state)
-    add_round_key(state, round_keys[N_ROUNDS])
+_BLOCK = struct.Struct('>4I')
+
+def _word_round_keys(master_key):
+    """Encryption and (equivalent inverse cipher) decryption round keys as 32-bit words"""
+    enc = [int.from_bytes(bytes(column), 'big') for round_key in expand_key(master_key) for column in round_key]
+
+    dec = enc[4 * N_ROUNDS:]
+    for r in range(N_ROUNDS - 1, 0, -1):
+        for w in enc[4 * r:4 * r + 4]:
+            # InvMixColumns of the round key; s_box cancels the inv_s_box inside Td
+            dec.append(Td0[s_box[w >> 24]] ^ Td1[s_box[(w >> 16) & 0xFF]]
+                       ^ Td2[s_box[(w >> 8) & 0xFF]] ^ Td3[s_box[w & 0xFF]])
+    dec.extend(enc[:4])
+    return tuple(enc), tuple(dec)
+
+def _encrypt_blocks(rk, data, out):
+    unpack, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+    sbox = s_box
+    for offset in range(0, len(data), 16):
+        s0, s1, s2, s3 = unpack(data, offset)
+        s0 ^= rk[0]; s1 ^= rk[1]; s2 ^= rk[2]; s3 ^= rk[3]
+
+        k = 4
+        for _ in range(N_ROUNDS - 1):
+            t0 = Te0[s0 >> 24] ^ Te1[(s1 >> 16) & 0xFF] ^ Te2[(s2 >> 8) & 0xFF] ^ Te3[s3 & 0xFF] ^ rk[k]
+            t1 = Te0[s1 >> 24] ^ Te1[(s2 >> 16) & 0xFF] ^ Te2[(s3 >> 8) & 0xFF] ^ Te3[s0 & 0xFF] ^ rk[k + 1]
+            t2 = Te0[s2 >> 24] ^ Te1[(s3 >> 16) & 0xFF] ^ Te2[(s0 >> 8) & 0xFF] ^ Te3[s1 & 0xFF] ^ rk[k + 2]
+            t3 = Te0[s3 >> 24] ^ Te1[(s0 >> 16) & 0xFF] ^ Te2[(s1 >> 8) & 0xFF] ^ Te3[s2 & 0xFF] ^ rk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+
+        # last round has no MixColumns
+        pack_into(out, offset,
+            ((sbox[s0 >> 24] << 24) | (sbox[(s1 >> 16) & 0xFF] << 16) | (sbox[(s2 >> 8) & 0xFF] << 8) | sbox[s3 & 0xFF]) ^ rk[k],
+            ((sbox[s1 >> 24] << 24) | (sbox[(s2 >> 16) & 0xFF] << 16) | (sbox[(s3 >> 8) & 0xFF] << 8) | sbox[s0 & 0xFF]) ^ rk[k + 1],
+            ((sbox[s2 >> 24] << 24) | (sbox[(s3 >> 16) & 0xFF] << 16) | (sbox[(s0 >> 8) & 0xFF] << 8) | sbox[s1 & 0xFF]) ^ rk[k + 2],
+            ((sbox[s3 >> 24] << 24) | (sbox[(s0 >> 16) & 0xFF] << 16) | (sbox[(s1 >> 8) & 0xFF] << 8) | sbox[s2 & 0xFF]) ^ rk[k + 3])
+    return out
+
+def _decrypt_blocks(rk, data, out):
+    unpack, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+    ibox = inv_s_box
+    for offset in range(0, len(data), 16):
+        s0, s1, s2, s3 = unpack(data, offset)
+        s0 ^= rk[0]; s1 ^= rk[1]; s2 ^= rk[2]; s3 ^= rk[3]
+
+        k = 4
+        for _ in range(N_ROUNDS - 1):
+            t0 = Td0[s0 >> 24] ^ Td1[(s3 >> 16) & 0xFF] ^ Td2[(s2 >> 8) & 0xFF] ^ Td3[s1 & 0xFF] ^ rk[k]
+            t1 = Td0[s1 >> 24] ^ Td1[(s0 >> 16) & 0xFF] ^ Td2[(s3 >> 8) & 0xFF] ^ Td3[s2 & 0xFF] ^ rk[k + 1]
+            t2 = Td0[s2 >> 24] ^ Td1[(s1 >> 16) & 0xFF] ^ Td2[(s0 >> 8) & 0xFF] ^ Td3[s3 & 0xFF] ^ rk[k + 2]
+            t3 = Td0[s3 >> 24] ^ Td1[(s2 >> 16) & 0xFF] ^ Td2[(s1 >> 8) & 0xFF] ^ Td3[s0 & 0xFF] ^ rk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+
+        pack_into(out, offset,
+            ((ibox[s0 >> 24] << 24) | (ibox[(s3 >> 16) & 0xFF] << 16) | (ibox[(s2 >> 8) & 0xFF] << 8) | ibox[s1 & 0xFF]) ^ rk[k],
+            ((ibox[s1 >> 24] << 24) | (ibox[(s0 >> 16) & 0xFF] << 16) | (ibox[(s3 >> 8) & 0xFF] << 8) | ibox[s2 & 0xFF]) ^ rk[k + 1],
+            ((ibox[s2 >> 24] << 24) | (ibox[(s1 >> 16) & 0xFF] << 16) | (ibox[(s0 >> 8) & 0xFF] << 8) | ibox[s3 & 0xFF]) ^ rk[k + 2],
+            ((ibox[s3 >> 24] << 24) | (ibox[(s2 >> 16) & 0xFF] << 16) | (ibox[(s1 >> 8) & 0xFF] << 8) | ibox[s0 & 0xFF]) ^ rk[k + 3])
+    return out
+
+def _decrypt_blocks_vectorized(rk, blocks):
+    """
+    Same rounds as _decrypt_blocks, but on an (N, 16) uint8 array so every
+    table lookup runs across all N blocks at once (ECB has no chaining).
+    """
+    td0, td1, td2, td3, ibox = _np_tables()
+    rk = np.asarray(rk, dtype=np.uint32)
+
+    words = blocks.reshape(-1, 16).view('>u4').astype(np.uint32)
+    s0 = words[:, 0] ^ rk[0]
+    s1 = words[:, 1] ^ rk[1]
+    s2 = words[:, 2] ^ rk[2]
+    s3 = words[:, 3] ^ rk[3]
+
+    k = 4
+    for _ in range(N_ROUNDS - 1):
+        t0 = td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ rk[k]
+        t1 = td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ rk[k + 1]
+        t2 = td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ rk[k + 2]
+        t3 = td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ rk[k + 3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+        k += 4
+
+    out = np.empty((len(s0), 4), dtype='>u4')
+    out[:, 0] = ((ibox[s0 >> 24] << 24) | (ibox[(s3 >> 16) & 0xFF] << 16) | (ibox[(s2 >> 8) & 0xFF] << 8) | ibox[s1 & 0xFF]) ^ rk[k]
+    out[:, 1] = ((ibox[s1 >> 24] << 24) | (ibox[(s0 >> 16) & 0xFF] << 16) | (ibox[(s3 >> 8) & 0xFF] << 8) | ibox[s2 & 0xFF]) ^ rk[k + 1]
+    out[:, 2] = ((ibox[s2 >> 24] << 24) | (ibox[(s1 >> 16) & 0xFF] << 16) | (ibox[(s0 >> 8) & 0xFF] << 8) | ibox[s3 & 0xFF]) ^ rk[k + 2]
+    out[:, 3] = ((ibox[s3 >> 24] << 24) | (ibox[(s2 >> 16) & 0xFF] << 16) | (ibox[(s1 >> 8) & 0xFF] << 8) | ibox[s0 & 0xFF]) ^ rk[k + 3]
+    return out.view(np.uint8).reshape(-1, 16)
+
+_np_table_cache = []
+
+def _np_tables():
+    if not _np_table_cache:
+        _np_table_cache.extend(np.array(t, dtype=np.uint32) for t in (Td0, Td1, Td2, Td3, inv_s_box))
+    return _np_table_cache
+
+class AESCipher:
+    """
+    AES-128 in ECB mode with PKCS#7 padding.
+    The key schedule runs once here instead of once per 16-byte block,
+    so keep one instance around and reuse it for every buffer.
+    """
+    def __init__(self, key):
+        self.key = key
+        self.enc_round_keys, self.dec_round_keys = _word_round_keys(key)
+
+    def encrypt_block(self, plaintext_block):
+        return bytes(_encrypt_blocks(self.enc_round_keys, plaintext_block, bytearray(16)))
+
+    def decrypt_block(self, ciphertext_block):
+        return bytes(_decrypt_blocks(self.dec_round_keys, ciphertext_block, bytearray(16)))
+
+    def encrypt(self, plaintext):
+        padded_plaintext = pkcs7_pad(plaintext)
+        out = bytearray(len(padded_plaintext))
+        return bytes(_encrypt_blocks(self.enc_round_keys, padded_plaintext, out))
+
+    def decrypt(self, ciphertext):
+        if len(ciphertext) % 16 != 0:
+            raise ValueError("Ciphertext length must be multiple of 16 bytes")
+
+        out = bytearray(len(ciphertext))
+        plaintext = bytes(_decrypt_blocks(self.dec_round_keys, ciphertext, out))
+
+        # Remove PKCS#7 padding
+        try:
+            return pkcs7_unpad(plaintext)
+        except ValueError:
+            return plaintext
+
+    def decrypt_blocks(self, blocks):
+        """Decrypt an (N, 16) uint8 NumPy array of ECB blocks, vectorized across blocks"""
+        if np is None:
+            raise RuntimeError("NumPy is required for batch decryption")
+        return _decrypt_blocks_vectorized(self.dec_round_keys, np.ascontiguousarray(blocks, dtype=np.uint8))
+
+    def decrypt_many(self, ciphertexts):
+        """
+        Decrypt many independent ciphertexts (e.g. every encrypted field of a
+        table) in one batch, then unpad each one like `decrypt` does.
+        Falls back to one `decrypt` per buffer when NumPy is not installed.
+        """
+        for ciphertext in ciphertexts:
+            if len(ciphertext) % 16 != 0:
+                raise ValueError("Ciphertext length must be multiple of 16 bytes")
+
+        if np is None or len(ciphertexts) < 2:
+            return [self.decrypt(ciphertext) for ciphertext in ciphertexts]
+
+        joined = b''.join(ciphertexts)
+        if not joined:
+            return [b'' for _ in ciphertexts]
+        blocks = np.frombuffer(joined, dtype=np.uint8).reshape(-1, 16)
+        plain = self.decrypt_blocks(blocks).tobytes()
+
+        results = []
+        offset = 0
+        for ciphertext in ciphertexts:
+            chunk = plain[offset:offset + len(ciphertext)]
+            offset += len(ciphertext)
+            try:
+                results.append(pkcs7_unpad(chunk))
+            except ValueError:
+                results.append(chunk)
+        return results
+
+_cipher_cache = {}
+
+def get_cipher(key):
+    """Shared AESCipher for `key`, so the module-level helpers don't re-expand it"""
+    cipher = _cipher_cache.get(key)
+    if cipher is None:
+        if len(_cipher_cache) >= 8:
+            _cipher_cache.clear()
+        cipher = _cipher_cache[key] = AESCipher(key)
+    return cipher
 
-    ciphertext = b''
-    for row in state:
-        for byte_val in row:
-            ciphertext += bytes([byte_val])
-    
-    return ciphertext
+def encrypt_block(key, plaintext_block):
+    return get_cipher(key).encrypt_block(plaintext_block)
 
 def decrypt_block(key, ciphertext_block):
-    round_keys = expand_key(key)
-
-    state = bytes2matrix(ciphertext_block)
-    add_round_key(state, round_keys[-1])
-
-    for i in range(N_ROUNDS - 1, 0, -1):
-        inv_shift_rows(state)
-        inv_sub_bytes(state, inv_s_box)
-        add_round_key(state, round_keys[i])
-        inv_mix_columns(state)
-
-    inv_shift_rows(state)
-    inv_sub_bytes(state, inv_s_box)
-    add_round_key(state, round_keys[0])
-
-    plaintext = b''
-    for row in state:
-        for byte_val in row:
-            plaintext += bytes([byte_val])
-
-    return plaintext
+    return get_cipher(key).decrypt_block(ciphertext_block)
 
 def encrypt(key, plaintext):
-    padded_plaintext = pkcs7_pad(plaintext)
-    ciphertext = b''
-
-    for i in range(0, len(padded_plaintext), 16):
-        block = padded_plaintext[i:i+16]
-        ciphertext += encrypt_block(key, block)
-    
-    return ciphertext
+    return get_cipher(key).encrypt(plaintext)
 
 def decrypt(key, ciphertext):
-    if len(ciphertext) % 16 != 0:
-        raise ValueError("Ciphertext length must be multiple of 16 bytes")
-    
-    plaintext = b''
-    for i in range(0, len(ciphertext), 16):
-        block = ciphertext[i:i+16]
-        plaintext += decrypt_block(key, block)
-    
-    # Remove PKCS#7 padding
-    try:
-        return pkcs7_unpad(plaintext)
-    except ValueError:
-        return plaintext
+    return get_cipher(key).decrypt(ciphertext)
 
 def get_key_from_user():
     key_input = input("Enter your key: ").strip()